@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+描画バックエンドの速度を比較するスクリプト
+
+同じシーンをソフトウェア転送（surface）と SDL2 のテクスチャ合成（renderer）で描画し、
+1フレームの描画と表示にかかった時間を表示する。
+
+    python bench_display.py [フレーム数]
+"""
+import sys
+import os
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import pygame
+from src.level import LevelManager
+from src.scenes.game_scene import GameScene
+from src.scenes.title_scene import TitleScene
+from src.utils.telemetry import Telemetry
+from src.utils.display import (
+    DISPLAY_BACKEND_SURFACE, DISPLAY_BACKEND_RENDERER, create_display, benchmark_display
+)
+
+
+def main():
+    """
+    各バックエンドでタイトル画面と各ステージのゲーム画面を描画して計測する
+    """
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    pygame.display.init()
+    pygame.font.init()
+    # 計測用に作るゲームシーンのイベントをプレイ記録に残さない
+    Telemetry().disable()
+    level_manager = LevelManager()
+
+    for backend in (DISPLAY_BACKEND_SURFACE, DISPLAY_BACKEND_RENDERER):
+        display = create_display(backend)
+        if display.name != backend:
+            display.close()
+            continue
+        scenes = [("title", TitleScene())]
+        for index in range(len(level_manager)):
+            scenes.append((f"stage {index + 1}", GameScene(level_manager.get(index), index + 1)))
+        for name, scene in scenes:
+            timings = sorted(benchmark_display(display, scene, frames))
+            mean = sum(timings) / len(timings)
+            p95 = timings[int(len(timings) * 0.95)]
+            print(f"{backend:>8} {name:>8}: mean {mean * 1000:.3f} ms, p95 {p95 * 1000:.3f} ms")
+        display.close()
+        pygame.display.init()
+
+
+if __name__ == "__main__":
+    main()
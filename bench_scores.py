@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+順位表（スコアのデータベース）の速度を計測するスクリプト
+
+一時ディレクトリに WAL モードのデータベースを作り、指定した件数のプレイ結果を
+ScoreStore と同じ INSERT 文・トランザクション単位で書き込んで1秒あたりの件数を表示する。
+続いて ScoreStore の問い合わせ（結果の保存と順位、全期間と今日の上位）を繰り返し、
+要求してから結果を受け取るまでの時間を表示する。
+上限・下限を指定した場合は、満たさなかった時に終了コード1で終了する。
+
+    python bench_scores.py [--rows N] [--min-insert-rate 行/秒] [--max-latency-ms ミリ秒]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.score_store import _INSERT, ScoreRecord, ScoreStore, _play_date
+
+STAGES = 3  # 結果を振り分けるステージの数
+DAYS = 30  # 結果を振り分ける日数（今日を含む過去の日数）
+
+
+def make_rows(rng, count, now):
+    """
+    ランダムなプレイ結果を作る（6割をクリアとする）
+
+    Args:
+        rng (random.Random): 乱数
+        count (int): 件数
+        now (float): 最も新しいプレイ時刻（UNIX時間）
+
+    Returns:
+        list: INSERT 文の引数のリスト
+    """
+    rows = []
+    for _ in range(count):
+        played_at = now - rng.random() * 86400 * DAYS
+        is_clear = rng.random() < 0.6
+        rows.append((played_at, _play_date(played_at), rng.randint(1, STAGES), int(is_clear),
+                     rng.randint(0, 100), rng.uniform(5.0, 60.0) if is_clear else None))
+    return rows
+
+
+def bench_insert(path, rows, batch):
+    """
+    プレイ結果を batch 件ずつのトランザクションで書き込む
+
+    Args:
+        path (str): データベースのパス
+        rows (list): INSERT 文の引数のリスト
+        batch (int): 1つのトランザクションで書き込む件数
+
+    Returns:
+        float: 1秒あたりの書き込み件数
+    """
+    connection = sqlite3.connect(path)
+    start = time.perf_counter()
+    for offset in range(0, len(rows), batch):
+        with connection:
+            connection.executemany(_INSERT, rows[offset:offset + batch])
+    elapsed = time.perf_counter() - start
+    connection.close()
+    return len(rows) / elapsed
+
+
+def measure(function, count):
+    """
+    関数を繰り返し呼び、1回あたりの時間を求める
+
+    Args:
+        function (callable): 計測する関数（Future を返す）
+        count (int): 呼び出す回数
+
+    Returns:
+        tuple: (中央値, 95パーセンタイル, 最大)（秒）
+    """
+    timings = []
+    for _ in range(count):
+        start = time.perf_counter()
+        function().result()
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.95)], timings[-1]
+
+
+def main():
+    """
+    書き込みの速度と問い合わせの時間を計測して表示する
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the leaderboard database")
+    parser.add_argument("--rows", type=int, default=1_000_000, help="rows to insert before querying")
+    parser.add_argument("--batch", type=int, default=10_000, help="rows per transaction")
+    parser.add_argument("--queries", type=int, default=200, help="queries per measurement")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--min-insert-rate", type=float, help="fail below this many rows/s")
+    parser.add_argument("--max-latency-ms", type=float, help="fail if a query p95 exceeds this")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = time.time()
+    today = _play_date(now)
+    failed = False
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "scores.db")
+
+        # テーブルとインデックスは ScoreStore に作らせる（WAL モードもデータベースに記録される）
+        store = ScoreStore(path)
+        store.query_top(1, 1).result()
+
+        rows = make_rows(rng, args.rows, now)
+        rate = bench_insert(path, rows, args.batch)
+        print(f"insert: {args.rows} rows in batches of {args.batch}: {rate:,.0f} rows/s")
+        if args.min_insert_rate is not None and rate < args.min_insert_rate:
+            failed = True
+
+        def submit_clear():
+            return store.submit_result(ScoreRecord(now, rng.randint(1, STAGES), True,
+                                                   rng.randint(0, 100), rng.uniform(5.0, 60.0)))
+
+        queries = [
+            ("submit + rank", submit_clear),
+            ("top 10", lambda: store.query_top(rng.randint(1, STAGES), 10)),
+            ("today top 10", lambda: store.query_top(rng.randint(1, STAGES), 10, today)),
+        ]
+        for name, function in queries:
+            p50, p95, worst = measure(function, args.queries)
+            print(f"{name:>14}: p50 {p50 * 1000:.3f} ms, p95 {p95 * 1000:.3f} ms, max {worst * 1000:.3f} ms")
+            if args.max_latency_ms is not None and p95 * 1000 > args.max_latency_ms:
+                failed = True
+        store.close()
+
+    if failed:
+        print("Leaderboard benchmark did not meet the requested limits")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+ゲームシーンのフレームごとのメモリ割り当てが予算内に収まっているかを確認するスクリプト
+
+画面を開かずに各ステージのゲームシーンを定常状態まで進め、1フレームあたりの割り当て
+（一時オブジェクトを含むピーク量）が ALLOC_FRAME_BUDGET を超えていないかを確認する。
+超えたステージがあれば割り当ての多い行を表示し、終了コード1で終了する。
+
+    python check_alloc.py [--budget バイト数] [--frames N]
+"""
+import argparse
+import os
+import random
+import sys
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 画面と音を使わずに実行する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.level import LevelManager
+from src.scenes.game_scene import GameScene
+from src.utils.alloc_tracker import assert_allocation_budget
+from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, ALLOC_FRAME_BUDGET
+from src.utils.telemetry import Telemetry
+
+
+def main():
+    """
+    各ステージのゲームシーンについて割り当ての予算を確認する
+    """
+    parser = argparse.ArgumentParser(description="Check per-frame allocations of the game scene")
+    parser.add_argument("--budget", type=int, default=ALLOC_FRAME_BUDGET, help="bytes allowed per frame")
+    parser.add_argument("--frames", type=int, default=60, help="frames to measure per stage")
+    parser.add_argument("--warmup", type=int, default=30, help="frames to run before measuring")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+
+    # 計測用に作るゲームシーンのイベントをプレイ記録に残さない
+    Telemetry().disable()
+    level_manager = LevelManager()
+    failed = 0
+    for index in range(max(1, len(level_manager))):
+        # うさぎの振り返りの時刻を固定し、計測中は定常状態（プレイヤーは停止中）のままにする
+        scene = GameScene(level_manager.get(index), index + 1, random.Random(index))
+        try:
+            results = assert_allocation_budget(scene, screen, args.budget, args.frames, args.warmup)
+        except AssertionError as e:
+            failed += 1
+            print(f"OVER BUDGET stage {index + 1}: {e}")
+            continue
+        worst = max(results, key=lambda result: result.peak_bytes)
+        net_blocks = sum(result.net_blocks for result in results) / len(results)
+        print(f"stage {index + 1}: peak {worst.peak_bytes} B/frame (budget {args.budget} B), "
+              f"{worst.peak_blocks} blocks live at peak, net {net_blocks:+.1f} blocks/frame")
+    Telemetry().close()
+
+    if failed:
+        print(f"{failed} stage(s) exceeded the allocation budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
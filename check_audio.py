@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+サウンド管理が動作するかを確認するスクリプト
+
+SDL のダミーのオーディオドライバーで音を出さずにミキサーを初期化し、一時ディレクトリに
+生成した短い WAV を使って、効果音の事前読み込み・チャンネルが埋まった時の奪い取り・
+BGM のストリーミング再生の開始と停止を確認する（音声のアセットは同梱していないため）。
+確認に失敗した項目があれば表示し、終了コード1で終了する。
+
+    python check_audio.py
+"""
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+import wave
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 音を出さずに実行する
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.utils.audio_manager import AudioManager
+from src.utils.constants import AUDIO_FREQUENCY, AUDIO_CHANNELS, SOUND_EFFECTS
+
+BGM_TEST_FILE = "bgm.wav"  # 生成するBGMのファイル名（pygame.mixer.music は WAV も再生できる）
+
+
+def write_tone(path, seconds, frequency=440.0):
+    """
+    正弦波の WAV ファイル（16ビット、モノラル）を書き出す
+
+    Args:
+        path (str): 出力先のパス
+        seconds (float): 長さ（秒）
+        frequency (float): 周波数（Hz）
+    """
+    count = int(AUDIO_FREQUENCY * seconds)
+    samples = (int(8000 * math.sin(2 * math.pi * frequency * i / AUDIO_FREQUENCY)) for i in range(count))
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(AUDIO_FREQUENCY)
+        f.writeframes(struct.pack(f"<{count}h", *samples))
+
+
+def wait_until(condition, timeout=2.0):
+    """
+    条件が満たされるまで待つ
+
+    Args:
+        condition (callable): 条件
+        timeout (float): 待つ時間の上限（秒）
+
+    Returns:
+        bool: 時間内に条件が満たされたならTrue
+    """
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def main():
+    """
+    生成した WAV でサウンド管理の各機能を確認する
+    """
+    failures = []
+
+    def check(name, ok, detail=""):
+        print(f"{'ok  ' if ok else 'FAIL'} {name}{f' ({detail})' if detail else ''}")
+        if not ok:
+            failures.append(name)
+
+    with tempfile.TemporaryDirectory() as directory:
+        # 効果音はすべてのチャンネルを埋めても鳴り終わらない長さにする
+        for file_name in SOUND_EFFECTS.values():
+            write_tone(os.path.join(directory, file_name), 1.0)
+        write_tone(os.path.join(directory, BGM_TEST_FILE), 2.0, 220.0)
+
+        audio = AudioManager(directory)
+        check("mixer initialized", audio.enabled, os.environ["SDL_AUDIODRIVER"])
+        if not audio.enabled:
+            return 1
+
+        # 事前読み込み
+        missing = [name for name in SOUND_EFFECTS if name not in audio.sounds]
+        check("effects preloaded", not missing, f"missing: {', '.join(missing)}" if missing else
+              f"{len(audio.sounds)} effect(s)")
+
+        # チャンネルを埋めてから1つ多く鳴らし、最も古いチャンネルが奪われることを確認する
+        name = next(iter(SOUND_EFFECTS))
+        timings = []
+        for _ in range(AUDIO_CHANNELS):
+            start = time.perf_counter()
+            audio.play_effect(name)
+            timings.append(time.perf_counter() - start)
+            time.sleep(0.002)  # 再生を始めた時刻に差をつける
+        busy = sum(channel.get_busy() for channel in audio.channels)
+        check("channel pool filled", busy == AUDIO_CHANNELS, f"{busy}/{AUDIO_CHANNELS} busy")
+
+        oldest = min(range(AUDIO_CHANNELS), key=audio._channel_started.__getitem__)
+        start = time.perf_counter()
+        audio.play_effect(name, 0.5)
+        timings.append(time.perf_counter() - start)
+        newest = max(range(AUDIO_CHANNELS), key=audio._channel_started.__getitem__)
+        stolen = audio.channels[oldest]
+        check("oldest channel stolen", newest == oldest and stolen.get_busy() and stolen.get_volume() == 0.5,
+              f"channel {oldest}")
+        check("effects do not block", max(timings) < 0.005, f"max {max(timings) * 1000:.3f} ms")
+        pygame.mixer.stop()
+
+        # BGM のストリーミング再生
+        audio.play_bgm(BGM_TEST_FILE, loops=0, fade_ms=0)
+        check("BGM started", wait_until(pygame.mixer.music.get_busy))
+        audio.stop_bgm(fade_ms=50)
+        check("BGM stopped", wait_until(lambda: not pygame.mixer.music.get_busy()))
+        pygame.mixer.music.unload()
+
+    pygame.mixer.quit()
+    if failures:
+        print(f"{len(failures)} audio check(s) failed")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+描画結果をゴールデンフレームと比較するスクリプト
+
+画面を開かずに決まったシードでシーンを描画し、保存済みの PNG とピクセル単位で比較する。
+一致しなかったフレームは差のヒートマップを書き出し、終了コード1で終了する。
+
+    python check_frames.py --update       # 現在の描画結果をゴールデンとして保存する
+    python check_frames.py [--tolerance N]  # ゴールデンと比較する
+"""
+import argparse
+import os
+import sys
+import time
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# 画面と音を使わずに実行する
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+from src.level import LevelManager
+from src.utils.golden_frames import GOLDEN_DIR, GOLDEN_DIFF_DIR, build_scenarios, check_golden_frames
+from src.utils.telemetry import Telemetry
+
+
+def main():
+    """
+    標準のシナリオを描画してゴールデンと比較する
+    """
+    parser = argparse.ArgumentParser(description="Compare rendered frames against golden PNGs")
+    parser.add_argument("--update", action="store_true", help="save the current frames as golden")
+    parser.add_argument("--tolerance", type=int, default=0, help="allowed per-channel difference")
+    parser.add_argument("--golden-dir", default=GOLDEN_DIR)
+    parser.add_argument("--diff-dir", default=GOLDEN_DIFF_DIR)
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.font.init()
+    pygame.display.set_mode((1, 1))
+
+    start = time.perf_counter()
+    results = check_golden_frames(build_scenarios(LevelManager()), args.golden_dir, args.diff_dir,
+                                  args.tolerance, args.update)
+    elapsed = time.perf_counter() - start
+    Telemetry().close()
+
+    if args.update:
+        print(f"Saved {len(results)} golden frame(s) to {args.golden_dir} in {elapsed:.1f} s")
+        return 0
+
+    missing = [result for result in results if result.missing]
+    failed = [result for result in results if result.mismatched]
+    for result in failed:
+        print(f"MISMATCH {result.name}: {result.mismatched} pixel(s), max diff {result.max_diff}")
+    for result in missing:
+        print(f"MISSING  {result.name}")
+    print(f"Compared {len(results) - len(missing)} frame(s) in {elapsed:.1f} s: "
+          f"{len(failed)} mismatched, {len(missing)} missing")
+    if failed:
+        print(f"Heatmaps written to {args.diff_dir}")
+    return 1 if failed or missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
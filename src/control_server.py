@@ -0,0 +1,384 @@
+"""
+外部から操作するための制御ソケットを定義するモジュール
+
+Unix ドメインソケットで JSON-RPC 2.0 の要求を受け付け、テスト用のボットや QA ツールから
+実際に動いているゲームを操作できるようにする。
+要求は1行に1つの JSON（単独の要求、または要求の配列によるバッチ）で送り、応答も1行で返す。
+
+ソケットの読み書きは接続ごとのバックグラウンドのスレッドで行い、受け取った要求は溜めておくだけにする。
+メインループはフレームの合間に process() を呼び、溜まった要求をまとめて処理する。
+ゲームの状態を変更するのは常にメインスレッドなので、ループは入出力を待って止まることがない。
+
+    {"jsonrpc": "2.0", "id": 1, "method": "click", "params": {"x": 700, "y": 300}}
+    [{"jsonrpc": "2.0", "id": 2, "method": "step", "params": {"frames": 120}},
+     {"jsonrpc": "2.0", "id": 3, "method": "state"}]
+"""
+import base64
+import inspect
+import io
+import json
+import os
+import socket
+import threading
+from collections import deque
+import pygame
+from src.utils.constants import FPS, SCENE_GAME, CONTROL_STEP_MAX_FRAMES
+
+# JSON-RPC のエラーコード
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+
+
+class ControlError(Exception):
+    """
+    制御コマンドを実行できない場合の例外（要求への応答としてエラーを返す）
+    """
+    def __init__(self, message, code=SERVER_ERROR):
+        """
+        Args:
+            message (str): エラーの説明
+            code (int): JSON-RPC のエラーコード
+        """
+        super().__init__(message)
+        self.code = code
+
+
+def _error_response(request_id, code, message):
+    """
+    エラーの応答を作る
+
+    Args:
+        request_id: 要求のID
+        code (int): JSON-RPC のエラーコード
+        message (str): エラーの説明
+
+    Returns:
+        dict: 応答
+    """
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+def _number_param(name, value, kind):
+    """
+    数値の引数を変換する
+
+    Args:
+        name (str): 引数の名前（エラーの説明に使う）
+        value: 受け取った値
+        kind (type): int または float
+
+    Returns:
+        int or float: 変換した値
+
+    Raises:
+        ControlError: 数値に変換できない場合（INVALID_PARAMS）
+    """
+    try:
+        return kind(value)
+    except (TypeError, ValueError):
+        raise ControlError(f"{name} must be a number", INVALID_PARAMS) from None
+
+
+class _PendingCall:
+    """
+    メインスレッドの処理を待っている要求（1行分）
+    """
+    __slots__ = ("payload", "response", "done")
+
+    def __init__(self, payload):
+        """
+        Args:
+            payload: 受け取った JSON（単独の要求の dict、またはバッチの list）
+        """
+        self.payload = payload
+        self.response = None  # 送り返す JSON（応答が不要な通知だけの場合はNone）
+        self.done = threading.Event()
+
+
+class ControlServer:
+    """
+    Unix ドメインソケットで制御コマンドを受け付けるサーバー
+
+    1つの接続では前の行の応答を返してから次の行を読むため、要求は送った順に処理される。
+    1往復ごとにフレームを待つので、多くの操作を行う場合はバッチにまとめて送る。
+    """
+    def __init__(self, path):
+        """
+        ソケットを作成し、接続の受け付けを開始する
+
+        Args:
+            path (str): ソケットファイルのパス
+
+        Raises:
+            OSError: ソケットを作成できない場合（Unix ドメインソケットに対応していない環境を含む）
+        """
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix domain sockets are not supported on this platform")
+        self.path = path
+        self._pending = deque()
+        self._stopping = threading.Event()
+
+        # 前回異常終了した場合のソケットファイルが残っていれば削除する
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if os.path.exists(path):
+            os.unlink(path)
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.bind(path)
+        # 他のユーザーからゲームを操作されたり、screenshot で任意の場所に書き込まれたりしないようにする
+        os.chmod(path, 0o600)
+        self._socket.listen()
+        self._socket.settimeout(0.5)
+
+        self._thread = threading.Thread(target=self._accept_loop, name="control-accept", daemon=True)
+        self._thread.start()
+        print(f"Control socket listening on {path}")
+
+    def _accept_loop(self):
+        """
+        接続を受け付け、接続ごとにスレッドを開始する（バックグラウンドのスレッド）
+        """
+        while not self._stopping.is_set():
+            try:
+                connection, _ = self._socket.accept()
+            except socket.timeout:
+                continue
+            except OSError:
+                break
+            threading.Thread(target=self._serve_connection, args=(connection,),
+                             name="control-connection", daemon=True).start()
+
+    def _serve_connection(self, connection):
+        """
+        1つの接続から要求を読み、メインスレッドの処理を待って応答を返す（バックグラウンドのスレッド）
+
+        Args:
+            connection (socket.socket): 接続
+        """
+        with connection, connection.makefile("rb") as reader:
+            for line in reader:
+                if self._stopping.is_set():
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    payload = json.loads(line)
+                except ValueError as e:
+                    response = _error_response(None, PARSE_ERROR, f"Parse error: {e}")
+                else:
+                    call = _PendingCall(payload)
+                    self._pending.append(call)
+                    # 終了時に取り残されないよう、待つ間も終了要求を確認する
+                    while not call.done.wait(0.5):
+                        if self._stopping.is_set():
+                            return
+                    response = call.response
+                if response is None:
+                    continue
+                try:
+                    connection.sendall(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+                except OSError:
+                    break
+
+    def process(self, handler):
+        """
+        溜まっている要求を処理する（メインループのフレームの合間に呼ぶ）
+
+        処理中に届いた要求は次の呼び出しで処理する。
+
+        Args:
+            handler: METHODS に挙げたメソッドを持つオブジェクト（GameControl）
+        """
+        pending = self._pending
+        for _ in range(len(pending)):
+            call = pending.popleft()
+            payload = call.payload
+            if isinstance(payload, list):
+                if payload:
+                    responses = [self._dispatch(handler, request) for request in payload]
+                    call.response = [response for response in responses if response is not None] or None
+                else:
+                    call.response = _error_response(None, INVALID_REQUEST, "Empty batch")
+            else:
+                call.response = self._dispatch(handler, payload)
+            call.done.set()
+
+    @staticmethod
+    def _dispatch(handler, request):
+        """
+        1つの要求を実行する
+
+        Args:
+            handler: コマンドを実行するオブジェクト
+            request: 要求（dict）
+
+        Returns:
+            dict or None: 応答（id のない通知の場合はNone）
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, INVALID_REQUEST, "Invalid request")
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params", {})
+
+        if method not in handler.METHODS:
+            response = _error_response(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+        elif not isinstance(params, dict):
+            response = _error_response(request_id, INVALID_PARAMS, "params must be an object")
+        else:
+            function = getattr(handler, method)
+            try:
+                inspect.signature(function).bind(**params)
+            except TypeError as e:
+                response = _error_response(request_id, INVALID_PARAMS, str(e))
+            else:
+                try:
+                    response = {"jsonrpc": "2.0", "id": request_id, "result": function(**params)}
+                except ControlError as e:
+                    response = _error_response(request_id, e.code, str(e))
+                except Exception as e:
+                    # ゲーム側の例外でメインループを止めず、要求を送った接続にはエラーを返す
+                    print(f"Control method {method} failed: {type(e).__name__}: {e}")
+                    response = _error_response(request_id, SERVER_ERROR, f"{type(e).__name__}: {e}")
+        return response if "id" in request else None
+
+    def close(self):
+        """
+        受け付けを止め、ソケットファイルを削除する
+        """
+        self._stopping.set()
+        self._socket.close()
+        self._thread.join(timeout=2.0)
+        # 処理を待っている要求は応答せずに終える
+        while self._pending:
+            self._pending.popleft().done.set()
+        try:
+            os.unlink(self.path)
+        except OSError:
+            pass
+
+
+class GameControl:
+    """
+    制御ソケットから呼び出せるコマンド（メインスレッドで実行する）
+
+    METHODS に挙げたメソッドの名前がそのまま JSON-RPC のメソッド名になり、params はキーワード引数として渡す。
+    """
+    METHODS = frozenset(("click", "step", "state", "screenshot"))
+
+    def __init__(self, game):
+        """
+        Args:
+            game (Game): 操作するゲーム
+        """
+        self.game = game
+
+    def click(self, x, y, button=1):
+        """
+        マウスクリックを入力する（実際のクリックと同じく現在のシーンに渡す）
+
+        Args:
+            x (int): X座標
+            y (int): Y座標
+            button (int): マウスボタン（1: 左, 3: 右）
+
+        Returns:
+            dict: 入力後の状態（state() と同じ）
+
+        Raises:
+            ControlError: 座標・ボタンが数値でない場合
+        """
+        x, y = _number_param("x", x, int), _number_param("y", y, int)
+        event = pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=(x, y), button=_number_param("button", button, int))
+        self.game._dispatch_event(event)
+        return self.state()
+
+    def step(self, frames=1, dt=None):
+        """
+        描画せずにシーンを指定したフレーム数だけ進める
+
+        Args:
+            frames (int): 進めるフレーム数（CONTROL_STEP_MAX_FRAMES まで）
+            dt (float): 1フレームの経過時間（秒、省略時は 1 / FPS）
+
+        Returns:
+            dict: 進めた後の状態（state() と同じ）
+
+        Raises:
+            ControlError: 別スレッドでシミュレーションしている場合、フレーム数が範囲外・数値でない場合
+        """
+        game = self.game
+        if game.simulation is not None:
+            raise ControlError("step is not available while the simulation thread is running")
+        frames = _number_param("frames", frames, int)
+        if not 0 <= frames <= CONTROL_STEP_MAX_FRAMES:
+            raise ControlError(f"frames must be between 0 and {CONTROL_STEP_MAX_FRAMES}", INVALID_PARAMS)
+        dt = 1.0 / FPS if dt is None else _number_param("dt", dt, float)
+        for _ in range(frames):
+            game._update_scene(dt)
+            # ゲーム中は自動の GC を止めているので、フレームごとと同じく溜まりすぎていないか確認する
+            game.gc_control.poll(game._is_playing())
+        return self.state()
+
+    def state(self):
+        """
+        現在のシーンとプレイヤー・うさぎの状態を取得する
+
+        別スレッドでシミュレーションしている場合は、最後に公開された状態を返す。
+
+        Returns:
+            dict: 状態
+        """
+        game = self.game
+        result = {"scene": game.current_scene, "stage": game.stage_index + 1}
+        if game.current_scene != SCENE_GAME:
+            return result
+
+        if game.simulation is not None:
+            render_state, tick = game.simulation.buffer.latest()
+            player_pos, rabbit_pos = render_state.player_pos, render_state.rabbit_pos
+            looking_back, mood = render_state.rabbit_looking, render_state.mood
+            warning_visible = render_state.warning_visible
+            game_over, game_clear = render_state.game_over, render_state.game_clear
+            result["tick"] = tick
+        else:
+            scene = game.scenes[SCENE_GAME]
+            player_pos, rabbit_pos = scene.player.get_position(), scene.rabbit.get_position()
+            looking_back, mood = scene.rabbit.is_looking_back(), scene.rabbit.get_mood()
+            warning_visible = scene.warning_visible
+            game_over, game_clear = scene.game_over, scene.game_clear
+
+        result.update({
+            "player": {"x": player_pos[0], "y": player_pos[1]},
+            "rabbit": {"x": rabbit_pos[0], "y": rabbit_pos[1], "looking_back": looking_back, "mood": mood},
+            "warning_visible": warning_visible,
+            "game_over": game_over,
+            "game_clear": game_clear,
+        })
+        return result
+
+    def screenshot(self, path=None):
+        """
+        現在のシーンを描画して PNG として保存する
+
+        Args:
+            path (str): 保存先のパス（省略時は PNG を Base64 で返す）
+
+        Returns:
+            dict: {"path": 保存先} または {"png": Base64 の PNG}
+        """
+        game = self.game
+        game._draw_scene()
+        if path is not None:
+            try:
+                pygame.image.save(game.screen, path)
+            except (pygame.error, OSError) as e:
+                raise ControlError(f"Failed to save screenshot: {e}")
+            return {"path": path}
+        buffer = io.BytesIO()
+        pygame.image.save(game.screen, buffer, "png")
+        return {"png": base64.b64encode(buffer.getvalue()).decode("ascii")}
@@ -0,0 +1,314 @@
+"""
+エンティティコンポーネントストアを定義するモジュール
+
+位置・速度・向き・タイマー・機嫌度などのコンポーネントを、
+エンティティごとのオブジェクトではなくコンポーネントごとの連続した型付き配列で保持する。
+移動・プレイヤー検出といったシステムはこれらの配列を NumPy の配列として参照し、
+対象のエンティティをまとめて配列演算で処理する（エンティティごとの Python のループは行わない）。
+"""
+from array import array
+import numpy as np
+from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT
+
+# エンティティの種類
+KIND_NONE = 0
+KIND_PLAYER = 1
+KIND_RABBIT = 2
+
+# コンポーネント名と配列の型コード
+FLOAT_COMPONENTS = (
+    "x", "y", "vx", "vy", "target_x", "target_y", "waypoint_x", "waypoint_y", "speed", "size",
+    "direction", "turn_timer", "next_turn_time", "looking_timer",
+)
+INT_COMPONENTS = ("kind", "moving", "looking_back", "mood")
+
+
+class EntityStore:
+    """
+    コンポーネントを構造体配列（SoA）形式で保持するストア
+    """
+    def __init__(self, capacity=16):
+        """
+        ストアの初期化
+
+        Args:
+            capacity (int): 初期確保するエンティティ数
+        """
+        self.capacity = 0
+        self.count = 0  # 使用済みのスロット数（解放済みを含む）
+        self._free = []
+        self._members = {KIND_PLAYER: [], KIND_RABBIT: []}
+        for name in FLOAT_COMPONENTS:
+            setattr(self, name, array("d"))
+        for name in INT_COMPONENTS:
+            setattr(self, name, array("i"))
+        self._grow(capacity)
+
+    def _view(self, name):
+        """
+        コンポーネント配列をコピーせずに NumPy の配列として参照する
+
+        参照している間は配列を拡張できないため、システムの処理の中でのみ使う。
+
+        Args:
+            name (str): コンポーネント名
+
+        Returns:
+            numpy.ndarray: 使用済みのスロット分の配列
+        """
+        values = getattr(self, name)
+        dtype = np.float64 if values.typecode == "d" else np.intc
+        return np.frombuffer(values, dtype=dtype, count=self.count)
+
+    def _grow(self, capacity):
+        """
+        配列を指定した容量まで拡張する
+
+        Args:
+            capacity (int): 新しい容量
+        """
+        extra = capacity - self.capacity
+        if extra <= 0:
+            return
+        for name in FLOAT_COMPONENTS:
+            getattr(self, name).extend(array("d", bytes(8 * extra)))
+        for name in INT_COMPONENTS:
+            getattr(self, name).extend(array("i", [0]) * extra)
+        self.capacity = capacity
+
+    def create(self, kind, x=0.0, y=0.0, size=0.0, speed=0.0):
+        """
+        エンティティを生成する
+
+        Args:
+            kind (int): エンティティの種類（KIND_PLAYER または KIND_RABBIT）
+            x (float): 初期X座標
+            y (float): 初期Y座標
+            size (float): 大きさ
+            speed (float): 移動速度
+
+        Returns:
+            int: エンティティのインデックス
+        """
+        if self._free:
+            index = self._free.pop()
+        else:
+            if self.count >= self.capacity:
+                self._grow(max(16, self.capacity * 2))
+            index = self.count
+            self.count += 1
+
+        for name in FLOAT_COMPONENTS:
+            getattr(self, name)[index] = 0.0
+        for name in INT_COMPONENTS:
+            getattr(self, name)[index] = 0
+        self.kind[index] = kind
+        self.x[index] = x
+        self.y[index] = y
+        self.target_x[index] = x
+        self.target_y[index] = y
+        self.waypoint_x[index] = x
+        self.waypoint_y[index] = y
+        self.size[index] = size
+        self.speed[index] = speed
+        self._members[kind].append(index)
+        return index
+
+    def destroy(self, index):
+        """
+        エンティティを破棄する（スロットは再利用される）
+
+        Args:
+            index (int): エンティティのインデックス
+        """
+        kind = self.kind[index]
+        if kind == KIND_NONE:
+            return
+        self._members[kind].remove(index)
+        self.kind[index] = KIND_NONE
+        self._free.append(index)
+
+    def indices(self, kind):
+        """
+        指定した種類の生存中エンティティのインデックスを取得する
+
+        Args:
+            kind (int): エンティティの種類
+
+        Returns:
+            list: インデックスのリスト
+        """
+        return self._members[kind]
+
+    def set_target(self, index, x, y):
+        """
+        エンティティの目標地点を設定する（経由地点も目標地点にリセットする）
+
+        Args:
+            index (int): エンティティのインデックス
+            x (float): 目標X座標
+            y (float): 目標Y座標
+        """
+        self.target_x[index] = self.waypoint_x[index] = x
+        self.target_y[index] = self.waypoint_y[index] = y
+
+    def dump_components(self):
+        """
+        使用中のスロットのコンポーネント配列をバイト列にまとめる
+
+        Returns:
+            bytes: コンポーネント名の順に並べた配列の内容
+        """
+        count = self.count
+        return b"".join(
+            getattr(self, name)[:count].tobytes()
+            for name in FLOAT_COMPONENTS + INT_COMPONENTS
+        )
+
+    def load_components(self, data):
+        """
+        dump_components() で作ったバイト列からコンポーネント配列を復元する
+
+        スロットの数と各エンティティの種類は、復元先のストアと一致している必要がある。
+
+        Args:
+            data (bytes or memoryview): dump_components() の結果
+
+        Raises:
+            ValueError: スロットの数や種類が一致しない場合
+        """
+        count = self.count
+        arrays = {}
+        offset = 0
+        for name in FLOAT_COMPONENTS + INT_COMPONENTS:
+            values = array(getattr(self, name).typecode)
+            size = values.itemsize * count
+            values.frombytes(data[offset:offset + size])
+            arrays[name] = values
+            offset += size
+        if offset != len(data):
+            raise ValueError("Entity count does not match")
+        if arrays["kind"] != self.kind[:count]:
+            raise ValueError("Entity kinds do not match")
+
+        for name, values in arrays.items():
+            getattr(self, name)[:count] = values
+
+    def update_movement(self, indices=None):
+        """
+        移動システム：移動中のエンティティを経由地点へ進め、画面内に収める
+
+        経由地点が目標地点と同じ場合（障害物がない場合）は目標地点へ直進する。
+
+        Args:
+            indices (iterable): 対象のインデックス（省略時は全プレイヤー）
+
+        Returns:
+            list: このステップで目標地点に到達したエンティティのインデックス
+        """
+        if indices is None:
+            indices = self._members[KIND_PLAYER]
+        idx = np.asarray(indices, dtype=np.intp)
+        if not idx.size:
+            return []
+        xs, ys = self._view("x"), self._view("y")
+        vxs, vys = self._view("vx"), self._view("vy")
+        wxs, wys = self._view("waypoint_x"), self._view("waypoint_y")
+        moving = self._view("moving")
+
+        # 移動中のエンティティについて、経由地点への移動ベクトルを計算
+        active = idx[moving[idx] != 0]
+        vxs[idx] = vys[idx] = 0.0
+        dx = wxs[active] - xs[active]
+        dy = wys[active] - ys[active]
+        distance = np.sqrt(dx * dx + dy * dy)
+        speed = self._view("speed")[active]
+
+        # 経由地点に到達したら、それが目標地点であれば停止
+        reached = distance < speed
+        stopped = active[reached]
+        xs[stopped] = wxs[stopped]
+        ys[stopped] = wys[stopped]
+        arrived = stopped[(wxs[stopped] == self._view("target_x")[stopped])
+                          & (wys[stopped] == self._view("target_y")[stopped])]
+        moving[arrived] = 0
+
+        # それ以外は正規化して速度を適用
+        going = ~reached
+        walking = active[going]
+        distance, speed = distance[going], speed[going]
+        vxs[walking] = dx[going] / distance * speed
+        vys[walking] = dy[going] / distance * speed
+        xs[walking] += vxs[walking]
+        ys[walking] += vys[walking]
+
+        # 画面外に出ないように制限
+        half = self._view("size")[idx] // 2
+        xs[idx] = np.clip(xs[idx], half, WINDOW_WIDTH - half)
+        ys[idx] = np.clip(ys[idx], half, WINDOW_HEIGHT - half)
+
+        return arrived.tolist()
+
+    def detect_player(self, player_pos, player_moving, view_angle, view_distance, indices=None):
+        """
+        検出システム：こちらを向いているうさぎのうち、移動中のプレイヤーを視界に捉えたものを求める
+
+        Args:
+            player_pos (tuple): プレイヤーの位置 (x, y)
+            player_moving (bool): プレイヤーが移動中かどうか
+            view_angle (float): 視野角（度）
+            view_distance (float): 視界距離
+            indices (iterable): 対象のインデックス（省略時は全うさぎ）
+
+        Returns:
+            list: プレイヤーを発見したうさぎの (インデックス, 距離, 角度差) のリスト
+        """
+        if indices is None:
+            indices = self._members[KIND_RABBIT]
+        if not player_moving:
+            return []
+        idx = np.asarray(indices, dtype=np.intp)
+        if not idx.size:
+            return []
+        watching = idx[self._view("looking_back")[idx] != 0]
+
+        # プレイヤーとうさぎの距離を計算
+        dx = player_pos[0] - self._view("x")[watching]
+        dy = player_pos[1] - self._view("y")[watching]
+        distance = np.sqrt(dx * dx + dy * dy)
+        near = distance <= view_distance
+        watching, dx, dy, distance = watching[near], dx[near], dy[near], distance[near]
+
+        # 視野角内にいるかチェック
+        angle = np.degrees(np.arctan2(dy, dx)) % 360
+        diff = np.abs(angle - self._view("direction")[watching])
+        angle_diff = np.minimum(diff, 360 - diff)
+        seen = angle_diff <= view_angle / 2
+        return list(zip(watching[seen].tolist(), distance[seen].tolist(), angle_diff[seen].tolist()))
+
+
+def component_property(name, convert=None, doc=None):
+    """
+    ストアのコンポーネントを参照するプロパティを作成する
+
+    ビュークラスは self._store と self._index を持つ必要がある。
+
+    Args:
+        name (str): コンポーネント名
+        convert (callable): 読み出し時の変換関数（例: bool）
+        doc (str): プロパティの説明
+
+    Returns:
+        property: コンポーネントを読み書きするプロパティ
+    """
+    if convert is None:
+        def getter(self):
+            return getattr(self._store, name)[self._index]
+    else:
+        def getter(self):
+            return convert(getattr(self._store, name)[self._index])
+
+    def setter(self, value):
+        getattr(self._store, name)[self._index] = value
+
+    return property(getter, setter, doc=doc)
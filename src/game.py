@@ -3,75 +3,326 @@
 """
 import pygame
 import sys
-from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE, FPS, SCENE_TITLE, SCENE_GAME, SCENE_RESULT
-from src.scenes.title_scene import TitleScene
-from src.scenes.game_scene import GameScene
-from src.scenes.result_scene import ResultScene
+import time
+from src.utils.constants import (
+    FPS, SCENE_TITLE, SCENE_GAME, SCENE_RESULT, DISPLAY_BACKEND,
+    SNAPSHOT_FILE, AUTOSAVE_INTERVAL, ALLOC_TRACE_INTERVAL, THREADED_SIMULATION, SIMULATION_RATE,
+    CONTROL_SOCKET, TRACE_ENABLED, TRACE_FILE, SHARED_STATE_NAME
+)
+from src.control_server import ControlServer, GameControl
+from src.level import LevelManager
+from src.scenes.registry import get_scene_class
+from src.session import create_scene
+from src.simulation import SimulationThread
+from src.snapshot import (
+    SnapshotError, SnapshotWriter, encode_snapshot, apply_snapshot, read_snapshot_file
+)
+from src.utils.alloc_tracker import AllocationTracker
+from src.utils.audio_manager import AudioManager
+from src.utils.display import create_display
+from src.utils.gc_control import GcController
+from src.utils.quality_governor import QualityGovernor
+from src.utils.score_store import ScoreStore
+from src.utils.shared_state import SharedStateWriter
+from src.utils.telemetry import Telemetry
+from src.utils.tracer import Tracer, trace_span, traced
 
 
 class Game:
     """
     ゲームのメインクラス
     """
-    def __init__(self):
+    def __init__(self, start_time=None):
         """
         ゲームの初期化
+        
+        Args:
+            start_time (float): 起動計測の基準時刻（time.perf_counter()の値、省略時は現在時刻）
         """
-        pygame.init()
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.first_frame_time = None
         
-        # 日本語フォントの初期化に関する情報を表示
-        print("Available system fonts:")
-        available_fonts = pygame.font.get_fonts()
-        print(f"Total fonts: {len(available_fonts)}")
-        print(f"Sample fonts: {available_fonts[:10]}")
+        # 使用するサブシステム（画面とフォント）だけを初期化する
+        pygame.display.init()
+        pygame.font.init()
         
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption(WINDOW_TITLE)
+        # 開発用: シーンの切り替えや読み込みも含めて処理時間のトレースを記録する
+        self.tracer = None
+        if TRACE_ENABLED:
+            self.tracer = Tracer()
+            self.tracer.start()
+        
+        # シーンは self.screen へ描画し、表示方法は描画バックエンドに任せる
+        self.display = create_display(DISPLAY_BACKEND)
+        self.screen = self.display.screen
         self.clock = pygame.time.Clock()
         self.running = True
         self.current_scene = None
         self.scenes = {}
+        self.level_manager = LevelManager()
+        self.stage_index = 0
+        self.snapshot_writer = SnapshotWriter(SNAPSHOT_FILE)
+        self.autosave_timer = 0
+        self.simulation = None  # ゲーム中の更新を行うスレッド（THREADED_SIMULATION の場合のみ）
+        self.quality = QualityGovernor()  # フレームの処理時間に応じて描画の品質を調整する
+        self.gc_control = GcController()  # ゲーム中は自動の GC を止め、安全な時点で回収する
+        
+        # 外部から操作するための制御ソケット（CONTROL_SOCKET を設定した場合のみ）
+        self.control_server = None
+        self.control = GameControl(self)
+        if CONTROL_SOCKET:
+            try:
+                self.control_server = ControlServer(CONTROL_SOCKET)
+            except OSError as e:
+                print(f"Failed to open control socket {CONTROL_SOCKET}: {e}")
+        
+        # 外部のプロセスが読めるよう、更新のたびに状態を共有メモリへ書き込む（SHARED_STATE_NAME を設定した場合のみ）
+        self.shared_state = None
+        if SHARED_STATE_NAME:
+            try:
+                self.shared_state = SharedStateWriter(SHARED_STATE_NAME)
+            except OSError as e:
+                print(f"Failed to create shared state {SHARED_STATE_NAME}: {e}")
+        
+        # デバッグ用: フレームごとのメモリ割り当てを計測する
+        self.alloc_tracker = None
+        if ALLOC_TRACE_INTERVAL:
+            self.alloc_tracker = AllocationTracker()
+            self.alloc_tracker.start()
+        
         self._init_scenes()
+        self._resume_from_snapshot()
 
     def _init_scenes(self):
         """
         シーンを初期化する
         """
         self.scenes = {
-            SCENE_TITLE: TitleScene()
+            SCENE_TITLE: get_scene_class(SCENE_TITLE)()
         }
         self.current_scene = SCENE_TITLE
+        
+        # タイトル画面を表示している間に最初のステージを読み込んでおく
+        self.level_manager.prefetch(self.stage_index)
+
+    def _resume_from_snapshot(self):
+        """
+        前回の途中保存があれば、そのゲームを再開する
+        """
+        snapshot = read_snapshot_file(SNAPSHOT_FILE)
+        if snapshot is None:
+            return
+        
+        self.stage_index = snapshot.stage_number - 1
+        if not 0 <= self.stage_index < max(1, len(self.level_manager)):
+            print(f"Ignoring snapshot for unknown stage {snapshot.stage_number}")
+            self.stage_index = 0
+            return
+        
+        self._change_scene(SCENE_GAME)
+        try:
+            apply_snapshot(snapshot, self.scenes[SCENE_GAME])
+        except SnapshotError as e:
+            # ステージの構成が変わっている場合などは最初からやり直す
+            print(f"Failed to resume snapshot: {e}")
+            self._change_scene(SCENE_GAME)
+            return
+        print(f"Resumed stage {snapshot.stage_number} from snapshot ({snapshot.play_time:.1f} s played)")
+
+    def _autosave(self, dt):
+        """
+        ゲーム中は一定間隔で途中保存する（書き出しはバックグラウンドで行う）
+        
+        Args:
+            dt (float): 経過時間（秒）
+        """
+        if self.current_scene != SCENE_GAME:
+            return
+        self.autosave_timer += dt
+        if self.autosave_timer >= AUTOSAVE_INTERVAL:
+            self.autosave_timer = 0
+            self.snapshot_writer.submit(encode_snapshot(self.scenes[SCENE_GAME]))
+
+    def _publish_state(self):
+        """
+        現在の状態を共有メモリに書き込む（更新したスレッドから呼ぶ）
+        """
+        if self.shared_state is None:
+            return
+        scene = self.scenes[SCENE_GAME] if self.current_scene == SCENE_GAME else None
+        self.shared_state.publish(self.current_scene, self.stage_index + 1, scene)
+
+    def _on_tick(self, dt):
+        """
+        シーンを1回更新した後の処理（途中保存と状態の公開）
+        
+        Args:
+            dt (float): 経過時間（秒）
+        """
+        self._autosave(dt)
+        self._publish_state()
+
+    def _start_simulation(self):
+        """
+        ゲームシーンの更新を別スレッドで開始する
+        """
+        self.simulation = SimulationThread(self.scenes[SCENE_GAME], SIMULATION_RATE, self._on_tick)
+        self.simulation.start()
+
+    def _stop_simulation(self):
+        """
+        別スレッドでの更新を止める（以降はメインスレッドでシーンを参照してよい）
+        """
+        if self.simulation is not None:
+            self.simulation.stop()
+            self.simulation = None
+
+    def _is_playing(self):
+        """
+        ゲーム中（ゲームオーバー・クリアの前）かどうかを返す
+        
+        Returns:
+            bool: ゲーム中ならTrue（結果表示までの待ち時間は含まない）
+        """
+        if self.current_scene != SCENE_GAME:
+            return False
+        scene = self.scenes[SCENE_GAME]
+        return not (scene.game_over or scene.game_clear)
 
     def run(self):
         """
         ゲームのメインループを実行する
+        
+        THREADED_SIMULATION の場合、ゲーム中は入力をシミュレーションのスレッドへ渡し、
+        メインスレッドはそのスレッドが公開した最新の状態を描画する。
         """
         while self.running:
-            dt = self.clock.tick(FPS) / 1000.0  # 経過時間（秒）
+            with trace_span("wait", "frame"):
+                dt = self.clock.tick(FPS) / 1000.0  # 経過時間（秒）
+            frame_start = time.perf_counter()
+            frame_scene = self.scenes[self.current_scene]
+            self.gc_control.begin_frame(self._is_playing())
+            if self.alloc_tracker is not None:
+                self.alloc_tracker.begin_frame()
+            
+            # ゲームシーンの更新は途中保存の復元などが済んでから別スレッドで始める
+            if THREADED_SIMULATION and self.simulation is None and self.current_scene == SCENE_GAME:
+                self._start_simulation()
             
             # イベント処理
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                    break
-                
-                # 現在のシーンにイベントを渡す
-                next_scene = self.scenes[self.current_scene].handle_event(event)
-                if next_scene:
-                    self._change_scene(next_scene)
+            with trace_span("events", "frame"):
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        self._stop_simulation()
+                        # ゲームの途中でウィンドウを閉じた場合は次回再開できるよう保存する
+                        if self.current_scene == SCENE_GAME:
+                            self.snapshot_writer.submit(encode_snapshot(self.scenes[SCENE_GAME]))
+                        self.running = False
+                        break
+                    
+                    # 開発用: F9 キーでそれまでのトレースを書き出す
+                    if self.tracer is not None and event.type == pygame.KEYDOWN and event.key == pygame.K_F9:
+                        self.tracer.export(TRACE_FILE)
+                        continue
+                    
+                    # 現在のシーンにイベントを渡す
+                    self._dispatch_event(event)
             
-            # シーンの更新
-            next_scene = self.scenes[self.current_scene].update(dt)
-            if next_scene:
-                self._change_scene(next_scene)
+            # 制御ソケットに届いた要求を処理する（まとめてフレームを進める場合があるため処理時間には含めない）
+            if self.control_server is not None and self.running:
+                control_start = time.perf_counter()
+                with trace_span("control", "frame"):
+                    self.control_server.process(self.control)
+                frame_start += time.perf_counter() - control_start
+            
+            # シーンの更新（別スレッドで更新している場合は遷移の要求だけを確認する）
+            with trace_span("update", "frame"):
+                if self.simulation is not None:
+                    if self.simulation.next_scene:
+                        self._change_scene(self.simulation.next_scene)
+                else:
+                    self._update_scene(dt)
             
             # 描画
-            self.scenes[self.current_scene].draw(self.screen)
-            pygame.display.flip()
+            with trace_span("draw", "frame"):
+                self._draw_scene()
+            with trace_span("present", "frame"):
+                self.display.present()
+            if self.alloc_tracker is not None:
+                self.alloc_tracker.end_frame(self.current_scene)
+            
+            # 待ち時間を除いた処理時間で品質を調整する（シーンを作り直したフレームは読み込みを含むため除く）
+            # 安全な時点でまとめて行った GC は描画の重さとは関係ないので除く
+            if self.scenes[self.current_scene] is frame_scene and self.first_frame_time is not None:
+                self.quality.record_frame(time.perf_counter() - frame_start - self.gc_control.explicit_pause, dt)
+            
+            # 起動から最初のフレームを表示するまでの時間を記録
+            if self.first_frame_time is None:
+                self.first_frame_time = time.perf_counter() - self.start_time
+                print(f"Time to first frame: {self.first_frame_time * 1000:.1f} ms")
+                
+                # 起動を遅らせないよう、サウンドは最初のフレームを表示してから初期化する
+                AudioManager().play_bgm()
+                
+                # フォントやキャッシュなど起動時に作ったオブジェクトを以降の GC の対象から外す
+                self.gc_control.freeze()
+            
+            # GC で止まった時間を集計する（最初のフレームの後の凍結で回収した分も含める）
+            self.gc_control.end_frame(self.current_scene)
+        
+        if self.control_server is not None:
+            self.control_server.close()
+        if self.tracer is not None:
+            self.tracer.stop()
+            self.tracer.export(TRACE_FILE)
+        if self.shared_state is not None:
+            self.shared_state.close()
+        self.gc_control.close()
         
+        # 溜まっているプレイ記録と結果を書き出してから終了する
+        Telemetry().close()
+        ScoreStore().close()
+        self.snapshot_writer.close()
         pygame.quit()
         sys.exit()
 
+    def _dispatch_event(self, event):
+        """
+        入力イベントを現在のシーンに渡す（別スレッドで更新している場合はそのスレッドへ渡す）
+        
+        Args:
+            event (pygame.event.Event): 入力イベント
+        """
+        if self.simulation is not None:
+            self.simulation.post_event(event)
+            return
+        next_scene = self.scenes[self.current_scene].handle_event(event)
+        if next_scene:
+            self._change_scene(next_scene)
+
+    def _update_scene(self, dt):
+        """
+        現在のシーンを更新し、要求があればシーンを変更する（メインスレッドで更新している場合）
+        
+        Args:
+            dt (float): 経過時間（秒）
+        """
+        next_scene = self.scenes[self.current_scene].update(dt)
+        self._on_tick(dt)
+        if next_scene:
+            self._change_scene(next_scene)
+
+    def _draw_scene(self):
+        """
+        現在のシーンを画面に描画する（別スレッドで更新している場合は公開された最新の状態を描画する）
+        """
+        if self.simulation is not None:
+            state, _ = self.simulation.buffer.latest()
+            self.scenes[self.current_scene].draw(self.screen, state)
+        else:
+            self.scenes[self.current_scene].draw(self.screen)
+
+    @traced("scene")
     def _change_scene(self, scene_name):
         """
         シーンを変更する
@@ -80,17 +331,19 @@ class Game:
             scene_name (str): 変更先のシーン名
         """
         print(f"Changing scene to: {scene_name}")
+        self._stop_simulation()
         
-        # 常に新しいシーンインスタンスを作成
-        if scene_name == SCENE_TITLE:
-            self.scenes[SCENE_TITLE] = TitleScene()
-        elif scene_name == SCENE_GAME:
-            self.scenes[SCENE_GAME] = GameScene()
+        if scene_name == SCENE_GAME:
+            self.autosave_timer = 0
         elif scene_name == SCENE_RESULT and SCENE_GAME in self.scenes:
-            # ゲームシーンからの情報を取得
-            game_scene = self.scenes[SCENE_GAME]
-            is_clear = game_scene.game_clear
-            mood = game_scene.rabbit.get_mood()
-            self.scenes[SCENE_RESULT] = ResultScene(is_clear, mood)
+            # ゲームが終わったので途中保存は不要になる
+            self.snapshot_writer.discard()
         
+        # 常に新しいシーンインスタンスを作成（結果シーンへの遷移ではステージも進める）
+        scene, self.stage_index = create_scene(scene_name, self.level_manager, self.stage_index,
+                                               self.scenes.get(SCENE_GAME))
+        self.scenes[scene_name] = scene
         self.current_scene = scene_name
+        
+        # シーンを作り直すフレームは読み込みを含むので、ここで前のシーンをまとめて回収する
+        self.gc_control.scene_changed()
@@ -0,0 +1,77 @@
+"""
+うさぎの聴覚（足音の伝搬）を定義するモジュール
+"""
+import numpy as np
+from src.utils.constants import RABBIT_HEARING_DISTANCE
+from src.utils.grid_field import (
+    GRID_ROWS, GRID_COLS, world_to_cell, compute_field, repair_field
+)
+
+
+class NoiseField:
+    """
+    足音の減衰場を管理するクラス
+
+    うさぎの位置（マス）ごとに、各マスで鳴った音がうさぎに届くまでの実効距離を
+    NumPy 配列として事前に計算してキャッシュする。毎フレームの聴覚判定は配列の参照だけで済む。
+    地形（音の吸収率）が変わった時は、キャッシュ済みの場を差分だけ修復する。
+    """
+    def __init__(self):
+        """
+        減衰場の初期化
+        """
+        # 音の吸収率（0で遮るものなし、大きいほど音が通りにくい）
+        self.absorption = np.zeros((GRID_ROWS, GRID_COLS), dtype=np.float32)
+        self._cost = self.absorption + 1.0
+        self._fields = {}  # うさぎのマス -> 実効距離の配列
+
+    def get_field(self, listener_pos):
+        """
+        聞き手の位置に対応する減衰場を取得する（未計算なら計算してキャッシュする）
+
+        Args:
+            listener_pos (tuple): 聞き手（うさぎ）の位置 (x, y)
+
+        Returns:
+            numpy.ndarray: 各マスから聞き手までの実効距離
+        """
+        cell = world_to_cell(*listener_pos)
+        field = self._fields.get(cell)
+        if field is None:
+            field = compute_field([cell], self._cost)
+            self._fields[cell] = field
+        return field
+
+    def set_absorption(self, cells, value):
+        """
+        地形の音の吸収率を変更し、キャッシュ済みの減衰場を修復する
+
+        Args:
+            cells (list): 変更するマス (行, 列) のリスト
+            value (float): 新しい吸収率
+        """
+        changed = [cell for cell in cells if self.absorption[cell] != value]
+        if not changed:
+            return
+        cost_increased = any(self.absorption[cell] < value for cell in changed)
+        for cell in changed:
+            self.absorption[cell] = value
+        self._cost = self.absorption + 1.0
+
+        for source, field in self._fields.items():
+            repair_field(field, [source], self._cost, changed, cost_increased)
+
+    def can_hear(self, listener_pos, source_pos, hearing_distance=RABBIT_HEARING_DISTANCE):
+        """
+        音源の音が聞き手に届くかどうかを判定する
+
+        Args:
+            listener_pos (tuple): 聞き手（うさぎ）の位置 (x, y)
+            source_pos (tuple): 音源（プレイヤー）の位置 (x, y)
+            hearing_distance (float): 聞き取れる実効距離
+
+        Returns:
+            tuple: (聞こえたかどうか, 実効距離)
+        """
+        distance = float(self.get_field(listener_pos)[world_to_cell(*source_pos)])
+        return (distance <= hearing_distance, distance)
@@ -0,0 +1,398 @@
+"""
+ステージ（レベル）を定義するモジュール
+
+ステージは小さなバイナリ形式のファイルに保存する。
+
+    ヘッダー（_HEADER）
+    ステージ名（UTF-8）
+    障害物（1つにつき 行, 列, 行数, 列数 の4バイト）
+    背景タイル（1マス1バイトのタイル番号）
+
+ファイルはメモリマップで開き、ヘッダー以外は初めて参照された時に読み出す。
+"""
+import glob
+import mmap
+import os
+import struct
+import sys
+import threading
+from functools import cached_property
+import numpy as np
+import pygame
+from src.rabbit import RabbitParams, DEFAULT_RABBIT_PARAMS
+from src.utils.grid_field import GRID_ROWS, GRID_COLS
+from src.utils.tracer import traced
+from src.utils.constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, GRID_CELL_SIZE, BACKGROUND_COLOR,
+    OBSTACLE_COLOR, OBSTACLE_BORDER_COLOR, TILE_COLORS, LEVELS_DIR,
+    LEVEL_FILE_EXTENSION
+)
+
+LEVEL_MAGIC = b"NULV"
+LEVEL_VERSION = 1
+
+# マジック, バージョン, ステージ名の長さ,
+# プレイヤーの初期位置 (x, y), うさぎの初期位置 (x, y),
+# 視野角, 視界距離, 振り返るまでの最小・最大時間, 振り返っている時間, 機嫌度の最大値,
+# 障害物の数, 障害物の位置, タイルの列数, タイルの行数, タイルの位置
+_HEADER = struct.Struct("<4sHH hhhh HHfffH HI HHI")
+_OBSTACLE = struct.Struct("<BBBB")
+
+
+class LevelFormatError(Exception):
+    """
+    ステージファイルの形式が不正な場合の例外
+    """
+
+
+class Level:
+    """
+    メモリマップで開いたステージ
+    """
+    def __init__(self, path):
+        """
+        ステージファイルを開いてヘッダーを読み込む
+
+        Args:
+            path (str): ステージファイルのパス
+
+        Raises:
+            OSError: ファイルを開けない場合
+            LevelFormatError: ファイルの形式が不正な場合（空のファイルや途中で切れたファイルを含む）
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            # 空のファイルはメモリマップできないので先に確認する
+            if os.fstat(f.fileno()).st_size < _HEADER.size:
+                raise LevelFormatError(f"Level file too short: {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except LevelFormatError:
+            self._map.close()
+            raise
+
+        self._background = None
+
+    def _read_header(self):
+        """
+        ヘッダーを読み込み、各部分がファイルの範囲に収まっていることを確認する
+
+        Raises:
+            LevelFormatError: ヘッダーが不正な場合
+        """
+        path = self.path
+        (magic, version, self._name_length,
+         player_x, player_y, rabbit_x, rabbit_y,
+         view_angle, view_distance, turn_min_time, turn_max_time, looking_time, mood_max,
+         self._obstacle_count, self._obstacle_offset,
+         self.tile_cols, self.tile_rows, self._tile_offset) = _HEADER.unpack_from(self._map, 0)
+        if magic != LEVEL_MAGIC:
+            raise LevelFormatError(f"Not a level file: {path}")
+        if version != LEVEL_VERSION:
+            raise LevelFormatError(f"Unsupported level version {version}: {path}")
+
+        # 遅延読み込みする部分も、途中で切れていないかはここで確認しておく
+        size = len(self._map)
+        sections = (
+            ("name", _HEADER.size, self._name_length),
+            ("obstacles", self._obstacle_offset, self._obstacle_count * _OBSTACLE.size),
+            ("tiles", self._tile_offset, self.tile_rows * self.tile_cols),
+        )
+        for section, offset, length in sections:
+            if offset < _HEADER.size or offset + length > size:
+                raise LevelFormatError(
+                    f"Level {section} out of range ({offset} + {length} > {size} bytes): {path}")
+
+        self.player_spawn = (player_x, player_y)
+        self.rabbit_spawn = (rabbit_x, rabbit_y)
+        self.rabbit_params = RabbitParams(
+            view_angle, view_distance, turn_min_time, turn_max_time, looking_time, mood_max)
+
+    @cached_property
+    def name(self):
+        """
+        ステージ名
+        """
+        start = _HEADER.size
+        try:
+            return self._map[start:start + self._name_length].decode("utf-8")
+        except UnicodeDecodeError as e:
+            raise LevelFormatError(f"Invalid level name: {self.path}") from e
+
+    @cached_property
+    def obstacles(self):
+        """
+        障害物の矩形 (行, 列, 行数, 列数) のリスト
+
+        Raises:
+            LevelFormatError: 障害物がマス目の範囲からはみ出している場合
+        """
+        obstacles = [
+            _OBSTACLE.unpack_from(self._map, self._obstacle_offset + i * _OBSTACLE.size)
+            for i in range(self._obstacle_count)
+        ]
+        for row, col, rows, cols in obstacles:
+            # 各値は符号なしなので、右端・下端がマス目に収まっていればよい
+            if row + rows > GRID_ROWS or col + cols > GRID_COLS:
+                raise LevelFormatError(
+                    f"Obstacle {(row, col, rows, cols)} outside the {GRID_ROWS}x{GRID_COLS} grid: {self.path}")
+        return obstacles
+
+    @cached_property
+    def obstacle_cells(self):
+        """
+        障害物が占めるマス (行, 列) のリスト
+        """
+        return [
+            (row + dr, col + dc)
+            for row, col, rows, cols in self.obstacles
+            for dr in range(rows)
+            for dc in range(cols)
+        ]
+
+    @cached_property
+    def tiles(self):
+        """
+        背景タイル番号の配列（行数 × 列数）
+        """
+        count = self.tile_rows * self.tile_cols
+        return np.frombuffer(self._map, dtype=np.uint8, count=count,
+                             offset=self._tile_offset).reshape(self.tile_rows, self.tile_cols).copy()
+
+    def get_background(self):
+        """
+        背景タイルと障害物を描き込んだ背景画像を取得する（一度だけ描画してキャッシュする）
+
+        Returns:
+            pygame.Surface: 背景画像
+        """
+        if self._background is None:
+            background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+            background.fill(BACKGROUND_COLOR)
+
+            if self.tile_rows and self.tile_cols:
+                tile_width = WINDOW_WIDTH / self.tile_cols
+                tile_height = WINDOW_HEIGHT / self.tile_rows
+                for (row, col), tile in np.ndenumerate(self.tiles):
+                    color = TILE_COLORS.get(int(tile), BACKGROUND_COLOR)
+                    background.fill(color, (int(col * tile_width), int(row * tile_height),
+                                            int(tile_width) + 1, int(tile_height) + 1))
+
+            for row, col, rows, cols in self.obstacles:
+                rect = pygame.Rect(col * GRID_CELL_SIZE, row * GRID_CELL_SIZE,
+                                   cols * GRID_CELL_SIZE, rows * GRID_CELL_SIZE)
+                pygame.draw.rect(background, OBSTACLE_COLOR, rect, border_radius=6)
+                pygame.draw.rect(background, OBSTACLE_BORDER_COLOR, rect, 2, border_radius=6)
+
+            self._background = background
+        return self._background
+
+    def preload(self):
+        """
+        遅延読み込みしている部分と背景画像をすべて準備する
+
+        Raises:
+            LevelFormatError: 遅延読み込みしている部分の形式が不正な場合
+        """
+        self.name
+        self.obstacle_cells
+        self.get_background()
+
+    def close(self):
+        """
+        メモリマップを閉じる
+        """
+        self._map.close()
+
+
+def write_level(path, name, player_spawn, rabbit_spawn, rabbit_params=DEFAULT_RABBIT_PARAMS,
+                obstacles=(), tiles=None):
+    """
+    ステージファイルを書き出す
+
+    Args:
+        path (str): 出力先のパス
+        name (str): ステージ名
+        player_spawn (tuple): プレイヤーの初期位置 (x, y)
+        rabbit_spawn (tuple): うさぎの初期位置 (x, y)
+        rabbit_params (RabbitParams): うさぎのパラメータ
+        obstacles (list): 障害物の矩形 (行, 列, 行数, 列数) のリスト
+        tiles (numpy.ndarray): 背景タイル番号の配列（省略時はタイルなし）
+    """
+    name_bytes = name.encode("utf-8")
+    if tiles is None:
+        tiles = np.zeros((0, 0), dtype=np.uint8)
+    tiles = np.ascontiguousarray(tiles, dtype=np.uint8)
+
+    obstacle_offset = _HEADER.size + len(name_bytes)
+    tile_offset = obstacle_offset + len(obstacles) * _OBSTACLE.size
+    header = _HEADER.pack(
+        LEVEL_MAGIC, LEVEL_VERSION, len(name_bytes),
+        int(player_spawn[0]), int(player_spawn[1]), int(rabbit_spawn[0]), int(rabbit_spawn[1]),
+        int(rabbit_params.view_angle), int(rabbit_params.view_distance),
+        rabbit_params.turn_min_time, rabbit_params.turn_max_time, rabbit_params.looking_time,
+        int(rabbit_params.mood_max),
+        len(obstacles), obstacle_offset,
+        tiles.shape[1], tiles.shape[0], tile_offset)
+
+    with open(path, "wb") as f:
+        f.write(header)
+        f.write(name_bytes)
+        for obstacle in obstacles:
+            f.write(_OBSTACLE.pack(*obstacle))
+        f.write(tiles.tobytes())
+
+
+class LevelManager:
+    """
+    ステージの一覧と読み込みを管理するクラス
+
+    次のステージは prefetch() でバックグラウンドのスレッドに読み込ませておき、
+    ゲームシーンの生成時にはすでに準備が済んでいるようにする。
+    """
+    def __init__(self, directory=LEVELS_DIR):
+        """
+        ステージ管理の初期化
+
+        Args:
+            directory (str): ステージファイルのあるディレクトリ
+        """
+        self.paths = sorted(glob.glob(os.path.join(directory, f"*{LEVEL_FILE_EXTENSION}")))
+        self._levels = {}  # ステージ番号 -> Level
+        self._loading = {}  # ステージ番号 -> 読み込み中のスレッド
+        self._lock = threading.Lock()
+        print(f"Found {len(self.paths)} stage(s) in {directory}")
+
+    def __len__(self):
+        return len(self.paths)
+
+    def next_index(self, index):
+        """
+        次のステージ番号を返す（最後のステージの次は最初に戻る）
+
+        Args:
+            index (int): 現在のステージ番号
+
+        Returns:
+            int: 次のステージ番号
+        """
+        if not self.paths:
+            return 0
+        return (index + 1) % len(self.paths)
+
+    @traced("load")
+    def _load(self, index):
+        """
+        ステージを読み込んで保持する
+
+        ファイル自体は Level が必要になった部分から読み出すが、ここは先読みのスレッドで
+        呼ばれるので、ゲームシーンの生成時に読み込みや背景の描画が起きないよう preload() で
+        すべて準備しておく。不正な障害物などもこの時点で見つかり、そのステージは読み込まない。
+
+        Args:
+            index (int): ステージ番号
+
+        Returns:
+            Level or None: 読み込んだステージ、失敗した場合はNone
+        """
+        try:
+            level = Level(self.paths[index])
+        except (OSError, LevelFormatError) as e:
+            print(f"Failed to load stage {index}: {e}")
+            return None
+        try:
+            level.preload()
+        except LevelFormatError as e:
+            level.close()
+            print(f"Failed to load stage {index}: {e}")
+            return None
+        with self._lock:
+            self._levels[index] = level
+        return level
+
+    def prefetch(self, index):
+        """
+        ステージをバックグラウンドで読み込み始める
+
+        Args:
+            index (int): ステージ番号
+        """
+        if not self.paths:
+            return
+        with self._lock:
+            if index in self._levels or index in self._loading:
+                return
+            thread = threading.Thread(target=self._load, args=(index,), daemon=True)
+            self._loading[index] = thread
+        thread.start()
+
+    def get(self, index):
+        """
+        ステージを取得する（先読みが済んでいなければその場で読み込む）
+
+        Args:
+            index (int): ステージ番号
+
+        Returns:
+            Level or None: ステージ、ステージファイルがない場合はNone
+        """
+        if not self.paths:
+            return None
+
+        with self._lock:
+            thread = self._loading.pop(index, None)
+        if thread is not None:
+            thread.join()
+
+        with self._lock:
+            level = self._levels.get(index)
+            # 現在と次のステージ以外は解放する
+            keep = (index, self.next_index(index))
+            for other in [i for i in self._levels if i not in keep]:
+                self._levels.pop(other).close()
+        if level is None:
+            level = self._load(index)
+        return level
+
+
+def _build_default_levels(directory):
+    """
+    同梱のステージファイルを生成する
+
+    Args:
+        directory (str): 出力先のディレクトリ
+    """
+    os.makedirs(directory, exist_ok=True)
+    rows = WINDOW_HEIGHT // GRID_CELL_SIZE
+    cols = WINDOW_WIDTH // GRID_CELL_SIZE
+    center_y = WINDOW_HEIGHT // 2
+
+    # ステージ1: 障害物のない草原（従来のステージ）
+    write_level(os.path.join(directory, f"stage_01{LEVEL_FILE_EXTENSION}"), "はらっぱ",
+                (50, center_y), (WINDOW_WIDTH - 100, center_y))
+
+    # ステージ2: 茂みの間を抜けて近づく
+    tiles = np.zeros((rows, cols), dtype=np.uint8)
+    tiles[13:17, :] = 2  # 中央を横切る土の道
+    tiles[(np.arange(rows)[:, None] + np.arange(cols)) % 7 == 0] = 1
+    write_level(os.path.join(directory, f"stage_02{LEVEL_FILE_EXTENSION}"), "しげみのこみち",
+                (50, center_y), (WINDOW_WIDTH - 100, center_y),
+                DEFAULT_RABBIT_PARAMS._replace(turn_min_time=2.5, turn_max_time=6.0),
+                obstacles=[(4, 12, 8, 3), (18, 12, 8, 3), (10, 24, 3, 4), (18, 24, 3, 4)],
+                tiles=tiles)
+
+    # ステージ3: 視界の広いうさぎと迷路のような花畑
+    tiles = np.full((rows, cols), 3, dtype=np.uint8)
+    tiles[::4, :] = 1
+    write_level(os.path.join(directory, f"stage_03{LEVEL_FILE_EXTENSION}"), "おはなばたけ",
+                (50, 100), (WINDOW_WIDTH - 100, WINDOW_HEIGHT - 100),
+                DEFAULT_RABBIT_PARAMS._replace(view_angle=160, view_distance=240,
+                                               turn_min_time=2.0, turn_max_time=5.0),
+                obstacles=[(0, 9, 20, 2), (10, 19, 20, 2), (0, 29, 22, 2)],
+                tiles=tiles)
+
+
+if __name__ == "__main__":
+    # python -m src.level [出力先] で同梱のステージファイルを生成する
+    _build_default_levels(sys.argv[1] if len(sys.argv) > 1 else LEVELS_DIR)
@@ -1,14 +1,25 @@
 """
 ゲームのエントリーポイント
 """
+import time
+
+# 起動時間の計測基準（pygameの読み込み時間も含める）
+START_TIME = time.perf_counter()
+
 from src.game import Game
+from src.session import SessionHost
+from src.utils.constants import SESSION_COUNT, SESSION_COLUMNS
 
 
 def main():
     """
     ゲームのメイン関数
     """
-    game = Game()
+    # 複数のステーションを同時に動かす場合はウィンドウを分割する
+    if SESSION_COUNT > 1:
+        SessionHost(SESSION_COUNT, SESSION_COLUMNS, START_TIME).run()
+        return
+    game = Game(START_TIME)
     game.run()
 
 
@@ -0,0 +1,287 @@
+"""
+パーティクル（演出用の小さな粒子）を定義するモジュール
+"""
+import numpy as np
+import pygame
+from src.utils.constants import (
+    WINDOW_WIDTH, WINDOW_HEIGHT, RED, HEART_COLOR, DUST_COLOR, SPARK_COLOR,
+    PARTICLE_BUDGET, PARTICLE_FADE_LEVELS, RENDER_LAYER_EFFECT
+)
+from src.utils.font_manager import FontManager
+
+# パーティクルの種類
+PARTICLE_HEART = 0  # 撫でた時のハート
+PARTICLE_DUST = 1  # 移動中の土ぼこり
+PARTICLE_SPARK = 2  # 見つかった時に飛び散る火花
+PARTICLE_EXCLAIM = 3  # 見つかった時の「！」
+
+# 種類ごとの重力（下向きの加速度、ピクセル/秒^2）と空気抵抗（1秒あたりの減速率）
+_GRAVITY = np.array([-40.0, -10.0, 300.0, 0.0], dtype=np.float32)
+_DRAG = np.array([1.5, 4.0, 2.0, 3.0], dtype=np.float32)
+
+
+def _draw_heart(surface, color, size):
+    """
+    ハートの形を描画する
+
+    Args:
+        surface (pygame.Surface): 描画対象のサーフェス
+        color (tuple): 色
+        size (int): 大きさ
+    """
+    radius = size // 4
+    pygame.draw.circle(surface, color, (radius, radius), radius)
+    pygame.draw.circle(surface, color, (size - radius, radius), radius)
+    pygame.draw.polygon(surface, color, [
+        (0, radius), (size // 2, size - 1), (size, radius), (size // 2, radius)
+    ])
+
+
+def _build_base_sprites():
+    """
+    種類ごとの基本のスプライトを描画する
+
+    Returns:
+        list: 種類の番号順に並べたスプライトのリスト
+    """
+    heart = pygame.Surface((16, 16), pygame.SRCALPHA)
+    _draw_heart(heart, HEART_COLOR, 16)
+
+    dust = pygame.Surface((8, 8), pygame.SRCALPHA)
+    pygame.draw.circle(dust, DUST_COLOR, (4, 4), 4)
+
+    spark = pygame.Surface((6, 6), pygame.SRCALPHA)
+    pygame.draw.circle(spark, SPARK_COLOR, (3, 3), 3)
+
+    exclaim = FontManager().render_text("!", 48, RED, False)
+
+    return [heart, dust, spark, exclaim]
+
+
+class ParticleSystem:
+    """
+    パーティクルをまとめて管理するクラス
+
+    位置・速度・経過時間は事前に確保した NumPy 配列に保持し、更新は配列演算でまとめて行う。
+    描画はフェードの段階ごとに用意したスプライトを並べ、1回の blits でまとめて転送する。
+    上限を超えて発生させた場合は、最も古く発生したパーティクルの枠を再利用する。
+    """
+    _sprite_table = None  # 種類 * PARTICLE_FADE_LEVELS + フェード段階 -> スプライトの配列
+    _sprite_offsets = None  # 種類 -> スプライトの中心までのずれ (x, y)
+
+    def __init__(self, capacity=PARTICLE_BUDGET):
+        """
+        パーティクルシステムの初期化
+
+        Args:
+            capacity (int): 同時に存在できるパーティクルの最大数
+        """
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.age = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)  # 寿命（0は未使用の枠）
+        self.kind = np.zeros(capacity, dtype=np.int32)
+        self._scratch = np.zeros(capacity, dtype=np.float32)  # 更新時の作業用（毎フレーム確保しない）
+        self._alive = np.zeros(capacity, dtype=bool)  # 転送リストを作る時の作業用
+        self._visible = np.zeros(capacity, dtype=bool)
+        self._xs = np.zeros(capacity, dtype=np.int32)
+        self._ys = np.zeros(capacity, dtype=np.int32)
+        self._keys = np.zeros(capacity, dtype=np.int32)
+        self._time_left = 0.0  # 最も長く残るパーティクルが消えるまでの時間（秒）
+        self._cursor = 0  # 次に使う枠（この位置が最も古く発生した枠になる）
+        self._rng = np.random.default_rng()
+        self._ensure_sprites()
+
+    def seed(self, seed):
+        """
+        発生させるパーティクルの向きや速さのばらつきを決める乱数を初期化する（再現性が必要な場合）
+
+        Args:
+            seed (int): 乱数のシード
+        """
+        self._rng = np.random.default_rng(seed)
+
+    @classmethod
+    def _ensure_sprites(cls):
+        """
+        フェード段階ごとのスプライトを用意する（一度だけ描画してキャッシュする）
+        """
+        if cls._sprite_table is not None:
+            return
+
+        table = []
+        offsets = []
+        for base in _build_base_sprites():
+            for level in range(PARTICLE_FADE_LEVELS):
+                alpha = 255 * (level + 1) // PARTICLE_FADE_LEVELS
+                sprite = base.copy()
+                sprite.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+                table.append(sprite)
+            offsets.append((base.get_width() // 2, base.get_height() // 2))
+        # 番号の配列でまとめて引けるように object 型の配列にしておく
+        cls._sprite_table = np.empty(len(table), dtype=object)
+        cls._sprite_table[:] = table
+        cls._sprite_offsets = np.array(offsets, dtype=np.int32)
+
+    def live_count(self):
+        """
+        生存しているパーティクルの数を返す
+
+        Returns:
+            int: パーティクルの数
+        """
+        return int(np.count_nonzero(self.age < self.life))
+
+    def emit(self, kind, pos, count, speed, life, angle=0.0, spread=360.0):
+        """
+        パーティクルを発生させる
+
+        Args:
+            kind (int): パーティクルの種類
+            pos (tuple): 発生位置 (x, y)
+            count (int): 発生させる数
+            speed (tuple): 初速の範囲 (最小, 最大)（ピクセル/秒）
+            life (tuple): 寿命の範囲 (最小, 最大)（秒）
+            angle (float): 飛ぶ方向の中心（度数法、0が右、-90が上）
+            spread (float): 飛ぶ方向の広がり（度）
+        """
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+
+        # リングバッファとして順に枠を使うことで、上限に達したら最も古いものから上書きする
+        slots = (self._cursor + np.arange(count)) % self.capacity
+        self._cursor = (self._cursor + count) % self.capacity
+
+        angles = np.radians(angle + self._rng.uniform(-spread / 2, spread / 2, count))
+        speeds = self._rng.uniform(speed[0], speed[1], count)
+        self.x[slots] = pos[0]
+        self.y[slots] = pos[1]
+        self.vx[slots] = np.cos(angles) * speeds
+        self.vy[slots] = np.sin(angles) * speeds
+        self.age[slots] = 0.0
+        self.life[slots] = self._rng.uniform(life[0], life[1], count)
+        self.kind[slots] = kind
+        self._time_left = max(self._time_left, life[1])
+
+    def emit_hearts(self, pos):
+        """
+        撫でた時のハートを発生させる
+
+        Args:
+            pos (tuple): 発生位置 (x, y)
+        """
+        self.emit(PARTICLE_HEART, pos, 12, (40, 120), (1.0, 1.8), angle=-90, spread=120)
+
+    def emit_dust(self, pos):
+        """
+        足元の土ぼこりを発生させる
+
+        Args:
+            pos (tuple): 発生位置 (x, y)
+        """
+        self.emit(PARTICLE_DUST, pos, 3, (10, 40), (0.3, 0.6), angle=-90, spread=160)
+
+    def emit_alert(self, pos):
+        """
+        見つかった時の「！」と火花を発生させる
+
+        Args:
+            pos (tuple): 発生位置 (x, y)
+        """
+        self.emit(PARTICLE_EXCLAIM, pos, 1, (30, 30), (0.8, 0.8), angle=-90, spread=0)
+        self.emit(PARTICLE_SPARK, pos, 24, (80, 220), (0.4, 0.8))
+
+    def update(self, dt):
+        """
+        全パーティクルの位置と経過時間を更新する
+
+        Args:
+            dt (float): 経過時間（秒）
+        """
+        # すべて消えた後は何もしない
+        if self._time_left <= 0:
+            return
+        self._time_left -= dt
+
+        # 一時配列を作らないよう、作業用の配列の上で計算する
+        scratch = self._scratch
+        np.take(_DRAG, self.kind, out=scratch)
+        scratch *= dt
+        scratch += 1.0
+        np.reciprocal(scratch, out=scratch)
+        self.vx *= scratch
+        self.vy *= scratch
+        np.take(_GRAVITY, self.kind, out=scratch)
+        scratch *= dt
+        self.vy += scratch
+        np.multiply(self.vx, dt, out=scratch)
+        self.x += scratch
+        np.multiply(self.vy, dt, out=scratch)
+        self.y += scratch
+        self.age += dt
+
+    def build_blits(self):
+        """
+        生存していて画面内にあるパーティクルの転送リストを作る
+
+        判定やスプライトの選択は全枠について作業用の配列の上で行い、一時配列を作らない。
+        Python のオブジェクトを作るのは、描画するパーティクルの (スプライト, 描画位置) だけにする。
+
+        Returns:
+            list: (スプライト, 描画位置) のリスト
+        """
+        if self._time_left <= 0:
+            return []
+
+        # 描画位置（スプライトの左上）と、生存していて画面内にあるかどうか
+        xs, ys, keys, scratch = self._xs, self._ys, self._keys, self._scratch
+        np.copyto(xs, self.x, casting="unsafe")
+        np.take(self._sprite_offsets[:, 0], self.kind, out=keys)
+        xs -= keys
+        np.copyto(ys, self.y, casting="unsafe")
+        np.take(self._sprite_offsets[:, 1], self.kind, out=keys)
+        ys -= keys
+        visible, mask = self._visible, self._alive
+        np.less(self.age, self.life, out=visible)
+        np.greater(xs, -64, out=mask)
+        visible &= mask
+        np.less(xs, WINDOW_WIDTH, out=mask)
+        visible &= mask
+        np.greater(ys, -64, out=mask)
+        visible &= mask
+        np.less(ys, WINDOW_HEIGHT, out=mask)
+        visible &= mask
+        indices = np.flatnonzero(visible)
+        if indices.size == 0:
+            return []
+
+        # 残り寿命の割合に応じてフェードの段階を選ぶ（1 - age / life を段階数倍して切り捨てる）
+        np.divide(self.age, self.life, out=scratch, where=visible)
+        np.subtract(1.0, scratch, out=scratch)
+        scratch *= PARTICLE_FADE_LEVELS
+        np.minimum(scratch, PARTICLE_FADE_LEVELS - 1, out=scratch)
+        np.copyto(keys, scratch, casting="unsafe")
+        keys += self.kind * PARTICLE_FADE_LEVELS
+
+        sprites = self._sprite_table[keys[indices]].tolist()
+        return list(zip(sprites, zip(xs[indices].tolist(), ys[indices].tolist())))
+
+    def draw(self, screen, render_queue=None, blit_sequence=None):
+        """
+        パーティクルを描画する
+
+        Args:
+            screen (pygame.Surface): 描画対象の画面
+            render_queue (RenderQueue): 指定された場合は直接描画せずにキューへ登録する
+            blit_sequence (list): 描画する転送リスト（省略時は build_blits() で現在の状態から作る）
+        """
+        if blit_sequence is None:
+            blit_sequence = self.build_blits()
+        if render_queue is not None:
+            render_queue.submit_batch(blit_sequence, RENDER_LAYER_EFFECT)
+        elif blit_sequence:
+            screen.blits(blit_sequence, doreturn=False)
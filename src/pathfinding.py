@@ -0,0 +1,215 @@
+"""
+フローフィールドによる経路探索を定義するモジュール
+"""
+from collections import OrderedDict
+import numpy as np
+from src.utils.grid_field import (
+    GRID_ROWS, GRID_COLS, world_to_cell, cell_center, edge_costs,
+    compute_field, repair_field
+)
+
+# キャッシュしておくフローフィールドの最大数
+FLOW_FIELD_CACHE_SIZE = 16
+
+
+class FlowField:
+    """
+    1つのゴールに対するフローフィールド
+
+    ゴールからの距離変換を一度計算し、各マスから次に進むべき隣のマスを配列で持つ。
+    何体のエージェントでも、次の一歩は配列を参照するだけで求まる。
+    """
+    def __init__(self, goal, cost):
+        """
+        フローフィールドの初期化
+
+        Args:
+            goal (tuple): ゴールのマス (行, 列)
+            cost (numpy.ndarray): マスごとの移動コスト（障害物は無限大）
+        """
+        self.goal = goal
+        self.dist = compute_field([goal], cost)
+        self.next_row = None
+        self.next_col = None
+        self._build_directions(cost)
+
+    def repair(self, cost, changed_cells, cost_increased):
+        """
+        障害物の変更に合わせて距離場と進行方向を修復する
+
+        Args:
+            cost (numpy.ndarray): 変更後のマスごとの移動コスト
+            changed_cells (list): 変更されたマス (行, 列) のリスト
+            cost_increased (bool): 障害物が追加されたかどうか
+        """
+        repair_field(self.dist, [self.goal], cost, changed_cells, cost_increased)
+        self._build_directions(cost)
+
+    def _build_directions(self, cost):
+        """
+        各マスから、移動コストを含めてゴールまでの距離が最も小さくなる隣のマスを求める
+
+        Args:
+            cost (numpy.ndarray): マスごとの移動コスト
+        """
+        edges = edge_costs(cost)
+        via = np.full((len(edges),) + self.dist.shape, np.inf, dtype=np.float32)
+        offset_rows = np.empty(len(edges), dtype=np.int32)
+        offset_cols = np.empty(len(edges), dtype=np.int32)
+        for k, (dr, dc, dst, src, edge_cost) in enumerate(edges):
+            via[k][dst] = self.dist[src] + edge_cost
+            offset_rows[k] = dr
+            offset_cols[k] = dc
+
+        best = np.argmin(via, axis=0)
+        rows, cols = np.indices(self.dist.shape)
+        self.next_row = rows + offset_rows[best]
+        self.next_col = cols + offset_cols[best]
+
+        # ゴールと、ゴールへ到達できないマスでは進まない
+        stay = ~np.isfinite(self.dist) | (self.dist <= 0)
+        self.next_row[stay] = rows[stay]
+        self.next_col[stay] = cols[stay]
+
+    def is_reachable(self, cell):
+        """
+        マスからゴールへ到達できるかどうかを返す
+
+        Args:
+            cell (tuple): マス (行, 列)
+
+        Returns:
+            bool: 到達できるならTrue
+        """
+        return bool(np.isfinite(self.dist[cell]))
+
+    def next_cell(self, cell):
+        """
+        マスから次に進むべきマスを返す
+
+        Args:
+            cell (tuple): 現在のマス (行, 列)
+
+        Returns:
+            tuple: 次のマス (行, 列)
+        """
+        return (int(self.next_row[cell]), int(self.next_col[cell]))
+
+
+class PathGrid:
+    """
+    障害物の配置とフローフィールドのキャッシュを管理するクラス
+    """
+    def __init__(self):
+        """
+        経路探索グリッドの初期化
+        """
+        self.obstacles = np.zeros((GRID_ROWS, GRID_COLS), dtype=bool)
+        self._cost = np.ones((GRID_ROWS, GRID_COLS), dtype=np.float32)
+        self._fields = OrderedDict()  # ゴールのマス -> FlowField
+
+    def has_obstacles(self):
+        """
+        障害物が1つでもあるかどうかを返す
+
+        Returns:
+            bool: 障害物があるならTrue
+        """
+        return bool(self.obstacles.any())
+
+    def is_blocked(self, pos):
+        """
+        座標が障害物の上かどうかを返す
+
+        Args:
+            pos (tuple): 座標 (x, y)
+
+        Returns:
+            bool: 障害物の上ならTrue
+        """
+        return bool(self.obstacles[world_to_cell(*pos)])
+
+    def set_obstacles(self, cells, blocked=True):
+        """
+        障害物を追加または削除し、キャッシュ済みのフローフィールドを修復する
+
+        Args:
+            cells (list): 変更するマス (行, 列) のリスト
+            blocked (bool): 障害物にするならTrue、取り除くならFalse
+        """
+        changed = [cell for cell in cells if self.obstacles[cell] != blocked]
+        if not changed:
+            return
+        for cell in changed:
+            self.obstacles[cell] = blocked
+            self._cost[cell] = np.inf if blocked else 1.0
+
+        for field in self._fields.values():
+            field.repair(self._cost, changed, blocked)
+
+    def get_flow_field(self, goal_pos):
+        """
+        ゴールに対するフローフィールドを取得する（未計算なら計算してキャッシュする）
+
+        Args:
+            goal_pos (tuple): ゴールの座標 (x, y)
+
+        Returns:
+            FlowField: フローフィールド
+        """
+        goal = world_to_cell(*goal_pos)
+        field = self._fields.get(goal)
+        if field is None:
+            field = FlowField(goal, self._cost)
+            self._fields[goal] = field
+            if len(self._fields) > FLOW_FIELD_CACHE_SIZE:
+                self._fields.popitem(last=False)
+        else:
+            self._fields.move_to_end(goal)
+        return field
+
+    def next_waypoint(self, pos, goal_pos):
+        """
+        現在地からゴールへ向かうための次の経由地点を求める
+
+        Args:
+            pos (tuple): 現在地の座標 (x, y)
+            goal_pos (tuple): ゴールの座標 (x, y)
+
+        Returns:
+            tuple, None or False: 経由地点の座標 (x, y)、ゴールへ到達できない場合はNone、
+                現在の経由地点を維持する場合はFalse
+        """
+        # 障害物がなければゴールへ直進する
+        if not self.has_obstacles():
+            return goal_pos
+
+        field = self.get_flow_field(goal_pos)
+        cell = world_to_cell(*pos)
+        if self.obstacles[cell]:
+            # 障害物の縁に少しはみ出している場合は現在の経由地点へ進み続ける
+            return False
+        if not field.is_reachable(cell):
+            return None
+        if cell == field.goal:
+            return goal_pos
+        return cell_center(*field.next_cell(cell))
+
+    def steer(self, store, indices):
+        """
+        複数のエージェントの経由地点をまとめて更新する
+
+        Args:
+            store (EntityStore): エージェントを保持するエンティティストア
+            indices (iterable): 対象エージェントのインデックス
+        """
+        for i in indices:
+            if not store.moving[i]:
+                continue
+            waypoint = self.next_waypoint((store.x[i], store.y[i]), (store.target_x[i], store.target_y[i]))
+            if waypoint is None:
+                # ゴールへ到達できない場合はその場で停止する
+                store.moving[i] = 0
+                store.set_target(i, store.x[i], store.y[i])
+            elif waypoint is not False:
+                store.waypoint_x[i], store.waypoint_y[i] = waypoint
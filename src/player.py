@@ -2,25 +2,40 @@
 プレイヤークラスを定義するモジュール
 """
 import pygame
-from src.utils.constants import PLAYER_SIZE, PLAYER_COLOR, PLAYER_SPEED, WINDOW_WIDTH, WINDOW_HEIGHT
+from src.entity_store import EntityStore, KIND_PLAYER, component_property
+from src.utils.constants import PLAYER_SIZE, PLAYER_COLOR, PLAYER_SPEED, WINDOW_WIDTH, WINDOW_HEIGHT, RENDER_LAYER_ENTITY
 
 
 class Player:
     """
     プレイヤーを表すクラス
     """
-    def __init__(self):
+    _sprite_cache = {}  # (サイズ, 色) -> スプライト
+
+    # 位置・目標・移動状態はエンティティストアのコンポーネント配列に保持する
+    x = component_property("x", doc="X座標")
+    y = component_property("y", doc="Y座標")
+    target_x = component_property("target_x", doc="目標X座標")
+    target_y = component_property("target_y", doc="目標Y座標")
+    speed = component_property("speed", doc="移動速度")
+    moving = component_property("moving", bool, doc="移動中かどうか")
+
+    def __init__(self, store=None, path_grid=None, position=None):
         """
         プレイヤーの初期化
+        
+        Args:
+            store (EntityStore): 所属するエンティティストア（省略時は専用のストアを作成）
+            path_grid (PathGrid): 障害物を避けるための経路探索グリッド（省略時は直進する）
+            position (tuple): 初期位置 (x, y)（省略時は左側）
         """
-        self.x = 50  # 初期X座標（左側）
-        self.y = WINDOW_HEIGHT // 2  # 初期Y座標
+        self._store = store if store is not None else EntityStore(capacity=1)
+        if position is None:
+            position = (50, WINDOW_HEIGHT // 2)
+        self._index = self._store.create(KIND_PLAYER, position[0], position[1], PLAYER_SIZE, PLAYER_SPEED)
+        self.path_grid = path_grid
         self.size = PLAYER_SIZE
         self.color = PLAYER_COLOR
-        self.speed = PLAYER_SPEED
-        self.target_x = self.x
-        self.target_y = self.y
-        self.moving = False
         self.rect = pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
 
     def set_target(self, x, y):
@@ -31,8 +46,7 @@ class Player:
             x (int): 目標X座標
             y (int): 目標Y座標
         """
-        self.target_x = x
-        self.target_y = y
+        self._store.set_target(self._index, x, y)
         self.moving = True
         print(f"Player moving to: ({x}, {y})")
 
@@ -43,84 +57,107 @@ class Player:
         if self.moving:
             print(f"Player forced to stop at: ({self.x}, {self.y})")
         self.moving = False
-        self.target_x = self.x
-        self.target_y = self.y
+        self._store.set_target(self._index, self.x, self.y)
 
     def update(self):
         """
         プレイヤーの状態を更新する
         """
-        if self.moving:
-            # 目標地点への移動ベクトルを計算
-            dx = self.target_x - self.x
-            dy = self.target_y - self.y
-            distance = (dx ** 2 + dy ** 2) ** 0.5
-            
-            # 目標地点に到達したら停止
-            if distance < self.speed:
-                self.x = self.target_x
-                self.y = self.target_y
-                self.moving = False
-                print(f"Player stopped at target: ({self.x}, {self.y})")
-            else:
-                # 正規化して速度を適用
-                self.x += (dx / distance) * self.speed
-                self.y += (dy / distance) * self.speed
+        # 障害物がある場合はフローフィールドから次の経由地点を求める
+        if self.path_grid is not None and self.moving:
+            self.path_grid.steer(self._store, (self._index,))
+            if not self.moving:
+                print(f"Player has no path to target, stopped at: ({self.x}, {self.y})")
         
-        # 画面外に出ないように制限
-        self.x = max(self.size // 2, min(WINDOW_WIDTH - self.size // 2, self.x))
-        self.y = max(self.size // 2, min(WINDOW_HEIGHT - self.size // 2, self.y))
+        # 移動と画面内への制限はストアの移動システムで行う
+        if self._store.update_movement((self._index,)):
+            print(f"Player stopped at target: ({self.x}, {self.y})")
         
         # 衝突判定用の矩形を更新
         self.rect.x = self.x - self.size // 2
         self.rect.y = self.y - self.size // 2
 
-    def draw(self, screen):
+    def draw(self, screen, render_queue=None, position=None):
         """
         プレイヤーを描画する（人間らしいアイコン）
         
         Args:
             screen (pygame.Surface): 描画対象の画面
+            render_queue (RenderQueue): 指定された場合は直接描画せずにキューへ登録する
+            position (tuple): 描画する位置 (x, y)（省略時は現在の位置）
+        """
+        x, y = position if position is not None else (self.x, self.y)
+        sprite = self._get_sprite()
+        rect = sprite.get_rect(center=(int(x), int(y)))
+        if render_queue is not None:
+            render_queue.submit(sprite, rect, RENDER_LAYER_ENTITY)
+        else:
+            screen.blit(sprite, rect)
+
+    def _get_sprite(self):
+        """
+        プレイヤーのスプライトを取得する（サイズと色ごとに一度だけ描画してキャッシュする）
+        
+        Returns:
+            pygame.Surface: プレイヤーのスプライト
+        """
+        key = (self.size, self.color)
+        sprite = Player._sprite_cache.get(key)
+        if sprite is None:
+            sprite_size = self.size * 3
+            sprite = pygame.Surface((sprite_size, sprite_size), pygame.SRCALPHA)
+            self._draw_figure(sprite, sprite_size // 2, sprite_size // 2)
+            Player._sprite_cache[key] = sprite
+        return sprite
+
+    def _draw_figure(self, surface, cx, cy):
+        """
+        プレイヤーの姿を描画する
+        
+        Args:
+            surface (pygame.Surface): 描画対象のサーフェス
+            cx (int): 中心X座標
+            cy (int): 中心Y座標
         """
         # 体（円）
-        pygame.draw.circle(screen, self.color, (int(self.x), int(self.y)), self.size // 2)
+        pygame.draw.circle(surface, self.color, (int(cx), int(cy)), self.size // 2)
         
         # 頭（小さい円）
         head_size = self.size // 3
-        head_y = self.y - self.size // 2 - head_size // 2
-        pygame.draw.circle(screen, self.color, (int(self.x), int(head_y)), head_size)
+        head_y = cy - self.size // 2 - head_size // 2
+        pygame.draw.circle(surface, self.color, (int(cx), int(head_y)), head_size)
         
         # 目
         eye_size = max(2, head_size // 5)
         eye_y = head_y - eye_size // 2
-        left_eye_x = self.x - head_size // 3
-        right_eye_x = self.x + head_size // 3
-        pygame.draw.circle(screen, (255, 255, 255), (int(left_eye_x), int(eye_y)), eye_size)
-        pygame.draw.circle(screen, (255, 255, 255), (int(right_eye_x), int(eye_y)), eye_size)
-        pygame.draw.circle(screen, (0, 0, 0), (int(left_eye_x), int(eye_y)), max(1, eye_size // 2))
-        pygame.draw.circle(screen, (0, 0, 0), (int(right_eye_x), int(eye_y)), max(1, eye_size // 2))
+        left_eye_x = cx - head_size // 3
+        right_eye_x = cx + head_size // 3
+        pygame.draw.circle(surface, (255, 255, 255), (int(left_eye_x), int(eye_y)), eye_size)
+        pygame.draw.circle(surface, (255, 255, 255), (int(right_eye_x), int(eye_y)), eye_size)
+        pygame.draw.circle(surface, (0, 0, 0), (int(left_eye_x), int(eye_y)), max(1, eye_size // 2))
+        pygame.draw.circle(surface, (0, 0, 0), (int(right_eye_x), int(eye_y)), max(1, eye_size // 2))
         
         # 腕
         arm_length = self.size // 2
         arm_width = max(2, self.size // 8)
-        left_arm_start = (self.x - self.size // 3, self.y - self.size // 4)
-        left_arm_end = (self.x - self.size // 2 - arm_length // 2, self.y)
-        right_arm_start = (self.x + self.size // 3, self.y - self.size // 4)
-        right_arm_end = (self.x + self.size // 2 + arm_length // 2, self.y)
+        left_arm_start = (cx - self.size // 3, cy - self.size // 4)
+        left_arm_end = (cx - self.size // 2 - arm_length // 2, cy)
+        right_arm_start = (cx + self.size // 3, cy - self.size // 4)
+        right_arm_end = (cx + self.size // 2 + arm_length // 2, cy)
         
-        pygame.draw.line(screen, self.color, left_arm_start, left_arm_end, arm_width)
-        pygame.draw.line(screen, self.color, right_arm_start, right_arm_end, arm_width)
+        pygame.draw.line(surface, self.color, left_arm_start, left_arm_end, arm_width)
+        pygame.draw.line(surface, self.color, right_arm_start, right_arm_end, arm_width)
         
         # 足
         leg_length = self.size // 2
         leg_width = max(2, self.size // 6)
-        left_leg_start = (self.x - self.size // 4, self.y + self.size // 3)
-        left_leg_end = (self.x - self.size // 3, self.y + self.size // 2 + leg_length)
-        right_leg_start = (self.x + self.size // 4, self.y + self.size // 3)
-        right_leg_end = (self.x + self.size // 3, self.y + self.size // 2 + leg_length)
+        left_leg_start = (cx - self.size // 4, cy + self.size // 3)
+        left_leg_end = (cx - self.size // 3, cy + self.size // 2 + leg_length)
+        right_leg_start = (cx + self.size // 4, cy + self.size // 3)
+        right_leg_end = (cx + self.size // 3, cy + self.size // 2 + leg_length)
         
-        pygame.draw.line(screen, self.color, left_leg_start, left_leg_end, leg_width)
-        pygame.draw.line(screen, self.color, right_leg_start, right_leg_end, leg_width)
+        pygame.draw.line(surface, self.color, left_leg_start, left_leg_end, leg_width)
+        pygame.draw.line(surface, self.color, right_leg_start, right_leg_end, leg_width)
 
     def get_position(self):
         """
@@ -1,38 +1,146 @@
 """
 うさぎクラスを定義するモジュール
 """
-import pygame
 import math
+import pygame
 import random
+from collections import namedtuple
+from src.entity_store import EntityStore, KIND_RABBIT, component_property
+from src.utils.quality_governor import QualityGovernor, QUALITY_VIEW_CONE, QUALITY_RABBIT_STATUS
+from src.utils.scheduler import TimerScheduler
+from src.utils.tracer import trace_instant, traced
 from src.utils.constants import (
     RABBIT_SIZE, RABBIT_COLOR, RABBIT_MOOD_MAX, RABBIT_VIEW_ANGLE,
     RABBIT_VIEW_DISTANCE, RABBIT_TURN_MIN_TIME, RABBIT_TURN_MAX_TIME,
-    RABBIT_LOOKING_TIME, WINDOW_WIDTH, WINDOW_HEIGHT
+    RABBIT_LOOKING_TIME, RABBIT_HEARING_REACTION_TIME, WINDOW_WIDTH, WINDOW_HEIGHT,
+    RENDER_LAYER_ENTITY, RENDER_LAYER_VIEW_CONE,
+    SHOW_VIEW_CONE, VIEW_CONE_COLOR, VIEW_CONE_ALPHA, VIEW_CONE_EDGE_ALPHA, VIEW_CONE_STEP
+)
+
+# ステージごとに変えられるうさぎのパラメータ
+RabbitParams = namedtuple("RabbitParams", [
+    "view_angle",  # 視野角（度）
+    "view_distance",  # 視界距離
+    "turn_min_time",  # 振り返るまでの最小時間（秒）
+    "turn_max_time",  # 振り返るまでの最大時間（秒）
+    "looking_time",  # 振り返っている時間（秒）
+    "mood_max",  # 機嫌度の最大値
+])
+
+DEFAULT_RABBIT_PARAMS = RabbitParams(
+    RABBIT_VIEW_ANGLE, RABBIT_VIEW_DISTANCE, RABBIT_TURN_MIN_TIME,
+    RABBIT_TURN_MAX_TIME, RABBIT_LOOKING_TIME, RABBIT_MOOD_MAX
 )
 
 
+def _rasterize_view_cone(view_angle, view_distance, facing):
+    """
+    視界の扇形を半透明のサーフェスに描画する
+
+    Args:
+        view_angle (float): 視野角（度）
+        view_distance (float): 視界距離
+        facing (float): 向いている方向（度数法、0が右、180が左）
+
+    Returns:
+        tuple: (扇形のサーフェス, 扇形の頂点からサーフェスの左上までのずれ (x, y))
+    """
+    # 頂点と弧の上の点を並べた多角形で近似する（角度は画面座標のまま、下向きが正）
+    steps = max(2, math.ceil(view_angle / VIEW_CONE_STEP))
+    start = facing - view_angle / 2
+    points = [(0.0, 0.0)]
+    for i in range(steps + 1):
+        angle = math.radians(start + view_angle * i / steps)
+        points.append((math.cos(angle) * view_distance, math.sin(angle) * view_distance))
+
+    left = math.floor(min(x for x, _ in points))
+    top = math.floor(min(y for _, y in points))
+    width = math.ceil(max(x for x, _ in points)) - left + 1
+    height = math.ceil(max(y for _, y in points)) - top + 1
+    local_points = [(x - left, y - top) for x, y in points]
+
+    surface = pygame.Surface((width, height), pygame.SRCALPHA)
+    pygame.draw.polygon(surface, (*VIEW_CONE_COLOR, VIEW_CONE_ALPHA), local_points)
+    pygame.draw.lines(surface, (*VIEW_CONE_COLOR, VIEW_CONE_EDGE_ALPHA), True, local_points, 2)
+    return surface, (left, top)
+
+
 class Rabbit:
     """
     うさぎを表すクラス
     """
-    def __init__(self):
+    _sprite_cache = {}  # (サイズ, 色, 向き) -> スプライト
+    _status_cache = {}  # 向き -> 状態表示テキスト
+    _view_cone_cache = {}  # (視野角, 視界距離, 向き) -> (扇形のサーフェス, 頂点からのずれ)
+
+    # 位置・向き・タイマー・機嫌度はエンティティストアのコンポーネント配列に保持する
+    x = component_property("x", doc="X座標")
+    y = component_property("y", doc="Y座標")
+    mood = component_property("mood", doc="機嫌度")
+    looking_back = component_property("looking_back", bool, doc="こちらを向いているかどうか")
+    direction = component_property("direction", doc="向いている方向（度数法、0が右、180が左）")
+    # 経過時間は sync_timers() を呼んだ時点の値（期限はスケジューラが管理する）
+    turn_timer = component_property("turn_timer", doc="そっぽを向いてからの経過時間（秒）")
+    next_turn_time = component_property("next_turn_time", doc="次に振り返るまでの時間（秒）")
+    looking_timer = component_property("looking_timer", doc="振り返ってからの経過時間（秒）")
+
+    @property
+    def show_view_cone(self):
+        """こちらを向いている時に視界を表示するかどうか"""
+        return self._show_view_cone
+
+    @show_view_cone.setter
+    def show_view_cone(self, value):
+        # 表示していない視界は、描画品質を下げる時に止める対象から外す
+        self._show_view_cone = value
+        self.quality.set_active(QUALITY_VIEW_CONE, value)
+
+    def __init__(self, store=None, noise_field=None, position=None, params=DEFAULT_RABBIT_PARAMS,
+                 scheduler=None, show_view_cone=SHOW_VIEW_CONE, rng=None):
         """
         うさぎの初期化
+        
+        Args:
+            store (EntityStore): 所属するエンティティストア（省略時は専用のストアを作成）
+            noise_field (NoiseField): 足音の減衰場（省略時は聴覚による検出を行わない）
+            position (tuple): 初期位置 (x, y)（省略時は右側）
+            params (RabbitParams): 視界やタイマーのパラメータ
+            scheduler (TimerScheduler): 振り返りのタイマーを登録するスケジューラ
+                （省略時は専用のスケジューラを作成し、update() で進める）
+            show_view_cone (bool): こちらを向いている時に視界を表示するかどうか
+            rng (random.Random): 振り返るまでの時間を決める乱数（省略時は random モジュールの共有の乱数）
         """
-        self.x = WINDOW_WIDTH - 100  # 初期X座標（右側）
-        self.y = WINDOW_HEIGHT // 2  # 初期Y座標
+        self._store = store if store is not None else EntityStore(capacity=1)
+        if position is None:
+            position = (WINDOW_WIDTH - 100, WINDOW_HEIGHT // 2)
+        self._index = self._store.create(KIND_RABBIT, position[0], position[1], RABBIT_SIZE)
+        self.noise_field = noise_field
+        self.params = params
+        self.rng = rng if rng is not None else random
         self.size = RABBIT_SIZE
         self.color = RABBIT_COLOR
-        self.mood = RABBIT_MOOD_MAX  # 機嫌度（最大値から開始）
+        self.mood = params.mood_max  # 機嫌度（最大値から開始）
         self.looking_back = False  # こちらを向いているかどうか（False=そっぽ向いている（右向き）、True=こちらを向いている（左向き））
         self.direction = 0  # 向いている方向（度数法、0が右、180が左）
         self.rect = pygame.Rect(self.x - self.size // 2, self.y - self.size // 2, self.size, self.size)
         
+        # 視界の扇形はゲーム中に作らないよう、両方の向きについて先に用意しておく
+        self.quality = QualityGovernor()
+        self.show_view_cone = show_view_cone
+        for facing in (0, 180):
+            self._get_view_cone(facing)
+        
         # タイマー関連
+        self._owns_scheduler = scheduler is None
+        self.scheduler = scheduler if scheduler is not None else TimerScheduler()
+        self._timer = None  # 次に向きを変えるタイマー
+        self._phase_start = self.scheduler.now  # 今の向きになった時刻
         self.turn_timer = 0
-        self.next_turn_time = random.uniform(RABBIT_TURN_MIN_TIME, RABBIT_TURN_MAX_TIME)
+        self.next_turn_time = self.rng.uniform(params.turn_min_time, params.turn_max_time)
         self.looking_timer = 0
+        self.resume_timers()
 
+    @traced("rabbit")
     def update(self, dt, player_pos, player_moving):
         """
         うさぎの状態を更新する
@@ -46,33 +154,97 @@ class Rabbit:
             bool: プレイヤーを発見したかどうか
         """
         player_detected = False
-        was_looking_back = self.looking_back  # 前フレームの状態を保存
         
-        # 振り返りタイマーの更新
-        if self.looking_back:
-            # こちらを向いている状態（左向き）
-            self.looking_timer += dt
-            if self.looking_timer >= RABBIT_LOOKING_TIME:
-                self.looking_back = False
-                self.looking_timer = 0
-                self.direction = 0  # そっぽを向く（右向き）
-                print("Rabbit turned away (facing right)")
-        else:
-            # そっぽを向いている状態（右向き）
-            self.turn_timer += dt
-            if self.turn_timer >= self.next_turn_time:
-                self.looking_back = True
-                self.turn_timer = 0
-                self.next_turn_time = random.uniform(RABBIT_TURN_MIN_TIME, RABBIT_TURN_MAX_TIME)
-                self.direction = 180  # こちらを向く（左向き）
-                print("Rabbit turned to look at player (facing left)")
+        # 振り返りはスケジューラのタイマーで行う（共有のスケジューラは所有者が進める）
+        if self._owns_scheduler:
+            self.scheduler.advance(dt)
         
         # プレイヤーの検出（こちらを向いている間のみ）
         if self.looking_back:
             player_detected = self.detect_player(player_pos, player_moving)
+            if player_detected:
+                trace_instant("Rabbit.detected", "rabbit", {"moving": player_moving, "mood": self.mood})
+        # そっぽを向いている間も、移動中の足音が届けば気づいて早めに振り返る
+        elif player_moving and self.hear_player(player_pos):
+            self._react_to_noise()
         
         return player_detected
 
+    def _turn_back(self):
+        """
+        こちらを向く（振り返りタイマーの期限が来た時に呼ばれる）
+        """
+        self.looking_back = True
+        self.direction = 180  # こちらを向く（左向き）
+        self.turn_timer = 0
+        self.looking_timer = 0
+        self.next_turn_time = self.rng.uniform(self.params.turn_min_time, self.params.turn_max_time)
+        self._phase_start = self.scheduler.now
+        self._timer = self.scheduler.schedule(self.params.looking_time, self._turn_away)
+        trace_instant("Rabbit.turn_back", "rabbit", {"looking_time": self.params.looking_time})
+        print("Rabbit turned to look at player (facing left)")
+
+    def _turn_away(self):
+        """
+        そっぽを向く（振り返っている時間が終わった時に呼ばれる）
+        """
+        self.looking_back = False
+        self.direction = 0  # そっぽを向く（右向き）
+        self.looking_timer = 0
+        self._phase_start = self.scheduler.now
+        self._timer = self.scheduler.schedule(self.next_turn_time, self._turn_back)
+        trace_instant("Rabbit.turn_away", "rabbit", {"next_turn_time": self.next_turn_time})
+        print("Rabbit turned away (facing right)")
+
+    def _react_to_noise(self):
+        """
+        足音に気づいた時に、振り返るタイマーを早める（すでに振り返る直前なら何もしない）
+        """
+        if self.scheduler.time_left(self._timer) <= RABBIT_HEARING_REACTION_TIME:
+            return
+        # 保存・復元しても同じ時刻に振り返るよう、次に振り返るまでの時間も書き換える
+        self.next_turn_time = self.scheduler.now - self._phase_start + RABBIT_HEARING_REACTION_TIME
+        self.scheduler.cancel(self._timer)
+        self._timer = self.scheduler.schedule(RABBIT_HEARING_REACTION_TIME, self._turn_back)
+        trace_instant("Rabbit.heard", "rabbit", {"reaction_time": RABBIT_HEARING_REACTION_TIME})
+        print(f"Rabbit heard footsteps, turning in {RABBIT_HEARING_REACTION_TIME:.1f} s")
+
+    def sync_timers(self):
+        """
+        今の向きになってからの経過時間をタイマーのコンポーネントに書き込む（保存する前などに呼ぶ）
+        """
+        if not self.scheduler.is_active(self._timer):
+            return
+        elapsed = self.scheduler.now - self._phase_start
+        if self.looking_back:
+            self.looking_timer = elapsed
+        else:
+            self.turn_timer = elapsed
+
+    def pause_timers(self):
+        """
+        振り返りのタイマーを止める（ゲーム終了時など）
+        """
+        self.sync_timers()
+        self.scheduler.cancel(self._timer)
+        self._timer = None
+
+    def resume_timers(self):
+        """
+        タイマーのコンポーネントの値から、次に向きを変えるタイマーを登録し直す（復元した後などに呼ぶ）
+        """
+        self.scheduler.cancel(self._timer)
+        if self.looking_back:
+            elapsed = self.looking_timer
+            remaining = self.params.looking_time - elapsed
+            callback = self._turn_away
+        else:
+            elapsed = self.turn_timer
+            remaining = self.next_turn_time - elapsed
+            callback = self._turn_back
+        self._phase_start = self.scheduler.now - elapsed
+        self._timer = self.scheduler.schedule(max(0.0, remaining), callback)
+
     def detect_player(self, player_pos, player_moving):
         """
         プレイヤーを検出する
@@ -84,29 +256,29 @@ class Rabbit:
         Returns:
             bool: プレイヤーを発見したかどうか
         """
-        player_x, player_y = player_pos
-        
-        # プレイヤーとうさぎの距離を計算
-        dx = player_x - self.x
-        dy = player_y - self.y
-        distance = math.sqrt(dx**2 + dy**2)
-        
-        # 視界内にいるかチェック
-        if distance <= RABBIT_VIEW_DISTANCE:
-            # 視野角内にいるかチェック
-            if self.looking_back:  # こちらを向いている（左向き）
-                # 左向きの場合、プレイヤーが左側にいると見える
-                angle = math.degrees(math.atan2(-dy, -dx)) % 360
-                angle_diff = min(abs(angle - 180), 360 - abs(angle - 180))
-                
-                if angle_diff <= RABBIT_VIEW_ANGLE / 2:
-                    # 視野内にいて、プレイヤーが移動中ならうさぎに見つかる
-                    if player_moving:
-                        print(f"Rabbit detected player moving: distance={distance:.1f}, angle_diff={angle_diff:.1f}")
-                        return True
-        
+        # 視界内にいて、プレイヤーが移動中ならうさぎに見つかる
+        detected = self._store.detect_player(
+            player_pos, player_moving, self.params.view_angle, self.params.view_distance, (self._index,))
+        for _, distance, angle_diff in detected:
+            print(f"Rabbit detected player moving: distance={distance:.1f}, angle_diff={angle_diff:.1f}")
+            return True
         return False
 
+    def hear_player(self, player_pos):
+        """
+        移動中のプレイヤーの足音が聞こえるかどうかを判定する（向きに関係なく判定する）
+        
+        Args:
+            player_pos (tuple): プレイヤーの位置 (x, y)
+        
+        Returns:
+            bool: 足音が聞こえたかどうか
+        """
+        if self.noise_field is None:
+            return False
+        heard, _ = self.noise_field.can_hear(self.get_position(), player_pos)
+        return heard
+
     def decrease_mood(self, amount):
         """
         機嫌度を減少させる
@@ -120,31 +292,131 @@ class Rabbit:
         self.mood = max(0, self.mood - amount)
         return self.mood <= 0
 
-    def draw(self, screen):
+    def draw(self, screen, render_queue=None, position=None, looking_back=None):
         """
         うさぎを描画する（4足歩行の自然なうさぎモデル）
         
         Args:
             screen (pygame.Surface): 描画対象の画面
+            render_queue (RenderQueue): 指定された場合は直接描画せずにキューへ登録する
+            position (tuple): 描画する位置 (x, y)（省略時は現在の位置）
+            looking_back (bool): こちらを向いているかどうか（省略時は現在の向き）
+        """
+        x, y = position if position is not None else (self.x, self.y)
+        if looking_back is None:
+            looking_back = self.looking_back
+        sprite = self._get_sprite(looking_back)
+        sprite_rect = sprite.get_rect(center=(int(x), int(y)))
+        
+        # こちらを向いている時は視界を表示する（扇形はキャッシュ済みなので転送1回で済む）
+        if self.show_view_cone and looking_back and self.quality.is_enabled(QUALITY_VIEW_CONE):
+            cone, (offset_x, offset_y) = self._get_view_cone(180)
+            cone_pos = (int(x) + offset_x, int(y) + offset_y)
+            if render_queue is not None:
+                render_queue.submit(cone, cone_pos, RENDER_LAYER_VIEW_CONE)
+            else:
+                screen.blit(cone, cone_pos)
+        
+        if render_queue is not None:
+            render_queue.submit(sprite, sprite_rect, RENDER_LAYER_ENTITY)
+        else:
+            screen.blit(sprite, sprite_rect)
+        
+        # うさぎの状態表示（画面上部にも表示しているため、品質を下げている間は省略する）
+        if self.quality.is_enabled(QUALITY_RABBIT_STATUS):
+            body_height = self.size * 0.8
+            status_surface = self._get_status_surface(looking_back)
+            status_pos = (x - status_surface.get_width() // 2, y - body_height - 20)
+            if render_queue is not None:
+                render_queue.submit(status_surface, status_pos, RENDER_LAYER_ENTITY)
+            else:
+                screen.blit(status_surface, status_pos)
+
+    def _get_sprite(self, looking_back):
+        """
+        うさぎのスプライトを取得する（向きごとに一度だけ描画してキャッシュする）
+        
+        Args:
+            looking_back (bool): こちらを向いているかどうか
+        
+        Returns:
+            pygame.Surface: うさぎのスプライト
+        """
+        key = (self.size, self.color, looking_back)
+        sprite = Rabbit._sprite_cache.get(key)
+        if sprite is None:
+            sprite_size = int(self.size * 3.2)
+            sprite = pygame.Surface((sprite_size, sprite_size), pygame.SRCALPHA)
+            self._draw_figure(sprite, sprite_size // 2, sprite_size // 2, looking_back)
+            Rabbit._sprite_cache[key] = sprite
+        return sprite
+
+    def _get_view_cone(self, facing):
+        """
+        視界の扇形を取得する（視野角・視界距離・向きごとに一度だけ描画してキャッシュする）
+        
+        Args:
+            facing (float): 向いている方向（度数法、0が右、180が左）
+        
+        Returns:
+            tuple: (扇形のサーフェス, 扇形の頂点からサーフェスの左上までのずれ (x, y))
+        """
+        key = (self.params.view_angle, self.params.view_distance, facing)
+        cone = Rabbit._view_cone_cache.get(key)
+        if cone is None:
+            cone = _rasterize_view_cone(*key)
+            Rabbit._view_cone_cache[key] = cone
+        return cone
+
+    @staticmethod
+    def _get_status_surface(looking_back):
+        """
+        うさぎの状態表示テキストを取得する（一度だけレンダリングしてキャッシュする）
+        
+        Args:
+            looking_back (bool): こちらを向いているかどうか
+        
+        Returns:
+            pygame.Surface: 状態表示テキスト
+        """
+        surface = Rabbit._status_cache.get(looking_back)
+        if surface is None:
+            font = pygame.font.SysFont(None, 20)
+            if looking_back:  # こちらを向いている時
+                surface = font.render("Looking at you!", True, (255, 0, 0))
+            else:  # そっぽを向いている時
+                surface = font.render("Looking away", True, (0, 128, 0))
+            Rabbit._status_cache[looking_back] = surface
+        return surface
+
+    def _draw_figure(self, surface, cx, cy, looking_back):
+        """
+        うさぎの姿を描画する
+        
+        Args:
+            surface (pygame.Surface): 描画対象のサーフェス
+            cx (int): 中心X座標
+            cy (int): 中心Y座標
+            looking_back (bool): こちらを向いているかどうか
         """
         # うさぎの体（楕円）- 横長にして4足歩行らしく
         body_width = self.size * 1.5
         body_height = self.size * 0.8
-        pygame.draw.ellipse(screen, self.color, 
-                           (self.x - body_width // 2, self.y - body_height // 2, 
+        pygame.draw.ellipse(surface, self.color, 
+                           (cx - body_width // 2, cy - body_height // 2, 
                             body_width, body_height))
         
         # うさぎの頭（円）- 体の前方に配置
         head_size = self.size * 0.7
         head_offset_x = body_width // 3  # 体の前方に頭を配置
         
-        if self.looking_back:  # こちらを向いている時は左向き
-            head_x = self.x - head_offset_x
+        if looking_back:  # こちらを向いている時は左向き
+            head_x = cx - head_offset_x
         else:  # そっぽを向いている時は右向き
-            head_x = self.x + head_offset_x
+            head_x = cx + head_offset_x
             
-        head_y = self.y - body_height // 4  # 体より少し上に頭を配置
-        pygame.draw.circle(screen, self.color, (int(head_x), int(head_y)), int(head_size // 2))
+        head_y = cy - body_height // 4  # 体より少し上に頭を配置
+        pygame.draw.circle(surface, self.color, (int(head_x), int(head_y)), int(head_size // 2))
         
         # うさぎの耳（長い楕円）
         ear_width = self.size // 5
@@ -152,7 +424,7 @@ class Rabbit:
         ear_spacing = self.size // 4
         
         # 左右の耳の位置を計算
-        if self.looking_back:  # こちらを向いている時は左向き
+        if looking_back:  # こちらを向いている時は左向き
             left_ear_x = head_x - ear_spacing // 2
             right_ear_x = head_x + ear_spacing // 2
         else:  # そっぽを向いている時は右向き
@@ -160,12 +432,12 @@ class Rabbit:
             right_ear_x = head_x + ear_spacing // 2
         
         # 左耳
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (left_ear_x - ear_width // 2, head_y - head_size // 2 - ear_length,
                             ear_width, ear_length))
         
         # 右耳
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (right_ear_x - ear_width // 2, head_y - head_size // 2 - ear_length,
                             ear_width, ear_length))
         
@@ -174,13 +446,13 @@ class Rabbit:
         inner_ear_length = ear_length * 0.7
         
         # 左耳の内側
-        pygame.draw.ellipse(screen, (255, 200, 200), 
+        pygame.draw.ellipse(surface, (255, 200, 200), 
                            (left_ear_x - inner_ear_width // 2, 
                             head_y - head_size // 2 - ear_length + ear_length * 0.15,
                             inner_ear_width, inner_ear_length))
         
         # 右耳の内側
-        pygame.draw.ellipse(screen, (255, 200, 200), 
+        pygame.draw.ellipse(surface, (255, 200, 200), 
                            (right_ear_x - inner_ear_width // 2, 
                             head_y - head_size // 2 - ear_length + ear_length * 0.15,
                             inner_ear_width, inner_ear_length))
@@ -189,20 +461,20 @@ class Rabbit:
         eye_size = max(3, int(head_size // 8))
         eye_y = head_y - head_size // 8
         
-        if self.looking_back:  # こちらを向いている時は左向き
+        if looking_back:  # こちらを向いている時は左向き
             # 左目
             eye_x = head_x - head_size // 4
-            pygame.draw.circle(screen, (0, 0, 0), (int(eye_x), int(eye_y)), eye_size)
+            pygame.draw.circle(surface, (0, 0, 0), (int(eye_x), int(eye_y)), eye_size)
             
             # 鼻
             nose_x = head_x - head_size // 3
             nose_y = head_y + head_size // 8
-            pygame.draw.circle(screen, (255, 150, 150), (int(nose_x), int(nose_y)), max(2, eye_size // 2))
+            pygame.draw.circle(surface, (255, 150, 150), (int(nose_x), int(nose_y)), max(2, eye_size // 2))
             
             # 口（小さな曲線）
             mouth_start = (nose_x - eye_size, nose_y + eye_size // 2)
             mouth_end = (nose_x, nose_y + eye_size)
-            pygame.draw.arc(screen, (0, 0, 0), 
+            pygame.draw.arc(surface, (0, 0, 0), 
                            (mouth_start[0], mouth_start[1], 
                             mouth_end[0] - mouth_start[0], mouth_end[1] - mouth_start[1]), 
                            0, 3.14, 1)
@@ -210,8 +482,8 @@ class Rabbit:
             # 方向を示す矢印
             arrow_start = (head_x - head_size // 2, head_y)
             arrow_end = (head_x - head_size // 2 - self.size // 2, head_y)
-            pygame.draw.line(screen, (100, 100, 100), arrow_start, arrow_end, 2)
-            pygame.draw.polygon(screen, (100, 100, 100), [
+            pygame.draw.line(surface, (100, 100, 100), arrow_start, arrow_end, 2)
+            pygame.draw.polygon(surface, (100, 100, 100), [
                 arrow_end,
                 (arrow_end[0] + 5, arrow_end[1] - 5),
                 (arrow_end[0] + 5, arrow_end[1] + 5)
@@ -220,17 +492,17 @@ class Rabbit:
         else:  # そっぽを向いている時は右向き
             # 右目
             eye_x = head_x + head_size // 4
-            pygame.draw.circle(screen, (0, 0, 0), (int(eye_x), int(eye_y)), eye_size)
+            pygame.draw.circle(surface, (0, 0, 0), (int(eye_x), int(eye_y)), eye_size)
             
             # 鼻
             nose_x = head_x + head_size // 3
             nose_y = head_y + head_size // 8
-            pygame.draw.circle(screen, (255, 150, 150), (int(nose_x), int(nose_y)), max(2, eye_size // 2))
+            pygame.draw.circle(surface, (255, 150, 150), (int(nose_x), int(nose_y)), max(2, eye_size // 2))
             
             # 口（小さな曲線）
             mouth_start = (nose_x, nose_y + eye_size // 2)
             mouth_end = (nose_x + eye_size, nose_y + eye_size)
-            pygame.draw.arc(screen, (0, 0, 0), 
+            pygame.draw.arc(surface, (0, 0, 0), 
                            (mouth_start[0], mouth_start[1], 
                             mouth_end[0] - mouth_start[0], mouth_end[1] - mouth_start[1]), 
                            0, 3.14, 1)
@@ -238,8 +510,8 @@ class Rabbit:
             # 方向を示す矢印
             arrow_start = (head_x + head_size // 2, head_y)
             arrow_end = (head_x + head_size // 2 + self.size // 2, head_y)
-            pygame.draw.line(screen, (100, 100, 100), arrow_start, arrow_end, 2)
-            pygame.draw.polygon(screen, (100, 100, 100), [
+            pygame.draw.line(surface, (100, 100, 100), arrow_start, arrow_end, 2)
+            pygame.draw.polygon(surface, (100, 100, 100), [
                 arrow_end,
                 (arrow_end[0] - 5, arrow_end[1] - 5),
                 (arrow_end[0] - 5, arrow_end[1] + 5)
@@ -248,61 +520,49 @@ class Rabbit:
         # 足（4本）
         leg_width = self.size // 6
         leg_height = self.size // 3
-        leg_y = self.y + body_height // 2 - leg_height // 2
+        leg_y = cy + body_height // 2 - leg_height // 2
         
         # 前足の位置（頭に近い方）
-        if self.looking_back:  # こちらを向いている時は左向き
-            front_legs_x = self.x - body_width // 3
+        if looking_back:  # こちらを向いている時は左向き
+            front_legs_x = cx - body_width // 3
         else:  # そっぽを向いている時は右向き
-            front_legs_x = self.x + body_width // 3
+            front_legs_x = cx + body_width // 3
             
         # 後ろ足の位置（頭から遠い方）
-        if self.looking_back:  # こちらを向いている時は左向き
-            back_legs_x = self.x + body_width // 3
+        if looking_back:  # こちらを向いている時は左向き
+            back_legs_x = cx + body_width // 3
         else:  # そっぽを向いている時は右向き
-            back_legs_x = self.x - body_width // 3
+            back_legs_x = cx - body_width // 3
         
         # 前足（左）
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (front_legs_x - leg_width - leg_width // 2, leg_y,
                             leg_width, leg_height))
         
         # 前足（右）
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (front_legs_x + leg_width // 2, leg_y,
                             leg_width, leg_height))
         
         # 後ろ足（左）
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (back_legs_x - leg_width - leg_width // 2, leg_y,
                             leg_width, leg_height))
         
         # 後ろ足（右）
-        pygame.draw.ellipse(screen, self.color, 
+        pygame.draw.ellipse(surface, self.color, 
                            (back_legs_x + leg_width // 2, leg_y,
                             leg_width, leg_height))
         
         # しっぽ（小さな円）- 体の後ろ側に表示
         tail_size = self.size // 4
-        if self.looking_back:  # こちらを向いている時は左向き
-            tail_x = self.x + body_width // 2
+        if looking_back:  # こちらを向いている時は左向き
+            tail_x = cx + body_width // 2
         else:  # そっぽを向いている時は右向き
-            tail_x = self.x - body_width // 2
+            tail_x = cx - body_width // 2
             
-        tail_y = self.y
-        pygame.draw.circle(screen, self.color, (int(tail_x), int(tail_y)), tail_size)
-        
-        # うさぎの状態表示
-        if self.looking_back:  # こちらを向いている時
-            status_text = "Looking at you!"
-            font = pygame.font.SysFont(None, 20)
-            text_surface = font.render(status_text, True, (255, 0, 0))
-            screen.blit(text_surface, (self.x - text_surface.get_width() // 2, self.y - body_height - 20))
-        else:  # そっぽを向いている時
-            status_text = "Looking away"
-            font = pygame.font.SysFont(None, 20)
-            text_surface = font.render(status_text, True, (0, 128, 0))
-            screen.blit(text_surface, (self.x - text_surface.get_width() // 2, self.y - body_height - 20))
+        tail_y = cy
+        pygame.draw.circle(surface, self.color, (int(tail_x), int(tail_y)), tail_size)
 
     def get_position(self):
         """
@@ -330,3 +590,12 @@ class Rabbit:
             int: 機嫌度
         """
         return self.mood
+
+    def get_time_until_turn(self):
+        """
+        次に向きを変えるまでの残り時間を取得する
+        
+        Returns:
+            float: 残り時間（秒、タイマーを止めている場合は0）
+        """
+        return self.scheduler.time_left(self._timer)
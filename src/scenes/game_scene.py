@@ -3,33 +3,120 @@
 """
 import pygame
 import math
+from collections import namedtuple
 from src.utils.constants import (
     WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, BLACK, RED, GREEN, YELLOW,
     BACKGROUND_COLOR, MOOD_DECREASE, PETTING_DISTANCE, SCENE_RESULT,
-    GAME_TEXTS
+    GAME_TEXTS, RENDER_LAYER_BACKGROUND, RENDER_LAYER_UI, RENDER_STATS_INTERVAL,
+    FOOTSTEP_INTERVAL, OBSTACLE_ABSORPTION, DUST_INTERVAL
 )
+from src.entity_store import EntityStore
+from src.hearing import NoiseField
+from src.particles import ParticleSystem
+from src.pathfinding import PathGrid
 from src.player import Player
 from src.rabbit import Rabbit
+from src.utils import alloc_tracker
+from src.utils.audio_manager import AudioManager
 from src.utils.font_manager import FontManager
+from src.utils.quality_governor import (
+    QualityGovernor, QUALITY_PARTICLES, QUALITY_BILINGUAL_TEXT, QUALITY_TEXT_ANTIALIAS
+)
+from src.utils.render_queue import RenderQueue
+from src.utils.scheduler import TimerScheduler
+from src.utils.telemetry import (
+    Telemetry, EVENT_SESSION_START, EVENT_CLICK, EVENT_DETECTED, EVENT_CLEAR, EVENT_GAME_OVER
+)
+from src.utils.tracer import traced
+
+# 描画に必要なシーンの状態（シミュレーションのスレッドから描画するスレッドへ渡すため変更しない）
+GameRenderState = namedtuple("GameRenderState", [
+    "player_pos",  # プレイヤーの位置 (x, y)
+    "rabbit_pos",  # うさぎの位置 (x, y)
+    "rabbit_looking",  # うさぎがこちらを向いているかどうか
+    "mood",  # うさぎの機嫌度
+    "warning_visible",
+    "game_over",
+    "game_clear",
+    "particles",  # パーティクルの (スプライト, 描画位置) のリスト
+])
 
 
 class GameScene:
     """
     ゲームシーンを表すクラス
     """
-    def __init__(self):
+    _text_cache = {}  # (テキスト名, サイズ, 色, アンチエイリアス) -> (英語, 日本語) のレンダリング済みテキスト
+    
+    # 描画中に使う固定のテキスト (テキスト名, サイズ, 色)
+    _STATIC_TEXTS = (
+        ("found", 36, RED), ("rabbit_looking", 24, RED), ("game_over", 36, RED),
+        ("petted", 36, GREEN), ("left_click", 24, BLACK), ("right_click", 24, BLACK),
+        ("dont_move", 24, RED), ("move_ok", 24, GREEN),
+    )
+
+    @traced("scene")
+    def __init__(self, level=None, stage_number=1, rng=None):
         """
         ゲームシーンの初期化
+        
+        Args:
+            level (Level): プレイするステージ（省略時は障害物のない初期配置）
+            stage_number (int): 表示用のステージ番号（1から）
+            rng (random.Random): このシーンで使う乱数（省略時は random モジュールの共有の乱数、
+                複数のセッションを同時に動かす場合はセッションごとに渡す）
         """
-        self.player = Player()
-        self.rabbit = Rabbit()
+        self.level = level
+        self.stage_number = stage_number
+        self.entity_store = EntityStore()
+        self.path_grid = PathGrid()
+        self.noise_field = NoiseField()
+        self.scheduler = TimerScheduler()  # うさぎの振り返り・警告表示・結果表示までのタイマー
+        if level is not None:
+            self.path_grid.set_obstacles(level.obstacle_cells)
+            self.noise_field.set_absorption(level.obstacle_cells, OBSTACLE_ABSORPTION)
+            self.background = level.get_background()
+            self.player = Player(self.entity_store, self.path_grid, level.player_spawn)
+            self.rabbit = Rabbit(self.entity_store, self.noise_field, level.rabbit_spawn, level.rabbit_params,
+                                 self.scheduler, rng=rng)
+            print(f"Game scene: Stage {stage_number} ({level.name})")
+        else:
+            self.background = None
+            self.player = Player(self.entity_store, self.path_grid)
+            self.rabbit = Rabbit(self.entity_store, self.noise_field, scheduler=self.scheduler, rng=rng)
         self.font_manager = FontManager()
+        self.quality = QualityGovernor()
+        self.audio_manager = AudioManager()
+        self.footstep_timer = 0
+        self.particles = ParticleSystem()
+        if rng is not None:
+            self.particles.seed(rng.getrandbits(32))
+        self.dust_timer = 0
+        self.telemetry = Telemetry()
+        self.session_id = self.telemetry.new_session()
+        self.play_time = 0  # ゲーム開始からの経過時間（秒）
+        self.clear_time = None  # クリアまでにかかった時間（秒、クリアするまではNone）
+        self.click_count = 0
+        self.telemetry.record(self.session_id, EVENT_SESSION_START, stage=stage_number)
         self.game_over = False
         self.game_clear = False
+        # 経過時間・残り時間は sync_timers() を呼んだ時点の値（期限はスケジューラが管理する）
         self.result_timer = 0
         self.result_delay = 2.0  # 結果表示までの遅延（秒）
         self.warning_timer = 0
         self.warning_visible = False
+        self._warning_timer_handle = None
+        self._result_timer_handle = None
+        self._result_ready = False
+        self.render_queue = RenderQueue((0, 0, WINDOW_WIDTH, WINDOW_HEIGHT), RENDER_STATS_INTERVAL)
+        self._mood_gauge_cache = {}  # 機嫌度 -> ゲージのサーフェス
+        self._mood_label_layout = None  # (機嫌度, 日本語を併記するかどうか, 機嫌度表示の転送リスト)
+        self._stage_label_layout = self.font_manager.layout_text(
+            f"{GAME_TEXTS['stage']['en']}{stage_number}", (10, 10), 24, BLACK, False)
+        
+        # 固定のテキストは描画中にレンダリングしないよう先に用意しておく
+        for key, size, color in self._STATIC_TEXTS:
+            self._get_text_pair(key, size, color)
 
     def handle_event(self, event):
         """
@@ -45,18 +132,33 @@ class GameScene:
             # ゲーム終了後は結果シーンへの遷移を待つのみ
             return None
             
+        if event.type == pygame.KEYDOWN and event.key == pygame.K_v:
+            # うさぎの視界の表示を切り替える
+            self.rabbit.show_view_cone = not self.rabbit.show_view_cone
+            return None
+            
         if event.type == pygame.MOUSEBUTTONDOWN:
+            self.click_count += 1
+            self.telemetry.record(self.session_id, EVENT_CLICK, button=event.button,
+                                  x=event.pos[0], y=event.pos[1],
+                                  rabbit_looking=self.rabbit.is_looking_back())
             if event.button == 1:  # 左クリック
                 # うさぎがこちらを向いている場合は移動しない（警告表示のみ）
                 if self.rabbit.is_looking_back():
-                    self.warning_timer = 1.0
-                    self.warning_visible = True
+                    self._show_warning()
+                    self.audio_manager.play_effect("found")
+                    self.particles.emit_alert(self._alert_position())
                     # うさぎがこちらを向いている時に動こうとした場合も機嫌度を減少
                     game_over = self.rabbit.decrease_mood(MOOD_DECREASE)
                     print(f"Game scene: Player tried to move while rabbit is looking. Mood decreased to {self.rabbit.get_mood()}")
+                    self._record_detection("clicked_while_looking")
                     if game_over:
                         print("Game scene: Player detected too many times, game over")
                         self.game_over = True
+                        self._record_game_over()
+                elif self.path_grid.is_blocked(event.pos):
+                    # 障害物の上には移動できない
+                    print(f"Game scene: Target {event.pos} is blocked by an obstacle")
                 else:
                     # うさぎがそっぽを向いている場合は移動可能
                     self.player.set_target(event.pos[0], event.pos[1])
@@ -70,6 +172,11 @@ class GameScene:
                     if distance <= PETTING_DISTANCE:
                         print("Game scene: Player petted the rabbit, game clear")
                         self.game_clear = True
+                        self.clear_time = self.play_time
+                        self.audio_manager.play_effect("pet")
+                        self.particles.emit_hearts(rabbit_pos)
+                        self.telemetry.record(self.session_id, EVENT_CLEAR, clear_time=round(self.clear_time, 3),
+                                              clicks=self.click_count, mood=self.rabbit.get_mood())
             
             elif event.button == 3:  # 右クリック
                 self.player.stop_moving()
@@ -86,161 +193,357 @@ class GameScene:
         Returns:
             str or None: 遷移先のシーン名、遷移しない場合はNone
         """
+        # パーティクルは結果表示までの間も動かし続ける
+        self.particles.update(dt)
+        
         if self.game_over or self.game_clear:
-            self.result_timer += dt
-            if self.result_timer >= self.result_delay:
+            if self._result_timer_handle is None:
+                self._stop_play_timers()
+            self.scheduler.advance(dt)
+            if self._result_ready:
                 print(f"Game scene: Result timer complete, transitioning to result scene. Game over: {self.game_over}, Game clear: {self.game_clear}")
                 return SCENE_RESULT
             return None
         
+        self.play_time += dt
+        
         # プレイヤーの更新
         self.player.update()
         
+        # 移動中は一定間隔で足音を鳴らす
+        if self.player.is_moving():
+            self.footstep_timer -= dt
+            if self.footstep_timer <= 0:
+                self.audio_manager.play_effect("footstep")
+                self.footstep_timer = FOOTSTEP_INTERVAL
+            
+            # 足元に土ぼこりを出す
+            self.dust_timer -= dt
+            if self.dust_timer <= 0:
+                player_x, player_y = self.player.get_position()
+                self.particles.emit_dust((player_x, player_y + self.player.size // 2))
+                self.dust_timer = DUST_INTERVAL
+        else:
+            self.footstep_timer = 0
+            self.dust_timer = 0
+        
         # うさぎがこちらを向いた瞬間にプレイヤーが移動中なら停止させる
         if self.rabbit.is_looking_back() and self.player.is_moving():
             # プレイヤーを強制停止
             self.player.stop_moving()
             # 警告表示
-            self.warning_timer = 1.0
-            self.warning_visible = True
+            self._show_warning()
+            self.audio_manager.play_effect("found")
+            self.particles.emit_alert(self._alert_position())
             # 機嫌度を減少させる
             game_over = self.rabbit.decrease_mood(MOOD_DECREASE)
             print(f"Game scene: Rabbit turned to look while player was moving, player forced to stop. Mood decreased to {self.rabbit.get_mood()}")
+            self._record_detection("turned_while_moving")
             if game_over:
                 print("Game scene: Player detected too many times, game over")
                 self.game_over = True
+                self._record_game_over()
+        
+        # 期限が来たタイマー（うさぎの振り返り・警告表示の終了）を実行する
+        self.scheduler.advance(dt)
         
         # うさぎの更新
         player_detected = self.rabbit.update(dt, self.player.get_position(), self.player.is_moving())
         
         # プレイヤーが検出された場合
         if player_detected:
-            self.warning_timer = 1.0  # 警告表示時間
-            self.warning_visible = True
+            # 同じ振り返りで次のフレームにもう一度減らさないよう、ここで停止させる
+            self.player.stop_moving()
+            self._show_warning()
+            self.audio_manager.play_effect("found")
+            self.particles.emit_alert(self._alert_position())
             # 機嫌度を減少させる（一度に減少する量を調整）
             game_over = self.rabbit.decrease_mood(MOOD_DECREASE)
             print(f"Game scene: Player detected moving while rabbit was looking, mood decreased to {self.rabbit.get_mood()}")
+            self._record_detection("seen")
             if game_over:
                 print("Game scene: Player detected too many times, game over")
                 self.game_over = True
+                self._record_game_over()
+        
+        return None
+
+    def _show_warning(self, duration=1.0):
+        """
+        警告を表示し、一定時間後に消すタイマーを登録し直す
+        
+        Args:
+            duration (float): 警告表示時間（秒）
+        """
+        self.warning_visible = True
+        self.warning_timer = duration
+        self.scheduler.cancel(self._warning_timer_handle)
+        self._warning_timer_handle = self.scheduler.schedule(duration, self._hide_warning)
+
+    def _hide_warning(self):
+        """
+        警告を消す（警告表示のタイマーの期限が来た時に呼ばれる）
+        """
+        self.warning_visible = False
+        self.warning_timer = 0
+
+    def _on_result_timer(self):
+        """
+        結果表示までの遅延が終わった時に呼ばれる
+        """
+        self.result_timer = self.result_delay
+        self._result_ready = True
+
+    def _stop_play_timers(self):
+        """
+        ゲーム終了時に、うさぎと警告表示のタイマーを止めて結果表示までのタイマーを登録する
         
-        # 警告表示の更新
+        うさぎはその場で止まり、警告は表示中であれば結果表示まで出たままになる。
+        """
+        self.sync_timers()
+        self.rabbit.pause_timers()
+        self.scheduler.cancel(self._warning_timer_handle)
+        self._warning_timer_handle = None
+        self._result_timer_handle = self.scheduler.schedule(
+            self.result_delay - self.result_timer, self._on_result_timer)
+
+    def sync_timers(self):
+        """
+        スケジューラが管理しているタイマーの経過時間・残り時間を各属性に書き込む（保存する前などに呼ぶ）
+        """
+        if self.scheduler.is_active(self._warning_timer_handle):
+            self.warning_timer = self.scheduler.time_left(self._warning_timer_handle)
+        if self.scheduler.is_active(self._result_timer_handle):
+            self.result_timer = self.result_delay - self.scheduler.time_left(self._result_timer_handle)
+        self.rabbit.sync_timers()
+
+    def resume_timers(self):
+        """
+        各属性の経過時間・残り時間からタイマーを登録し直す（スナップショットから復元した後に呼ぶ）
+        """
+        self.scheduler.cancel(self._warning_timer_handle)
+        self.scheduler.cancel(self._result_timer_handle)
+        self._warning_timer_handle = None
+        self._result_timer_handle = None
+        self._result_ready = False
+        self.rabbit.resume_timers()
+        if self.game_over or self.game_clear:
+            # 終了後のタイマーは次の update() で登録する
+            return
         if self.warning_visible:
-            self.warning_timer -= dt
-            if self.warning_timer <= 0:
-                self.warning_visible = False
+            self._show_warning(self.warning_timer)
+
+    def capture_render_state(self):
+        """
+        描画に必要な状態を取り出す
         
-        return None
+        Returns:
+            GameRenderState: 現在の状態
+        """
+        return GameRenderState(
+            self.player.get_position(), self.rabbit.get_position(), self.rabbit.is_looking_back(),
+            self.rabbit.get_mood(), self.warning_visible, self.game_over, self.game_clear,
+            self.particles.build_blits() if self.quality.is_enabled(QUALITY_PARTICLES) else ())
 
-    def draw(self, screen):
+    def draw(self, screen, state=None):
         """
         シーンを描画する
         
         Args:
             screen (pygame.Surface): 描画対象の画面
+            state (GameRenderState): 描画する状態（省略時は現在の状態、
+                別のスレッドで更新している場合は公開された状態を渡す）
         """
+        if state is None:
+            state = self.capture_render_state()
+        
         # 背景を描画
-        screen.fill(BACKGROUND_COLOR)
+        if self.background is not None:
+            self.render_queue.submit(self.background, (0, 0), RENDER_LAYER_BACKGROUND)
+        else:
+            screen.fill(BACKGROUND_COLOR)
         
-        # プレイヤーとうさぎを描画
-        self.player.draw(screen)
-        self.rabbit.draw(screen)
+        # プレイヤーとうさぎを描画キューに登録
+        self.player.draw(screen, self.render_queue, state.player_pos)
+        self.rabbit.draw(screen, self.render_queue, state.rabbit_pos, state.rabbit_looking)
+        self.particles.draw(screen, self.render_queue, state.particles)
         
         # 機嫌ゲージを描画
-        self._draw_mood_gauge(screen)
+        self._draw_mood_gauge(state.mood)
         
         # 警告表示
-        if self.warning_visible:
-            warning_text_en = self.font_manager.render_text(GAME_TEXTS["found"]["en"], 36, RED, False)
-            warning_text_ja = self.font_manager.render_text(GAME_TEXTS["found"]["ja"], 36, RED, True)
-            screen.blit(warning_text_en, (WINDOW_WIDTH // 2 - warning_text_en.get_width() // 2, 30))
-            screen.blit(warning_text_ja, (WINDOW_WIDTH // 2 - warning_text_ja.get_width() // 2, 70))
+        if state.warning_visible:
+            warning_text_en, warning_text_ja = self._get_text_pair("found", 36, RED)
+            self._submit_text(warning_text_en, (WINDOW_WIDTH // 2 - warning_text_en.get_width() // 2, 30))
+            self._submit_japanese_text(warning_text_ja, (WINDOW_WIDTH // 2 - warning_text_ja.get_width() // 2, 70))
         
         # うさぎの状態表示
-        if self.rabbit.is_looking_back():
-            status_text_en = self.font_manager.render_text(GAME_TEXTS["rabbit_looking"]["en"], 24, RED, False)
-            status_text_ja = self.font_manager.render_text(GAME_TEXTS["rabbit_looking"]["ja"], 24, RED, True)
-            screen.blit(status_text_en, (WINDOW_WIDTH // 2 - status_text_en.get_width() // 2, 10))
-            screen.blit(status_text_ja, (WINDOW_WIDTH // 2 - status_text_ja.get_width() // 2, 35))
+        if state.rabbit_looking:
+            status_text_en, status_text_ja = self._get_text_pair("rabbit_looking", 24, RED)
+            self._submit_text(status_text_en, (WINDOW_WIDTH // 2 - status_text_en.get_width() // 2, 10))
+            self._submit_japanese_text(status_text_ja, (WINDOW_WIDTH // 2 - status_text_ja.get_width() // 2, 35))
         
         # ゲームオーバー表示
-        if self.game_over:
-            game_over_text_en = self.font_manager.render_text(GAME_TEXTS["game_over"]["en"], 36, RED, False)
-            game_over_text_ja = self.font_manager.render_text(GAME_TEXTS["game_over"]["ja"], 36, RED, True)
-            screen.blit(game_over_text_en, 
-                       (WINDOW_WIDTH // 2 - game_over_text_en.get_width() // 2, 
-                        WINDOW_HEIGHT // 2 - game_over_text_en.get_height() - 10))
-            screen.blit(game_over_text_ja, 
-                       (WINDOW_WIDTH // 2 - game_over_text_ja.get_width() // 2, 
-                        WINDOW_HEIGHT // 2 + 10))
+        if state.game_over:
+            game_over_text_en, game_over_text_ja = self._get_text_pair("game_over", 36, RED)
+            self._submit_text(game_over_text_en, 
+                              (WINDOW_WIDTH // 2 - game_over_text_en.get_width() // 2, 
+                               WINDOW_HEIGHT // 2 - game_over_text_en.get_height() - 10))
+            self._submit_japanese_text(game_over_text_ja, 
+                              (WINDOW_WIDTH // 2 - game_over_text_ja.get_width() // 2, 
+                               WINDOW_HEIGHT // 2 + 10))
         
         # ゲームクリア表示
-        if self.game_clear:
-            clear_text_en = self.font_manager.render_text(GAME_TEXTS["petted"]["en"], 36, GREEN, False)
-            clear_text_ja = self.font_manager.render_text(GAME_TEXTS["petted"]["ja"], 36, GREEN, True)
-            screen.blit(clear_text_en, 
-                       (WINDOW_WIDTH // 2 - clear_text_en.get_width() // 2, 
-                        WINDOW_HEIGHT // 2 - clear_text_en.get_height() - 10))
-            screen.blit(clear_text_ja, 
-                       (WINDOW_WIDTH // 2 - clear_text_ja.get_width() // 2, 
-                        WINDOW_HEIGHT // 2 + 10))
+        if state.game_clear:
+            clear_text_en, clear_text_ja = self._get_text_pair("petted", 36, GREEN)
+            self._submit_text(clear_text_en, 
+                              (WINDOW_WIDTH // 2 - clear_text_en.get_width() // 2, 
+                               WINDOW_HEIGHT // 2 - clear_text_en.get_height() - 10))
+            self._submit_japanese_text(clear_text_ja, 
+                              (WINDOW_WIDTH // 2 - clear_text_ja.get_width() // 2, 
+                               WINDOW_HEIGHT // 2 + 10))
         
         # 操作説明
-        help_text1_en = self.font_manager.render_text(GAME_TEXTS["left_click"]["en"], 24, BLACK, False)
-        help_text1_ja = self.font_manager.render_text(GAME_TEXTS["left_click"]["ja"], 24, BLACK, True)
-        help_text2_en = self.font_manager.render_text(GAME_TEXTS["right_click"]["en"], 24, BLACK, False)
-        help_text2_ja = self.font_manager.render_text(GAME_TEXTS["right_click"]["ja"], 24, BLACK, True)
+        help_text1_en, help_text1_ja = self._get_text_pair("left_click", 24, BLACK)
+        help_text2_en, help_text2_ja = self._get_text_pair("right_click", 24, BLACK)
         
-        screen.blit(help_text1_en, (10, WINDOW_HEIGHT - 80))
-        screen.blit(help_text1_ja, (10, WINDOW_HEIGHT - 60))
-        screen.blit(help_text2_en, (10, WINDOW_HEIGHT - 40))
-        screen.blit(help_text2_ja, (10, WINDOW_HEIGHT - 20))
+        self._submit_text(help_text1_en, (10, WINDOW_HEIGHT - 80))
+        self._submit_japanese_text(help_text1_ja, (10, WINDOW_HEIGHT - 60))
+        self._submit_text(help_text2_en, (10, WINDOW_HEIGHT - 40))
+        self._submit_japanese_text(help_text2_ja, (10, WINDOW_HEIGHT - 20))
         
         # うさぎがこちらを向いている時の注意表示
-        if self.rabbit.is_looking_back():
-            caution_text_en = self.font_manager.render_text(GAME_TEXTS["dont_move"]["en"], 24, RED, False)
-            caution_text_ja = self.font_manager.render_text(GAME_TEXTS["dont_move"]["ja"], 24, RED, True)
-            screen.blit(caution_text_en, (WINDOW_WIDTH // 2 - caution_text_en.get_width() // 2, WINDOW_HEIGHT - 40))
-            screen.blit(caution_text_ja, (WINDOW_WIDTH // 2 - caution_text_ja.get_width() // 2, WINDOW_HEIGHT - 20))
+        if state.rabbit_looking:
+            caution_text_en, caution_text_ja = self._get_text_pair("dont_move", 24, RED)
+            self._submit_text(caution_text_en, (WINDOW_WIDTH // 2 - caution_text_en.get_width() // 2, WINDOW_HEIGHT - 40))
+            self._submit_japanese_text(caution_text_ja, (WINDOW_WIDTH // 2 - caution_text_ja.get_width() // 2, WINDOW_HEIGHT - 20))
         else:
             # うさぎがそっぽを向いている時は移動OKの表示
-            move_text_en = self.font_manager.render_text(GAME_TEXTS["move_ok"]["en"], 24, GREEN, False)
-            move_text_ja = self.font_manager.render_text(GAME_TEXTS["move_ok"]["ja"], 24, GREEN, True)
-            screen.blit(move_text_en, (WINDOW_WIDTH // 2 - move_text_en.get_width() // 2, WINDOW_HEIGHT - 40))
-            screen.blit(move_text_ja, (WINDOW_WIDTH // 2 - move_text_ja.get_width() // 2, WINDOW_HEIGHT - 20))
+            move_text_en, move_text_ja = self._get_text_pair("move_ok", 24, GREEN)
+            self._submit_text(move_text_en, (WINDOW_WIDTH // 2 - move_text_en.get_width() // 2, WINDOW_HEIGHT - 40))
+            self._submit_japanese_text(move_text_ja, (WINDOW_WIDTH // 2 - move_text_ja.get_width() // 2, WINDOW_HEIGHT - 20))
+        
+        # 登録された描画コマンドをまとめて転送する
+        # 転送の直前はフレーム内の一時オブジェクトが最も多く残っている時点なので、割り当ての内訳をここで取る
+        alloc_tracker.checkpoint()
+        self.render_queue.flush(screen)
 
-    def _draw_mood_gauge(self, screen):
+    def _record_detection(self, reason):
         """
-        うさぎの機嫌ゲージを描画する
+        うさぎに見つかったことをプレイ記録に残す
         
         Args:
-            screen (pygame.Surface): 描画対象の画面
+            reason (str): 見つかった状況
+        """
+        self.telemetry.record(self.session_id, EVENT_DETECTED, reason=reason,
+                              mood=self.rabbit.get_mood(), play_time=round(self.play_time, 3))
+
+    def _record_game_over(self):
+        """
+        ゲームオーバーをプレイ記録に残す
+        """
+        self.telemetry.record(self.session_id, EVENT_GAME_OVER, play_time=round(self.play_time, 3),
+                              clicks=self.click_count)
+
+    def _alert_position(self):
+        """
+        見つかった時の演出を出す位置（うさぎの頭上）を求める
+        
+        Returns:
+            tuple: 位置 (x, y)
+        """
+        rabbit_x, rabbit_y = self.rabbit.get_position()
+        return (rabbit_x, rabbit_y - self.rabbit.size)
+
+    def _get_text_pair(self, key, size, color):
+        """
+        固定のテキストを英語と日本語でレンダリングしたものを取得する（一度だけレンダリングしてキャッシュする）
+        
+        Args:
+            key (str): GAME_TEXTS のキー
+            size (int): フォントサイズ
+            color (tuple): 色 (R, G, B)
+        
+        Returns:
+            tuple: (英語のテキスト, 日本語のテキスト)
+        """
+        # 品質を下げている間はアンチエイリアスなし（転送の速いカラーキーのサーフェス）を使う
+        antialias = self.quality.is_enabled(QUALITY_TEXT_ANTIALIAS)
+        cache_key = (key, size, color, antialias)
+        pair = GameScene._text_cache.get(cache_key)
+        if pair is None:
+            pair = (self.font_manager.render_text(GAME_TEXTS[key]["en"], size, color, False, antialias),
+                    self.font_manager.render_text(GAME_TEXTS[key]["ja"], size, color, True, antialias))
+            GameScene._text_cache[cache_key] = pair
+        return pair
+
+    def _submit_text(self, text_surface, pos):
+        """
+        テキストをUIレイヤーの描画コマンドとして登録する
+        
+        Args:
+            text_surface (pygame.Surface): レンダリング済みのテキスト
+            pos (tuple): 描画位置 (x, y)
+        """
+        self.render_queue.submit(text_surface, pos, RENDER_LAYER_UI)
+
+    def _submit_japanese_text(self, text_surface, pos):
+        """
+        英語に併記する日本語のテキストを登録する（品質を下げている間は登録しない）
+        
+        Args:
+            text_surface (pygame.Surface): レンダリング済みのテキスト
+            pos (tuple): 描画位置 (x, y)
+        """
+        if self.quality.is_enabled(QUALITY_BILINGUAL_TEXT):
+            self.render_queue.submit(text_surface, pos, RENDER_LAYER_UI)
+
+    def _draw_mood_gauge(self, mood):
+        """
+        うさぎの機嫌ゲージを描画キューに登録する
+        
+        Args:
+            mood (int): 表示する機嫌度
         """
         gauge_width = 200
         gauge_height = 20
         gauge_x = WINDOW_WIDTH - gauge_width - 20
         gauge_y = 20
         
-        # ゲージの背景
-        pygame.draw.rect(screen, WHITE, (gauge_x, gauge_y, gauge_width, gauge_height))
-        pygame.draw.rect(screen, BLACK, (gauge_x, gauge_y, gauge_width, gauge_height), 2)
-        
-        # 現在の機嫌度に応じたゲージ
-        mood_ratio = self.rabbit.get_mood() / 100.0
-        current_width = int(gauge_width * mood_ratio)
+        gauge_surface = self._mood_gauge_cache.get(mood)
+        if gauge_surface is None:
+            gauge_surface = pygame.Surface((gauge_width, gauge_height))
+            
+            # ゲージの背景
+            gauge_surface.fill(WHITE)
+            pygame.draw.rect(gauge_surface, BLACK, (0, 0, gauge_width, gauge_height), 2)
+            
+            # 現在の機嫌度に応じたゲージ
+            mood_ratio = mood / self.rabbit.params.mood_max
+            current_width = int(gauge_width * mood_ratio)
+            
+            # 機嫌度に応じて色を変える
+            if mood_ratio > 0.6:
+                color = GREEN
+            elif mood_ratio > 0.3:
+                color = YELLOW
+            else:
+                color = RED
+            
+            pygame.draw.rect(gauge_surface, color, (0, 0, current_width, gauge_height))
+            self._mood_gauge_cache[mood] = gauge_surface
         
-        # 機嫌度に応じて色を変える
-        if mood_ratio > 0.6:
-            color = GREEN
-        elif mood_ratio > 0.3:
-            color = YELLOW
-        else:
-            color = RED
+        self.render_queue.submit(gauge_surface, (gauge_x, gauge_y), RENDER_LAYER_UI)
         
-        pygame.draw.rect(screen, color, (gauge_x, gauge_y, current_width, gauge_height))
+        # 数値が変わるたびに文字列全体をレンダリングしないよう、グリフアトラスで描画する
+        # （配置は機嫌度が変わった時だけ求め直す）
+        bilingual = self.quality.is_enabled(QUALITY_BILINGUAL_TEXT)
+        if self._mood_label_layout is None or self._mood_label_layout[:2] != (mood, bilingual):
+            layout = self.font_manager.layout_text(f"{GAME_TEXTS['mood']['en']}{mood}", (gauge_x, gauge_y - 50), 24, BLACK, False)
+            if bilingual:
+                layout += self.font_manager.layout_text(f"{GAME_TEXTS['mood']['ja']}{mood}", (gauge_x, gauge_y - 25), 24, BLACK, True)
+            self._mood_label_layout = (mood, bilingual, layout)
+        self.render_queue.submit_many(self._mood_label_layout[2], RENDER_LAYER_UI)
         
-        # ラベル
-        mood_text_en = self.font_manager.render_text(f"{GAME_TEXTS['mood']['en']}{self.rabbit.get_mood()}", 24, BLACK, False)
-        mood_text_ja = self.font_manager.render_text(f"{GAME_TEXTS['mood']['ja']}{self.rabbit.get_mood()}", 24, BLACK, True)
-        screen.blit(mood_text_en, (gauge_x, gauge_y - 50))
-        screen.blit(mood_text_ja, (gauge_x, gauge_y - 25))
+        # ステージ番号
+        self.render_queue.submit_many(self._stage_label_layout, RENDER_LAYER_UI)
@@ -0,0 +1,36 @@
+"""
+シーンレジストリモジュール
+
+シーン名からシーンクラスを取得する。各シーンのモジュールは初めて必要になった時に
+読み込まれるため、起動時にすべてのシーンをインポートする必要がない。
+"""
+import importlib
+from src.utils.constants import SCENE_TITLE, SCENE_GAME, SCENE_RESULT
+
+# シーン名 -> (モジュール名, クラス名)
+SCENE_MODULES = {
+    SCENE_TITLE: ("src.scenes.title_scene", "TitleScene"),
+    SCENE_GAME: ("src.scenes.game_scene", "GameScene"),
+    SCENE_RESULT: ("src.scenes.result_scene", "ResultScene"),
+}
+
+_scene_classes = {}
+
+
+def get_scene_class(scene_name):
+    """
+    シーン名に対応するシーンクラスを取得する（初回のみモジュールを読み込む）
+
+    Args:
+        scene_name (str): シーン名
+
+    Returns:
+        type: シーンクラス
+    """
+    scene_class = _scene_classes.get(scene_name)
+    if scene_class is None:
+        module_name, class_name = SCENE_MODULES[scene_name]
+        module = importlib.import_module(module_name)
+        scene_class = getattr(module, class_name)
+        _scene_classes[scene_name] = scene_class
+    return scene_class
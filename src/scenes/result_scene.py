@@ -1,27 +1,40 @@
 """
 結果シーンを定義するモジュール
 """
+import time
 import pygame
 from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, BLACK, GREEN, RED, SCENE_TITLE, GAME_TEXTS
 from src.utils.font_manager import FontManager
+from src.utils.score_store import ScoreStore, ScoreRecord
+from src.utils.tracer import traced
 
 
 class ResultScene:
     """
     結果シーンを表すクラス
     """
-    def __init__(self, is_clear=False, mood=0):
+    @traced("scene")
+    def __init__(self, is_clear=False, mood=0, clear_time=None, stage_number=1):
         """
         結果シーンの初期化
         
         Args:
             is_clear (bool): ゲームクリアしたかどうか
             mood (int): うさぎの最終的な機嫌度
+            clear_time (float): クリアまでにかかった時間（秒、ゲームオーバーの場合はNone）
+            stage_number (int): プレイしたステージ番号（1から）
         """
         self.is_clear = is_clear
         self.mood = mood
+        self.clear_time = clear_time
+        self.stage_number = stage_number
         self.font_manager = FontManager()
         
+        # 結果を保存して順位を問い合わせる（完了は update で確認し、フレームを待たせない）
+        self.rank_future = ScoreStore().submit_result(
+            ScoreRecord(time.time(), stage_number, is_clear, mood, clear_time))
+        self.rank_texts = None  # 順位が分かったら (英語, 日本語) のテキストを入れる
+        
         # 英語と日本語の両方のテキストを用意
         if self.is_clear:
             self.result_text_en = self.font_manager.render_text(GAME_TEXTS["game_clear"]["en"], 72, GREEN, False)
@@ -67,7 +80,33 @@ class ResultScene:
         Args:
             dt (float): 経過時間（秒）
         """
-        pass
+        if self.rank_texts is None and self.rank_future.done():
+            rank = self.rank_future.result()
+            if rank is None:
+                # クリアしていない場合や保存に失敗した場合は順位を表示しない
+                self.rank_texts = ()
+            else:
+                print(f"Result scene: Rank {rank.rank}, today {rank.day_rank}")
+                self.rank_texts = tuple(
+                    self._render_rank_text(GAME_TEXTS["rank"][lang].format(rank=rank.rank, today=rank.day_rank),
+                                           WINDOW_HEIGHT // 4 + 45 + i * 25, lang == "ja")
+                    for i, lang in enumerate(("en", "ja"))
+                )
+
+    def _render_rank_text(self, text, center_y, use_japanese):
+        """
+        順位のテキストをレンダリングする
+        
+        Args:
+            text (str): 表示するテキスト
+            center_y (int): 表示位置の中心Y座標
+            use_japanese (bool): 日本語フォントを使用するかどうか
+        
+        Returns:
+            tuple: (テキストのサーフェス, 表示位置の矩形)
+        """
+        surface = self.font_manager.render_text(text, 24, BLACK, use_japanese)
+        return (surface, surface.get_rect(center=(WINDOW_WIDTH // 2, center_y)))
 
     def draw(self, screen):
         """
@@ -87,6 +126,11 @@ class ResultScene:
         screen.blit(self.continue_text_en, self.continue_rect_en)
         screen.blit(self.continue_text_ja, self.continue_rect_ja)
         
+        # 順位（問い合わせが終わってから表示する）
+        if self.rank_texts:
+            for text, rect in self.rank_texts:
+                screen.blit(text, rect)
+        
         # うさぎのイラストを描画（4足歩行版）
         rabbit_size = 60
         rabbit_x = WINDOW_WIDTH // 2
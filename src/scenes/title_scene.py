@@ -4,12 +4,14 @@
 import pygame
 from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, BLACK, SCENE_GAME, GAME_TEXTS
 from src.utils.font_manager import FontManager
+from src.utils.tracer import traced
 
 
 class TitleScene:
     """
     タイトルシーンを表すクラス
     """
+    @traced("scene")
     def __init__(self):
         """
         タイトルシーンの初期化
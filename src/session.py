@@ -0,0 +1,256 @@
+"""
+セッション（1人分のシーンの切り替え）を定義するモジュール
+
+1つのプロセス・1つのウィンドウで複数のステーションを同時に動かすため、
+タイトル・ゲーム・結果のシーンの切り替えとステージの進行をセッションとしてまとめる。
+各セッションはウィンドウのサブサーフェスに描画し、自分専用の乱数を持つ。
+フォント・レンダリング済みテキスト・スプライトのキャッシュはクラス属性やシングルトンなので
+すべてのセッションで共有され、セッションを増やしても増えるのはシーンの状態の分だけで済む。
+"""
+import math
+import random
+import sys
+import time
+import pygame
+from src.utils.constants import (
+    FPS, WINDOW_WIDTH, WINDOW_HEIGHT, SCENE_TITLE, SCENE_GAME, SCENE_RESULT, SESSION_SEED
+)
+from src.level import LevelManager
+from src.scenes.registry import get_scene_class
+from src.utils.audio_manager import AudioManager
+from src.utils.display import SurfaceDisplay
+from src.utils.gc_control import GcController
+from src.utils.quality_governor import QualityGovernor
+from src.utils.score_store import ScoreStore
+from src.utils.telemetry import Telemetry
+
+
+def create_scene(scene_name, level_manager, stage_index, game_scene=None, rng=None):
+    """
+    遷移先のシーンを作成する（常に新しいシーンインスタンスを作成する）
+
+    Args:
+        scene_name (str): 遷移先のシーン名
+        level_manager (LevelManager): ステージの一覧
+        stage_index (int): 現在のステージ番号（0から）
+        game_scene (GameScene): 直前のゲームシーン（結果シーンへの遷移で使う）
+        rng (random.Random): ゲームシーンで使う乱数（省略時は random モジュールの共有の乱数）
+
+    Returns:
+        tuple: (作成したシーン, 次に遊ぶステージ番号)
+    """
+    scene_class = get_scene_class(scene_name)
+    if scene_name == SCENE_GAME:
+        level = level_manager.get(stage_index)
+        return scene_class(level, stage_index + 1, rng), stage_index
+    if scene_name == SCENE_RESULT and game_scene is not None:
+        # ゲームシーンからの情報を取得
+        is_clear = game_scene.game_clear
+        mood = game_scene.rabbit.get_mood()
+        scene = scene_class(is_clear, mood, game_scene.clear_time, game_scene.stage_number)
+
+        # クリアしたら次のステージへ進み、結果画面を表示している間に読み込んでおく
+        if is_clear:
+            stage_index = level_manager.next_index(stage_index)
+        level_manager.prefetch(stage_index)
+        return scene, stage_index
+    return scene_class(), stage_index
+
+
+class Session:
+    """
+    1つのステーションのシーンを切り替えながら進めるクラス
+    """
+    def __init__(self, index, surface, level_manager, seed=None):
+        """
+        セッションの初期化（タイトル画面から始める）
+
+        Args:
+            index (int): セッション番号（0から、ログの表示に使う）
+            surface (pygame.Surface): 描画先（ウィンドウのサブサーフェス）
+            level_manager (LevelManager): ステージの一覧（セッション間で共有する）
+            seed (int): 乱数のシード（省略時は毎回異なる）
+        """
+        self.index = index
+        self.surface = surface
+        self.rect = pygame.Rect(surface.get_abs_offset(), surface.get_size())  # ウィンドウ上の範囲
+        self.level_manager = level_manager
+        self.rng = random.Random(seed)
+        self.scenes = {}
+        self.stage_index = 0
+        self.current_scene = None
+        self.scene_changes = 0  # シーンを変更した回数
+        self.change_scene(SCENE_TITLE)
+
+    def change_scene(self, scene_name):
+        """
+        シーンを変更する
+
+        Args:
+            scene_name (str): 変更先のシーン名
+        """
+        print(f"Session {self.index}: Changing scene to: {scene_name}")
+        scene, self.stage_index = create_scene(scene_name, self.level_manager, self.stage_index,
+                                               self.scenes.get(SCENE_GAME), self.rng)
+        self.scenes[scene_name] = scene
+        self.current_scene = scene_name
+        self.scene_changes += 1
+
+    def is_playing(self):
+        """
+        ゲーム中（ゲームオーバー・クリアの前）かどうかを返す
+
+        Returns:
+            bool: ゲーム中ならTrue
+        """
+        if self.current_scene != SCENE_GAME:
+            return False
+        scene = self.scenes[SCENE_GAME]
+        return not (scene.game_over or scene.game_clear)
+
+    def handle_event(self, event):
+        """
+        入力イベントを現在のシーンに渡す（マウスの位置はサブサーフェス内の座標に直す）
+
+        Args:
+            event (pygame.event.Event): 入力イベント
+        """
+        pos = getattr(event, "pos", None)
+        if pos is not None:
+            event = pygame.event.Event(event.type, event.dict, pos=(pos[0] - self.rect.x, pos[1] - self.rect.y))
+        next_scene = self.scenes[self.current_scene].handle_event(event)
+        if next_scene:
+            self.change_scene(next_scene)
+
+    def update(self, dt):
+        """
+        現在のシーンを更新し、要求があればシーンを変更する
+
+        Args:
+            dt (float): 経過時間（秒）
+        """
+        next_scene = self.scenes[self.current_scene].update(dt)
+        if next_scene:
+            self.change_scene(next_scene)
+
+    def draw(self):
+        """
+        現在のシーンを自分のサブサーフェスに描画する
+        """
+        self.scenes[self.current_scene].draw(self.surface)
+
+
+class SessionHost:
+    """
+    1つのウィンドウを分割して複数のセッションを同時に動かすクラス
+
+    ウィンドウ・Clock・ステージの一覧は全セッションで1つだけ持つ。
+    マウスの入力はカーソルがあるセッションへ、キーボードの入力は最後にクリックしたセッションへ渡す。
+    次の機能は1人用の Game にしかなく、ここでは使えない（設定で有効にしても無視される）。
+    途中保存と再開、別スレッドでの更新（THREADED_SIMULATION）、制御ソケット（CONTROL_SOCKET）、
+    共有メモリへの公開（SHARED_STATE_NAME）、トレースの記録（TRACE_ENABLED）、
+    フレームごとの割り当ての計測（ALLOC_TRACE_INTERVAL）。
+    """
+    def __init__(self, count, columns, start_time=None):
+        """
+        ウィンドウとセッションの初期化
+
+        Args:
+            count (int): セッションの数
+            columns (int): 横に並べるセッションの数
+            start_time (float): 起動計測の基準時刻（time.perf_counter()の値、省略時は現在時刻）
+        """
+        self.start_time = start_time if start_time is not None else time.perf_counter()
+        self.first_frame_time = None
+        pygame.display.init()
+        pygame.font.init()
+
+        # サブサーフェスに描画するため、ソフトウェア転送の画面を使う
+        columns = max(1, min(columns, count))
+        rows = math.ceil(count / columns)
+        self.display = SurfaceDisplay((WINDOW_WIDTH * columns, WINDOW_HEIGHT * rows))
+        self.screen = self.display.screen
+        self.clock = pygame.time.Clock()
+        self.running = True
+        self.quality = QualityGovernor()
+        self.gc_control = GcController()
+        self.level_manager = LevelManager()
+        self.level_manager.prefetch(0)
+
+        self.sessions = []
+        for index in range(count):
+            rect = pygame.Rect((index % columns) * WINDOW_WIDTH, (index // columns) * WINDOW_HEIGHT,
+                               WINDOW_WIDTH, WINDOW_HEIGHT)
+            seed = SESSION_SEED + index if SESSION_SEED is not None else None
+            self.sessions.append(Session(index, self.screen.subsurface(rect), self.level_manager, seed))
+        self.focus = self.sessions[0]  # キーボードの入力を渡すセッション
+
+    @property
+    def scene_changes(self):
+        """
+        全セッションでシーンを変更した回数の合計
+        """
+        return sum(session.scene_changes for session in self.sessions)
+
+    def _route_event(self, event):
+        """
+        入力イベントを対象のセッションに渡す
+
+        Args:
+            event (pygame.event.Event): 入力イベント
+        """
+        pos = getattr(event, "pos", None)
+        if pos is not None:
+            for session in self.sessions:
+                if session.rect.collidepoint(pos):
+                    if event.type == pygame.MOUSEBUTTONDOWN:
+                        self.focus = session
+                    session.handle_event(event)
+                    return
+        elif event.type in (pygame.KEYDOWN, pygame.KEYUP):
+            self.focus.handle_event(event)
+
+    def run(self):
+        """
+        すべてのセッションを同じフレームで更新・描画するメインループを実行する
+        """
+        while self.running:
+            dt = self.clock.tick(FPS) / 1000.0  # 経過時間（秒）
+            frame_start = time.perf_counter()
+            scene_changes = self.scene_changes
+            # どれか1つのセッションでもゲーム中なら自動の GC を止めておく
+            self.gc_control.begin_frame(any(session.is_playing() for session in self.sessions))
+
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    self.running = False
+                    break
+                self._route_event(event)
+
+            for session in self.sessions:
+                session.update(dt)
+            for session in self.sessions:
+                session.draw()
+            self.display.present()
+
+            # シーンを作り直したフレームは読み込みを含むため、品質の判断には使わない
+            if self.scene_changes == scene_changes:
+                self.quality.record_frame(time.perf_counter() - frame_start - self.gc_control.explicit_pause, dt)
+            else:
+                self.gc_control.scene_changed()
+
+            # 起動から最初のフレームを表示するまでの時間を記録
+            if self.first_frame_time is None:
+                self.first_frame_time = time.perf_counter() - self.start_time
+                print(f"Time to first frame: {self.first_frame_time * 1000:.1f} ms ({len(self.sessions)} sessions)")
+                AudioManager().play_bgm()
+                self.gc_control.freeze()
+            self.gc_control.end_frame("sessions")
+
+        self.gc_control.close()
+
+        # 溜まっているプレイ記録と結果を書き出してから終了する
+        Telemetry().close()
+        ScoreStore().close()
+        pygame.quit()
+        sys.exit()
@@ -0,0 +1,148 @@
+"""
+シミュレーションのスレッドを定義するモジュール
+
+ゲームシーンの入力処理と更新（プレイヤーの移動、うさぎの振り返り、検出の判定）を
+描画とは別のスレッドで一定の間隔で進める。
+更新のたびにシーンの描画用の状態（変更されない namedtuple）を StateBuffer に公開し、
+メインスレッドは公開された最新の状態を描画する。
+描画と表示（SDL の処理中は GIL を解放する）の間もシミュレーションは進むため、
+複数のコアがある環境では更新と描画が重なって実行される。
+"""
+import threading
+import time
+from collections import deque
+from src.utils.tracer import traced
+
+
+class StateBuffer:
+    """
+    シミュレーションの状態を受け渡すダブルバッファ
+
+    書き込み側は裏の枠に新しい状態を置いてから表と裏を入れ替え、読み込み側は常に表の枠を読む。
+    状態は公開した後に変更しないため、読み込み側はロックの外で自由に参照できる。
+    """
+    def __init__(self):
+        """
+        バッファの初期化
+        """
+        self._slots = [None, None]
+        self._front = 0
+        self._sequence = 0  # 公開した回数
+        self._lock = threading.Lock()
+
+    def publish(self, state):
+        """
+        新しい状態を公開する
+
+        Args:
+            state: 公開する状態（公開後は変更しないこと）
+        """
+        with self._lock:
+            back = 1 - self._front
+            self._slots[back] = state
+            self._front = back
+            self._sequence += 1
+
+    def latest(self):
+        """
+        最新の状態を取得する
+
+        Returns:
+            tuple: (状態, 公開した回数)、まだ公開されていなければ (None, 0)
+        """
+        with self._lock:
+            return self._slots[self._front], self._sequence
+
+
+class SimulationThread:
+    """
+    シーンの入力処理と更新を一定の間隔で行うスレッド
+
+    シーンの状態はこのスレッドだけが変更する。メインスレッドは post_event() で入力を渡し、
+    buffer から描画用の状態を読み、next_scene で遷移先を知る。
+    """
+    def __init__(self, scene, rate, on_tick=None):
+        """
+        スレッドの初期化（start() を呼ぶまで更新は始まらない）
+
+        Args:
+            scene: handle_event(event)・update(dt)・capture_render_state() を持つシーン
+            rate (int): 1秒あたりの更新回数
+            on_tick (callable): 更新のたびにシミュレーションのスレッドで呼び出す関数（引数は経過時間）
+        """
+        self.scene = scene
+        self.step = 1.0 / rate
+        self.on_tick = on_tick
+        self.buffer = StateBuffer()
+        self.next_scene = None  # シーンが遷移を要求した場合の遷移先
+        self.tick_count = 0
+        self._events = deque()
+        self._stopping = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+
+        # 最初のフレームから描画できるよう、開始前の状態を公開しておく
+        self.buffer.publish(scene.capture_render_state())
+
+    def start(self):
+        """
+        更新を開始する
+        """
+        self._thread.start()
+
+    def post_event(self, event):
+        """
+        入力イベントを次の更新で処理するよう渡す
+
+        Args:
+            event (pygame.event.Event): 入力イベント
+        """
+        self._events.append(event)
+
+    @traced("simulation")
+    def _tick(self):
+        """
+        溜まった入力を処理してシーンを1回更新し、描画用の状態を公開する
+
+        Returns:
+            str or None: 遷移先のシーン名、遷移しない場合はNone
+        """
+        scene = self.scene
+        events = self._events
+        next_scene = None
+        while events and next_scene is None:
+            next_scene = scene.handle_event(events.popleft())
+        if next_scene is None:
+            next_scene = scene.update(self.step)
+        if self.on_tick is not None:
+            self.on_tick(self.step)
+        self.buffer.publish(scene.capture_render_state())
+        self.tick_count += 1
+        return next_scene
+
+    def _run(self):
+        """
+        一定の間隔で更新を繰り返す（シミュレーションのスレッド）
+
+        処理が遅れた場合は遅れを取り戻すまで待たずに更新し、大きく遅れた場合は遅れを切り捨てる。
+        """
+        next_time = time.perf_counter()
+        while not self._stopping.is_set():
+            next_scene = self._tick()
+            if next_scene:
+                self.next_scene = next_scene
+                return
+
+            next_time += self.step
+            delay = next_time - time.perf_counter()
+            if delay > 0:
+                self._stopping.wait(delay)
+            elif delay < -self.step * 5:
+                next_time = time.perf_counter()
+
+    def stop(self):
+        """
+        更新を止め、スレッドの終了を待つ（以降はメインスレッドからシーンを参照してよい）
+        """
+        self._stopping.set()
+        if self._thread.is_alive():
+            self._thread.join(timeout=2.0)
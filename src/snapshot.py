@@ -0,0 +1,242 @@
+"""
+ゲームの途中状態（スナップショット）の保存と復元を定義するモジュール
+
+スナップショットは次の形式のバイト列とする。
+
+    ヘッダー（_HEADER: マジック, バージョン, 本体のCRC32）
+    シーンの状態（_SCENE）
+    エンティティストアのコンポーネント配列（EntityStore.dump_components()）
+
+ゲームシーンの状態はすべて固定長の値とエンティティストアの配列にあるため、
+数百バイトのバイト列への変換と復元は数マイクロ秒で済む。
+"""
+import math
+import os
+import struct
+import threading
+import zlib
+from collections import namedtuple
+
+SNAPSHOT_MAGIC = b"NUSS"
+SNAPSHOT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHI")
+
+# ステージ番号, セッションID, ゲームオーバー, クリア, 警告表示中,
+# 結果表示までのタイマー, 警告表示のタイマー, 経過時間, クリア時間（クリア前はNaN）,
+# 足音のタイマー, 土ぼこりのタイマー, クリック回数
+_SCENE = struct.Struct("<H12s???ddddddI")
+
+GameSnapshot = namedtuple("GameSnapshot", [
+    "stage_number",  # ステージ番号（1から）
+    "session_id",  # プレイ記録のセッションID
+    "game_over",
+    "game_clear",
+    "warning_visible",
+    "result_timer",
+    "warning_timer",
+    "play_time",
+    "clear_time",  # クリア前はNone
+    "footstep_timer",
+    "dust_timer",
+    "click_count",
+    "components",  # エンティティストアのコンポーネント配列のバイト列
+])
+
+
+class SnapshotError(Exception):
+    """
+    スナップショットの形式が不正な場合の例外
+    """
+
+
+def encode_snapshot(scene):
+    """
+    ゲームシーンの状態をスナップショットのバイト列にする
+
+    Args:
+        scene (GameScene): 保存するゲームシーン
+
+    Returns:
+        bytes: スナップショット
+    """
+    # スケジューラが管理しているタイマーの残り時間を属性に書き込んでから保存する
+    scene.sync_timers()
+    body = _SCENE.pack(
+        scene.stage_number, scene.session_id.encode("ascii"),
+        scene.game_over, scene.game_clear, scene.warning_visible,
+        scene.result_timer, scene.warning_timer, scene.play_time,
+        math.nan if scene.clear_time is None else scene.clear_time,
+        scene.footstep_timer, scene.dust_timer, scene.click_count
+    ) + scene.entity_store.dump_components()
+    return _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, zlib.crc32(body)) + body
+
+
+def decode_snapshot(data):
+    """
+    スナップショットのバイト列を読み込む
+
+    Args:
+        data (bytes): スナップショット
+
+    Returns:
+        GameSnapshot: 読み込んだ状態
+
+    Raises:
+        SnapshotError: 形式が不正な場合
+    """
+    if len(data) < _HEADER.size + _SCENE.size:
+        raise SnapshotError("Snapshot too short")
+    magic, version, checksum = _HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise SnapshotError("Not a snapshot")
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+    body = memoryview(data)[_HEADER.size:]
+    if zlib.crc32(body) != checksum:
+        raise SnapshotError("Snapshot checksum mismatch")
+
+    fields = list(_SCENE.unpack_from(body, 0))
+    fields[1] = fields[1].decode("ascii")
+    if math.isnan(fields[8]):
+        fields[8] = None
+    return GameSnapshot(*fields, body[_SCENE.size:])
+
+
+def apply_snapshot(snapshot, scene):
+    """
+    スナップショットの状態をゲームシーンに反映する
+
+    シーンは同じステージで新しく作ったものを渡す（エンティティの構成が一致している必要がある）。
+
+    Args:
+        snapshot (GameSnapshot): 読み込んだ状態
+        scene (GameScene): 反映先のゲームシーン
+
+    Raises:
+        SnapshotError: エンティティの構成が一致しない場合
+    """
+    try:
+        scene.entity_store.load_components(snapshot.components)
+    except ValueError as e:
+        raise SnapshotError(str(e)) from e
+
+    scene.session_id = snapshot.session_id
+    scene.game_over = snapshot.game_over
+    scene.game_clear = snapshot.game_clear
+    scene.warning_visible = snapshot.warning_visible
+    scene.result_timer = snapshot.result_timer
+    scene.warning_timer = snapshot.warning_timer
+    scene.play_time = snapshot.play_time
+    scene.clear_time = snapshot.clear_time
+    scene.footstep_timer = snapshot.footstep_timer
+    scene.dust_timer = snapshot.dust_timer
+    scene.click_count = snapshot.click_count
+    scene.resume_timers()
+
+
+def read_snapshot_file(path):
+    """
+    スナップショットのファイルを読み込む
+
+    Args:
+        path (str): ファイルのパス
+
+    Returns:
+        GameSnapshot or None: 読み込んだ状態、ファイルがないか不正な場合はNone
+    """
+    try:
+        with open(path, "rb") as f:
+            return decode_snapshot(f.read())
+    except FileNotFoundError:
+        return None
+    except (OSError, SnapshotError) as e:
+        print(f"Ignoring snapshot {path}: {e}")
+        return None
+
+
+class SnapshotWriter:
+    """
+    スナップショットをバックグラウンドのスレッドでファイルへ書き出すクラス
+
+    書き出しが追いつかない場合は最新のスナップショットだけを書き出す。
+    書き出しは一時ファイルへ書いてから置き換えるため、途中で終了しても壊れたファイルは残らない。
+    """
+    def __init__(self, path):
+        """
+        書き出しの初期化
+
+        Args:
+            path (str): スナップショットのファイルのパス
+        """
+        self.path = path
+        self._pending = None  # 次に書き出すバイト列（Noneなら何もしない、b""ならファイルを削除する）
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="snapshot-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, data):
+        """
+        スナップショットの書き出しを依頼する（すぐ戻る）
+
+        Args:
+            data (bytes): スナップショット
+        """
+        with self._lock:
+            self._pending = data
+        self._wakeup.set()
+
+    def discard(self):
+        """
+        保存済みのスナップショットを削除する（ゲームが終わった時など）
+        """
+        self.submit(b"")
+
+    def _write(self, data):
+        """
+        スナップショットをファイルへ書き出す、または削除する
+
+        Args:
+            data (bytes): スナップショット（空ならファイルを削除する）
+        """
+        try:
+            if not data:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"Failed to write snapshot: {e}")
+
+    def _run(self):
+        """
+        依頼されたスナップショットを書き出す（バックグラウンドのスレッド）
+        """
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            stopping = self._stopping
+            with self._lock:
+                data, self._pending = self._pending, None
+            if data is not None:
+                self._write(data)
+            if stopping:
+                return
+
+    def close(self):
+        """
+        残っている依頼を書き出してからスレッドを終了する
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout=2.0)
@@ -0,0 +1,277 @@
+"""
+フレームごとのメモリ割り当て計測モジュール
+
+tracemalloc を使い、1フレームの間に Python のメモリアロケータで確保された量を計測する。
+毎フレームの計測は軽い値（ピーク量と、メモリ量・ブロック数の増減）だけにし、呼び出し元ごとの内訳と
+その時点で残っているブロック数（オブジェクト数）はレポートを出すフレームでのみスナップショットを取って求める。
+一時オブジェクトはフレームの終わりには解放されているため、シーンが描画キューを転送する直前など
+フレーム内で一時オブジェクトが最も多く残っている箇所で checkpoint() を呼んで内訳を取る。
+
+Surface のピクセルデータのように SDL が確保するメモリは tracemalloc からは見えないが、
+Surface オブジェクト自体やタプル・リストなどの一時オブジェクトは計測できる。
+"""
+import fnmatch
+import os
+import re
+import sys
+import tracemalloc
+from collections import namedtuple
+from src.utils.constants import ALLOC_TRACE_INTERVAL, ALLOC_TRACE_TOP, ALLOC_TRACE_DEPTH, ALLOC_FRAME_BUDGET
+
+# 1フレームの計測結果
+FrameAllocation = namedtuple("FrameAllocation", [
+    "peak_bytes",  # フレーム開始時点から増えたメモリ量の最大値（一時オブジェクトを含む）
+    "net_bytes",  # フレーム終了時点で残っているメモリ量の増減
+    "net_blocks",  # フレーム終了時点で残っているメモリブロック数の増減
+    "peak_blocks",  # 内訳を求めた時点で残っていた、フレーム開始後に確保されたブロック数（レポート時のみ、それ以外は0）
+    "top",  # 呼び出し元ごとの内訳 (ファイル:行, 増えた量, 増えた数) のリスト（レポート時のみ）
+])
+
+# 内訳を求めている最中の計測（checkpoint() で参照する）
+_active_tracker = None
+
+# 計測自体による割り当て（フィルタのパターン変換を含む）は内訳から除く
+_FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, fnmatch.__file__),
+    tracemalloc.Filter(False, os.path.join(os.path.dirname(re.__file__), "*")),
+)
+
+
+def checkpoint():
+    """
+    内訳を求めているフレームであれば、この時点で残っている割り当てを記録する
+
+    計測していない時は何もしないので、描画処理の途中に置いたままでよい。
+    """
+    if _active_tracker is not None:
+        _active_tracker._checkpoint()
+
+
+class AllocationTracker:
+    """
+    シーンごとにフレームあたりのメモリ割り当てを集計するクラス
+    """
+    def __init__(self, report_interval=ALLOC_TRACE_INTERVAL, top_count=ALLOC_TRACE_TOP,
+                 depth=ALLOC_TRACE_DEPTH):
+        """
+        計測の初期化
+
+        Args:
+            report_interval (int): レポートを表示する間隔（フレーム数、0で表示しない）
+            top_count (int): レポートに載せる呼び出し元の数
+            depth (int): 呼び出し元として記録するスタックの深さ
+        """
+        self.report_interval = report_interval
+        self.top_count = top_count
+        self.depth = depth
+        self.frame_count = 0
+        # シーン名 -> [フレーム数, ピーク量の合計, ピーク量の最大, 増減の合計, ブロック数の増減の合計,
+        #             内訳を求めたフレーム数, 残っていたブロック数の合計, 残っていたブロック数の最大]
+        self.stats = {}
+        self._start_memory = 0
+        self._start_blocks = 0
+        self._start_snapshot = None
+        self._top = []
+        self._top_size = 0
+        self._top_blocks = 0
+        self._peak = 0
+        self._started_tracing = False
+
+    def start(self):
+        """
+        tracemalloc による記録を開始する
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.depth)
+            self._started_tracing = True
+
+    def stop(self):
+        """
+        自分で開始した tracemalloc の記録を終了する
+        """
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def _is_report_frame(self):
+        """
+        次のフレームがレポートを表示するフレームかどうかを返す
+
+        Returns:
+            bool: レポートするならTrue
+        """
+        return bool(self.report_interval) and (self.frame_count + 1) % self.report_interval == 0
+
+    def begin_frame(self, detail=None):
+        """
+        フレームの計測を開始する
+
+        Args:
+            detail (bool): 呼び出し元ごとの内訳を求めるかどうか（省略時はレポートするフレームのみ）
+        """
+        global _active_tracker
+        if detail is None:
+            detail = self._is_report_frame()
+        self._top = []
+        self._top_size = 0
+        self._top_blocks = 0
+        self._peak = 0
+        if detail:
+            self._start_snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+            _active_tracker = self
+        else:
+            self._start_snapshot = None
+        tracemalloc.reset_peak()
+        self._start_memory = tracemalloc.get_traced_memory()[0]
+        self._start_blocks = sys.getallocatedblocks()
+
+    def _checkpoint(self):
+        """
+        フレーム開始時点から増えている割り当てを呼び出し元ごとに求め、最も多い時点の内訳を残す
+        """
+        # スナップショット自体の割り当てでピーク量が増えないよう、先にピーク量を控えておく
+        self._peak = max(self._peak, tracemalloc.get_traced_memory()[1])
+        snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+        stats = [stat for stat in snapshot.compare_to(self._start_snapshot, "lineno") if stat.size_diff > 0]
+        total = sum(stat.size_diff for stat in stats)
+        if total > self._top_size:
+            self._top_size = total
+            self._top_blocks = sum(stat.count_diff for stat in stats if stat.count_diff > 0)
+            self._top = [
+                (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff, stat.count_diff)
+                for stat in stats[:self.top_count]
+            ]
+        del snapshot, stats
+        tracemalloc.reset_peak()
+
+    def end_frame(self, scene_name):
+        """
+        フレームの計測を終了して集計する
+
+        Args:
+            scene_name (str): このフレームで処理したシーン名
+
+        Returns:
+            FrameAllocation: このフレームの計測結果
+        """
+        global _active_tracker
+        net_blocks = sys.getallocatedblocks() - self._start_blocks
+        current, peak = tracemalloc.get_traced_memory()
+        peak = max(peak, self._peak)
+        detailed = self._start_snapshot is not None
+        if detailed:
+            self._checkpoint()
+            self._start_snapshot = None
+            _active_tracker = None
+
+        result = FrameAllocation(peak - self._start_memory, current - self._start_memory, net_blocks,
+                                 self._top_blocks, self._top)
+
+        stats = self.stats.setdefault(scene_name, [0, 0, 0, 0, 0, 0, 0, 0])
+        stats[0] += 1
+        stats[1] += result.peak_bytes
+        stats[2] = max(stats[2], result.peak_bytes)
+        stats[3] += result.net_bytes
+        stats[4] += result.net_blocks
+        if detailed:
+            stats[5] += 1
+            stats[6] += result.peak_blocks
+            stats[7] = max(stats[7], result.peak_blocks)
+
+        self.frame_count += 1
+        if self.report_interval and self.frame_count % self.report_interval == 0:
+            self.report(scene_name, result)
+        return result
+
+    def report(self, scene_name, last_frame=None):
+        """
+        シーンの集計結果を表示する
+
+        Args:
+            scene_name (str): シーン名
+            last_frame (FrameAllocation): 内訳を表示するフレームの計測結果
+        """
+        (frames, peak_total, peak_max, net_total, net_blocks_total,
+         detailed, peak_blocks_total, peak_blocks_max) = self.stats.get(scene_name, (0,) * 8)
+        if not frames:
+            return
+        print(f"Allocations [{scene_name}]: {frames} frames, peak {peak_total / frames:.0f} B/frame "
+              f"(max {peak_max} B), net {net_total / frames:+.0f} B/frame, "
+              f"{net_blocks_total / frames:+.1f} blocks/frame")
+        if detailed:
+            print(f"  blocks live at peak: {peak_blocks_total / detailed:.0f}/frame (max {peak_blocks_max}) "
+                  f"over {detailed} detailed frame(s)")
+        if last_frame is not None:
+            for site, size, count in last_frame.top:
+                print(f"  {site}: {size:+d} B, {count:+d} blocks")
+
+
+def measure_frame_allocations(scene, screen, frames=60, warmup=30, dt=1 / 60):
+    """
+    シーンの update と draw を繰り返し、フレームごとのメモリ割り当てを計測する
+
+    最初の warmup フレームはキャッシュを温めるために計測しない。
+
+    Args:
+        scene: update(dt) と draw(screen) を持つシーン
+        screen (pygame.Surface): 描画対象の画面
+        frames (int): 計測するフレーム数
+        warmup (int): 計測前に進めるフレーム数
+        dt (float): 1フレームの経過時間（秒）
+
+    Returns:
+        list: FrameAllocation のリスト（内訳と残っていたブロック数は最もピーク量が大きかったフレームのみ）
+    """
+    for _ in range(warmup):
+        scene.update(dt)
+        scene.draw(screen)
+
+    tracker = AllocationTracker(report_interval=0)
+    tracker.start()
+    try:
+        results = []
+        for _ in range(frames):
+            tracker.begin_frame(detail=False)
+            scene.update(dt)
+            scene.draw(screen)
+            results.append(tracker.end_frame("measure"))
+
+        # 最もピーク量が大きかったフレームと同じ条件でもう1フレーム進め、内訳を求める
+        worst = max(range(len(results)), key=lambda i: results[i].peak_bytes)
+        tracker.begin_frame(detail=True)
+        scene.update(dt)
+        scene.draw(screen)
+        detail = tracker.end_frame("measure")
+        results[worst] = results[worst]._replace(peak_blocks=detail.peak_blocks, top=detail.top)
+    finally:
+        tracker.stop()
+    return results
+
+
+def assert_allocation_budget(scene, screen, budget_bytes=ALLOC_FRAME_BUDGET, frames=60, warmup=30, dt=1 / 60):
+    """
+    定常状態のフレームのメモリ割り当てが予算内に収まっていることを確認する（テスト用）
+
+    Args:
+        scene: update(dt) と draw(screen) を持つシーン
+        screen (pygame.Surface): 描画対象の画面
+        budget_bytes (int): 1フレームあたりのピーク量の上限（バイト、省略時は ALLOC_FRAME_BUDGET）
+        frames (int): 計測するフレーム数
+        warmup (int): 計測前に進めるフレーム数
+        dt (float): 1フレームの経過時間（秒）
+
+    Returns:
+        list: FrameAllocation のリスト
+
+    Raises:
+        AssertionError: 予算を超えたフレームがあった場合
+    """
+    results = measure_frame_allocations(scene, screen, frames, warmup, dt)
+    worst = max(results, key=lambda result: result.peak_bytes)
+    if worst.peak_bytes > budget_bytes:
+        sites = "\n".join(f"  {site}: {size:+d} B, {count:+d} blocks" for site, size, count in worst.top)
+        raise AssertionError(
+            f"Frame allocated {worst.peak_bytes} B (budget {budget_bytes} B)\n{sites}")
+    return results
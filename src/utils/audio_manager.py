@@ -0,0 +1,143 @@
+"""
+サウンド管理モジュール
+"""
+import os
+import time
+import pygame
+from src.utils.constants import (
+    AUDIO_FREQUENCY, AUDIO_BUFFER, AUDIO_CHANNELS, SOUND_EFFECTS,
+    BGM_FILE, BGM_VOLUME, SOUNDS_DIR
+)
+
+
+class AudioManager:
+    """
+    サウンド管理クラス
+
+    効果音は起動時に pygame.mixer.Sound として読み込んでおき、確保したチャンネルの中から
+    空いているものに割り当てて再生する。空きがない場合は最も古く再生を始めたチャンネルを奪う。
+    BGMは pygame.mixer.music でストリーミング再生し、全体をメモリに展開しない。
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, sounds_dir=SOUNDS_DIR):
+        if cls._instance is None:
+            cls._instance = super(AudioManager, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, sounds_dir=SOUNDS_DIR):
+        """
+        サウンド管理の初期化（最初の呼び出しのみ有効）
+
+        Args:
+            sounds_dir (str): 効果音とBGMのファイルがあるディレクトリ
+        """
+        if AudioManager._initialized:
+            return
+
+        self.sounds_dir = sounds_dir
+        self.enabled = False
+        self.sounds = {}
+        self.channels = []
+        self._channel_started = []
+        self._init_mixer()
+        if self.enabled:
+            self._load_sounds()
+        AudioManager._initialized = True
+
+    def _init_mixer(self):
+        """
+        ミキサーを初期化し、効果音用のチャンネルを確保する
+        """
+        try:
+            if not pygame.mixer.get_init():
+                pygame.mixer.init(frequency=AUDIO_FREQUENCY, buffer=AUDIO_BUFFER)
+        except pygame.error as e:
+            # オーディオデバイスがない環境では無音で続行する
+            print(f"Audio disabled: {e}")
+            return
+
+        pygame.mixer.set_num_channels(AUDIO_CHANNELS)
+        self.channels = [pygame.mixer.Channel(i) for i in range(AUDIO_CHANNELS)]
+        self._channel_started = [0.0] * AUDIO_CHANNELS
+        self.enabled = True
+
+    def _load_sounds(self):
+        """
+        効果音を事前に読み込む
+        """
+        for name, file_name in SOUND_EFFECTS.items():
+            path = os.path.join(self.sounds_dir, file_name)
+            if not os.path.exists(path):
+                print(f"Sound effect not found: {path}")
+                continue
+            try:
+                self.sounds[name] = pygame.mixer.Sound(path)
+            except pygame.error as e:
+                print(f"Failed to load sound effect: {path} ({e})")
+
+    def _acquire_channel(self):
+        """
+        効果音を再生するチャンネルを取得する
+
+        Returns:
+            int: チャンネル番号
+        """
+        for index, channel in enumerate(self.channels):
+            if not channel.get_busy():
+                return index
+
+        # 空きがない場合は最も古く再生を始めたチャンネルを奪う
+        return min(range(len(self.channels)), key=self._channel_started.__getitem__)
+
+    def play_effect(self, name, volume=1.0):
+        """
+        効果音を再生する（再生の開始を待たずにすぐ戻る）
+
+        Args:
+            name (str): 効果音名（SOUND_EFFECTS のキー）
+            volume (float): 音量（0.0〜1.0）
+        """
+        sound = self.sounds.get(name)
+        if sound is None:
+            return
+
+        index = self._acquire_channel()
+        channel = self.channels[index]
+        channel.stop()
+        channel.set_volume(volume)
+        channel.play(sound)
+        self._channel_started[index] = time.monotonic()
+
+    def play_bgm(self, file_name=BGM_FILE, loops=-1, fade_ms=500):
+        """
+        BGMをストリーミング再生する
+
+        Args:
+            file_name (str): sounds_dir 内のBGMファイル名
+            loops (int): 繰り返し回数（-1で無限ループ）
+            fade_ms (int): フェードインの時間（ミリ秒）
+        """
+        if not self.enabled:
+            return
+        path = os.path.join(self.sounds_dir, file_name)
+        if not os.path.exists(path):
+            print(f"BGM not found: {path}")
+            return
+        try:
+            pygame.mixer.music.load(path)
+            pygame.mixer.music.set_volume(BGM_VOLUME)
+            pygame.mixer.music.play(loops, fade_ms=fade_ms)
+        except pygame.error as e:
+            print(f"Failed to play BGM: {path} ({e})")
+
+    def stop_bgm(self, fade_ms=500):
+        """
+        BGMを停止する
+
+        Args:
+            fade_ms (int): フェードアウトの時間（ミリ秒）
+        """
+        if self.enabled:
+            pygame.mixer.music.fadeout(fade_ms)
@@ -7,6 +7,40 @@ WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 WINDOW_TITLE = "Rabbit Petting Game"  # 英語タイトルに変更
 FPS = 60
+SESSION_COUNT = 1  # 1つのウィンドウで同時に動かすステーションの数（2以上でウィンドウを分割する）
+SESSION_COLUMNS = 2  # ウィンドウを分割する時に横に並べる数
+SESSION_SEED = None  # セッションごとの乱数のシード（セッション番号を足して使う、Noneなら毎回異なる）
+
+# 描画設定
+DISPLAY_BACKEND = "surface"  # 描画バックエンド（"surface": ソフトウェア転送, "renderer": SDL2 のテクスチャ合成）
+RENDER_LAYER_BACKGROUND = 0  # 背景
+RENDER_LAYER_VIEW_CONE = 5  # うさぎの視界
+RENDER_LAYER_ENTITY = 10  # プレイヤーやうさぎ
+RENDER_LAYER_EFFECT = 15  # パーティクル
+RENDER_LAYER_UI = 20  # ゲージやテキスト
+RENDER_STATS_INTERVAL = 0  # 描画統計を表示する間隔（フレーム数、0で表示しない）
+
+# 描画品質の自動調整設定
+ADAPTIVE_QUALITY = True  # フレームの処理時間が予算（1 / FPS）を超える間は省略できる描画を止めるかどうか
+QUALITY_FEATURES = (  # 品質を下げる時に止める描画（この順に止め、逆の順に戻す）
+    "view_cone", "particles", "rabbit_status", "bilingual_text", "text_antialias",
+)
+QUALITY_WINDOW = 60  # 品質を判断する処理時間の平均をとるフレーム数
+QUALITY_DOWNGRADE_RATIO = 1.0  # 平均が予算のこの割合を超えたら品質を1段階下げる
+QUALITY_UPGRADE_RATIO = 0.6  # 平均が予算のこの割合を下回ったら品質を1段階上げる
+QUALITY_UPGRADE_DELAY = 3.0  # 品質を変えてから上げるまでに待つ時間（秒、上げた直後に下げた場合は倍にする）
+QUALITY_STABLE_TIME = 30.0  # 下げずに済んだ状態がこの時間続くたびに、延ばした待ち時間を半分に戻す（秒）
+
+# メモリ割り当て計測設定（デバッグ用）
+ALLOC_TRACE_INTERVAL = 0  # フレームごとの割り当てを計測してレポートする間隔（フレーム数、0で計測しない）
+ALLOC_TRACE_TOP = 10  # レポートに載せる呼び出し元の数
+ALLOC_TRACE_DEPTH = 1  # 呼び出し元として記録するスタックの深さ
+ALLOC_FRAME_BUDGET = 8192  # 定常状態のゲームシーン1フレームあたりの割り当ての上限（バイト）
+
+# ガベージコレクション（GC）設定
+GC_CONTROL = True  # 起動時のオブジェクトを凍結し、ゲーム中は自動の GC を止めて安全な時点で回収するかどうか
+GC_YOUNG_LIMIT = 10000  # ゲーム中でも未回収のオブジェクトがこの数を超えたら若い世代だけを回収する
+GC_REPORT_INTERVAL = 0  # GC で止まった時間を表示する間隔（フレーム数、0で終了時のみ）
 
 # 色の定義
 WHITE = (255, 255, 255)
@@ -21,6 +55,7 @@ BACKGROUND_COLOR = (200, 230, 200)  # 薄い緑色の背景
 FONT_NAME = None  # デフォルトフォント
 # 日本語フォントの候補（システムに存在するものを使用）
 JAPANESE_FONTS = ['IPAGothic', 'IPAPGothic', 'MS Gothic', 'Yu Gothic', 'Noto Sans CJK JP', 'Meiryo', 'TakaoGothic']
+GLYPH_ATLAS_PAGE_SIZE = 512  # グリフアトラス1ページの一辺（ピクセル）
 
 # プレイヤー設定
 PLAYER_SPEED = 3
@@ -36,10 +71,33 @@ RABBIT_VIEW_DISTANCE = 200  # うさぎの視界距離
 RABBIT_TURN_MIN_TIME = 3  # うさぎが振り返るまでの最小時間（秒）
 RABBIT_TURN_MAX_TIME = 8  # うさぎが振り返るまでの最大時間（秒）
 RABBIT_LOOKING_TIME = 2  # うさぎが振り返っている時間（秒）
+RABBIT_HEARING_DISTANCE = 160  # うさぎが足音を聞き取れる距離（遮蔽物による減衰を含めた実効距離）
+RABBIT_HEARING_REACTION_TIME = 0.5  # そっぽを向いている間に足音に気づいてから振り返るまでの時間（秒）
+SHOW_VIEW_CONE = False  # こちらを向いているうさぎの視界を表示するかどうか（ゲーム中はVキーで切り替え）
+VIEW_CONE_COLOR = (255, 80, 80)  # 視界の色
+VIEW_CONE_ALPHA = 50  # 視界の塗りの不透明度
+VIEW_CONE_EDGE_ALPHA = 110  # 視界の縁の不透明度
+VIEW_CONE_STEP = 2  # 視界の弧を多角形で近似する時の1辺あたりの角度（度）
+
+# グリッド設定（音の伝搬や経路探索に使用）
+GRID_CELL_SIZE = 20  # グリッド1マスの大きさ（ピクセル）
+
+# ステージ設定
+OBSTACLE_COLOR = (110, 150, 90)  # 障害物（茂み）の色
+OBSTACLE_BORDER_COLOR = (70, 110, 60)  # 障害物の縁の色
+OBSTACLE_ABSORPTION = 4.0  # 障害物による足音の吸収率
+TILE_COLORS = {  # 背景タイルの番号 -> 色
+    0: (200, 230, 200),  # 草地
+    1: (185, 220, 180),  # 濃い草地
+    2: (225, 210, 170),  # 土の道
+    3: (215, 235, 205),  # 花畑
+}
 
 # ゲーム設定
 PETTING_DISTANCE = 50  # うさぎを撫でられる距離
 MOOD_DECREASE = 15  # 発見されたときの機嫌度減少量（20から15に減少）
+THREADED_SIMULATION = False  # ゲーム中の更新を描画とは別のスレッドで行うかどうか
+SIMULATION_RATE = 60  # 別スレッドで更新する場合の1秒あたりの更新回数
 
 # シーン識別子
 SCENE_TITLE = "title"
@@ -50,6 +108,58 @@ SCENE_RESULT = "result"
 ASSETS_DIR = "assets"
 IMAGES_DIR = f"{ASSETS_DIR}/images"
 SOUNDS_DIR = f"{ASSETS_DIR}/sounds"
+LEVELS_DIR = f"{ASSETS_DIR}/levels"
+LEVEL_FILE_EXTENSION = ".nlv"
+DATA_DIR = "data"  # プレイ記録などの書き出し先
+
+# サウンド設定
+AUDIO_FREQUENCY = 44100  # サンプリング周波数
+AUDIO_BUFFER = 512  # ミキサーのバッファサイズ（小さいほど遅延が少ない）
+AUDIO_CHANNELS = 8  # 効果音用に確保するチャンネル数
+SOUND_EFFECTS = {  # 効果音名 -> SOUNDS_DIR内のファイル名
+    "footstep": "footstep.wav",
+    "found": "found.wav",
+    "pet": "pet.wav",
+}
+BGM_FILE = "bgm.ogg"  # SOUNDS_DIR内のBGMファイル名
+BGM_VOLUME = 0.5
+FOOTSTEP_INTERVAL = 0.35  # 足音を鳴らす間隔（秒）
+
+# パーティクル設定
+PARTICLE_BUDGET = 768  # 同時に存在できるパーティクルの最大数（超えた場合は古いものから再利用、1フレーム1ms以内に収まる数）
+PARTICLE_FADE_LEVELS = 8  # フェードアウトの段階数（段階ごとにスプライトを用意する）
+DUST_INTERVAL = 0.08  # 移動中に土ぼこりを出す間隔（秒）
+HEART_COLOR = (255, 110, 150)
+DUST_COLOR = (170, 150, 110)
+SPARK_COLOR = (255, 200, 0)
+
+# プレイ記録（テレメトリ）設定
+TELEMETRY_FILE = f"{DATA_DIR}/telemetry.jsonl"
+TELEMETRY_BUFFER_SIZE = 10000  # メモリ上に溜めておけるイベントの最大数（超えた分は古いものから捨てる）
+TELEMETRY_BATCH_SIZE = 256  # この数だけ溜まったら書き出し間隔を待たずに書き出す
+TELEMETRY_FLUSH_INTERVAL = 2.0  # 書き出す間隔（秒）
+
+# 順位表設定
+SCORE_DB_FILE = f"{DATA_DIR}/scores.db"
+
+# 途中保存設定
+SNAPSHOT_FILE = f"{DATA_DIR}/autosave.snap"
+AUTOSAVE_INTERVAL = 1.0  # ゲーム中に自動保存する間隔（秒）
+
+# 制御ソケット設定（テスト用のボットや QA ツールから操作する）
+CONTROL_SOCKET = None  # JSON-RPC を受け付ける Unix ドメインソケットのパス（None で無効、例: f"{DATA_DIR}/control.sock"）
+CONTROL_STEP_MAX_FRAMES = 3600  # step で1回に進められるフレーム数の上限（メインループを止めすぎないため）
+
+# 処理時間のトレース設定（開発用）
+TRACE_ENABLED = False  # 起動時から区間を記録するかどうか（終了時と F9 キーで TRACE_FILE に書き出す）
+TRACE_BUFFER_SIZE = 200000  # 保持する区間の最大数（超えた分は古いものから上書きする）
+TRACE_FILE = f"{DATA_DIR}/trace.json"  # Chrome Trace Event 形式の書き出し先
+
+# 共有メモリへの状態の公開設定（配信用のオーバーレイや分析用の外部プロセスから読む）
+SHARED_STATE_NAME = None  # 共有メモリのブロックの名前（None で無効、例: "nade_usagi_state"）
+
+# フォントのグリフ対応表設定
+FONT_COVERAGE_FILE = f"{DATA_DIR}/font_coverage.json"  # フォントごとの対応文字の範囲のキャッシュ
 
 # ゲームテキスト（英語と日本語の両方を用意）
 GAME_TEXTS = {
@@ -85,6 +195,14 @@ GAME_TEXTS = {
         "en": "Mood: ",
         "ja": "機嫌度: "
     },
+    "stage": {
+        "en": "Stage ",
+        "ja": "ステージ "
+    },
+    "rank": {
+        "en": "Rank #{rank} (Today #{today})",
+        "ja": "{rank}位（今日の{today}位）"
+    },
     "click_to_title": {
         "en": "Click to return to title",
         "ja": "クリックしてタイトルに戻る"
@@ -0,0 +1,262 @@
+"""
+画面（描画バックエンド）モジュール
+
+シーンは常に pygame.Surface の画面へ描画し、どのバックエンドで表示しているかは意識しない。
+
+- SurfaceDisplay: pygame.display.set_mode の画面へソフトウェアで転送する（従来の方式）
+- RendererDisplay: pygame._sdl2.video の Renderer でテクスチャを合成する
+
+RendererDisplay では、描画キューの一括転送（画面の blits()）をテクスチャの合成に置き換える。
+スプライトやキャッシュ済みのテキストは初回の転送時に一度だけテクスチャへアップロードし、
+以降は Renderer 上でテクスチャを並べるだけで画面を組み立てる。
+塗りつぶしや図形の描画など、それ以外の描画はキャンバス（ソフトウェアのサーフェス）に行い、
+フレームごとに1枚のテクスチャとして一番奥に合成する。
+"""
+import time
+from weakref import WeakKeyDictionary
+import pygame
+from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, WINDOW_TITLE
+
+# 描画バックエンドの種類
+DISPLAY_BACKEND_SURFACE = "surface"
+DISPLAY_BACKEND_RENDERER = "renderer"
+
+# サーフェス -> 内容の版（テクスチャに反映済みかどうかの判定に使う）
+_revisions = WeakKeyDictionary()
+
+
+def invalidate_texture(surface):
+    """
+    サーフェスの内容を書き換えたことを知らせ、次の転送時にテクスチャを作り直させる
+
+    描画キューに登録したサーフェスは内容が変わらないものとしてテクスチャをキャッシュするため、
+    グリフアトラスのように後から書き足すサーフェスは書き換えるたびにこれを呼ぶ。
+
+    Args:
+        surface (pygame.Surface): 書き換えたサーフェス
+    """
+    _revisions[surface] = _revisions.get(surface, 0) + 1
+
+
+class SurfaceDisplay:
+    """
+    ソフトウェアのサーフェスへ転送して表示する画面
+    """
+    name = DISPLAY_BACKEND_SURFACE
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT), title=WINDOW_TITLE):
+        """
+        画面の初期化
+
+        Args:
+            size (tuple): 画面の大きさ (幅, 高さ)
+            title (str): ウィンドウのタイトル
+        """
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption(title)
+
+    def present(self):
+        """
+        描画した内容を表示する
+        """
+        pygame.display.flip()
+
+    def close(self):
+        """
+        画面を閉じる
+        """
+        pygame.display.quit()
+
+
+class _Canvas(pygame.Surface):
+    """
+    RendererDisplay のシーンに渡す画面
+
+    通常の描画はソフトウェアで行い、blits() による一括転送だけはテクスチャの合成として記録する。
+    """
+    def __init__(self, size, display):
+        """
+        キャンバスの初期化
+
+        Args:
+            size (tuple): 大きさ (幅, 高さ)
+            display (RendererDisplay): 合成を行う画面
+        """
+        super().__init__(size)
+        self._display = display
+
+    def blits(self, blit_sequence, doreturn=True):
+        """
+        一括転送をテクスチャの合成として記録する（合成は表示時にキャンバスより手前に行う）
+
+        Args:
+            blit_sequence (list): (サーフェス, 描画位置[, 転送元矩形]) のリスト
+            doreturn (bool): 転送範囲のリストを返すかどうか
+
+        Returns:
+            list or None: 転送範囲のリスト
+        """
+        self._display.queue_blits(blit_sequence)
+        if not doreturn:
+            return None
+        rects = []
+        for item in blit_sequence:
+            area = item[2] if len(item) > 2 else None
+            size = area.size if area is not None else item[0].get_size()
+            rects.append(pygame.Rect(item[1][0], item[1][1], size[0], size[1]))
+        return rects
+
+
+class RendererDisplay:
+    """
+    SDL2 の Renderer でテクスチャを合成して表示する画面
+
+    ハードウェアアクセラレーションが使えない環境では SDL のソフトウェアレンダラーを使う。
+    """
+    name = DISPLAY_BACKEND_RENDERER
+
+    def __init__(self, size=(WINDOW_WIDTH, WINDOW_HEIGHT), title=WINDOW_TITLE, vsync=False):
+        """
+        画面の初期化
+
+        Args:
+            size (tuple): 画面の大きさ (幅, 高さ)
+            title (str): ウィンドウのタイトル
+            vsync (bool): 表示を画面の更新に同期させるかどうか
+
+        Raises:
+            ImportError: pygame._sdl2.video が使えない場合
+            RuntimeError: ウィンドウやレンダラーを作成できない場合
+        """
+        from pygame._sdl2.video import Window, Renderer, Texture, error as RendererError
+        self._texture_class = Texture
+        self.window = Window(title, size=size)
+        try:
+            self.renderer = Renderer(self.window, accelerated=1, vsync=vsync)
+            self.accelerated = True
+        except RendererError:
+            self.renderer = Renderer(self.window, accelerated=0)
+            self.accelerated = False
+        print(f"Renderer display: {'accelerated' if self.accelerated else 'software'} renderer")
+
+        self.screen = _Canvas(size, self)
+        self._canvas_texture = Texture(self.renderer, size, streaming=True)
+        self._textures = WeakKeyDictionary()  # サーフェス -> (テクスチャ, 内容の版)
+        self._pending = []  # このフレームで合成する (テクスチャ, 描画先の矩形, 転送元矩形) のリスト
+        self._canvas_covered = False  # キャンバスが不透明な全画面のテクスチャで覆われているかどうか
+        self.upload_count = 0  # テクスチャをアップロードした回数
+
+    def _get_texture(self, surface):
+        """
+        サーフェスに対応するテクスチャを取得する（未作成か内容が変わっていればアップロードする）
+
+        Args:
+            surface (pygame.Surface): 転送元のサーフェス
+
+        Returns:
+            Texture: テクスチャ
+        """
+        revision = _revisions.get(surface, 0)
+        entry = self._textures.get(surface)
+        if entry is None or entry[1] != revision:
+            entry = (self._texture_class.from_surface(self.renderer, surface), revision)
+            self._textures[surface] = entry
+            self.upload_count += 1
+        return entry[0]
+
+    def queue_blits(self, blit_sequence):
+        """
+        一括転送の内容をこのフレームの合成リストに加える
+
+        Args:
+            blit_sequence (list): (サーフェス, 描画位置[, 転送元矩形]) のリスト
+        """
+        pending = self._pending
+        if not pending and blit_sequence:
+            # 最初の転送が不透明な全画面の背景であれば、キャンバスのアップロードを省ける
+            first = blit_sequence[0]
+            surface = first[0]
+            width, height = surface.get_size()
+            self._canvas_covered = (
+                first[1][0] == 0 and first[1][1] == 0 and (len(first) < 3 or first[2] is None)
+                and width >= self.screen.get_width() and height >= self.screen.get_height()
+                and not surface.get_flags() & pygame.SRCALPHA
+                and surface.get_colorkey() is None and surface.get_alpha() is None)
+        for item in blit_sequence:
+            # 描画先は矩形で渡す（位置だけを渡すとテクスチャ全体の大きさに引き伸ばされる）
+            area = item[2] if len(item) > 2 else None
+            width, height = area.size if area is not None else item[0].get_size()
+            pending.append((self._get_texture(item[0]), (item[1][0], item[1][1], width, height), area))
+
+    def present(self):
+        """
+        キャンバスと記録したテクスチャを合成して表示する
+        """
+        renderer = self.renderer
+        renderer.clear()
+        if not self._canvas_covered:
+            self._canvas_texture.update(self.screen)
+            self._canvas_texture.draw()
+        for texture, dest, area in self._pending:
+            texture.draw(area, dest)
+        renderer.present()
+        self._pending.clear()
+        self._canvas_covered = False
+
+    def close(self):
+        """
+        画面を閉じる
+        """
+        self._textures.clear()
+        self._pending.clear()
+        self.window.destroy()
+
+
+def create_display(backend=DISPLAY_BACKEND_SURFACE, size=(WINDOW_WIDTH, WINDOW_HEIGHT), title=WINDOW_TITLE):
+    """
+    描画バックエンドの画面を作成する
+
+    Renderer が使えない環境では SurfaceDisplay にフォールバックする。
+
+    Args:
+        backend (str): 描画バックエンドの種類
+        size (tuple): 画面の大きさ (幅, 高さ)
+        title (str): ウィンドウのタイトル
+
+    Returns:
+        SurfaceDisplay or RendererDisplay: 作成した画面
+    """
+    if backend == DISPLAY_BACKEND_RENDERER:
+        try:
+            return RendererDisplay(size, title)
+        except (ImportError, RuntimeError, pygame.error) as e:
+            print(f"Renderer display unavailable, falling back to surface display: {e}")
+    return SurfaceDisplay(size, title)
+
+
+def benchmark_display(display, scene, frames=600, warmup=60, dt=1 / 60):
+    """
+    シーンを描画して表示するまでの時間をフレームごとに計測する
+
+    シーンの update は計測に含めない。
+
+    Args:
+        display (SurfaceDisplay or RendererDisplay): 計測する画面
+        scene: update(dt) と draw(screen) を持つシーン
+        frames (int): 計測するフレーム数
+        warmup (int): 計測前に進めるフレーム数（テクスチャのアップロードなどを済ませる）
+        dt (float): 1フレームの経過時間（秒）
+
+    Returns:
+        list: フレームごとの描画と表示にかかった時間（秒）のリスト
+    """
+    timings = []
+    for frame in range(warmup + frames):
+        scene.update(dt)
+        start = time.perf_counter()
+        scene.draw(display.screen)
+        display.present()
+        if frame >= warmup:
+            timings.append(time.perf_counter() - start)
+        pygame.event.pump()
+    return timings
@@ -1,9 +1,225 @@
 """
 フォント管理モジュール
+
+システムにある日本語フォントの候補とpygame標準のフォントを並べたフォールバックチェーンを作り、
+文字ごとにチェーンの中で最初にその文字を持つフォントで描画する。
+各フォントが持つ文字の範囲（グリフの対応表）は起動時に一度だけ求め、ディスクにキャッシュする。
+pygame.freetype が使えない環境では、ゲームで表示する文字（ASCII と GAME_TEXTS）に限って
+pygame.font で描画し、字形のない文字（.notdef の字形）と同じになるかどうかで調べる。
+描画時は対応表を引いて文字列を同じフォントの連続部分に分けるだけで、フォントへの問い合わせは行わない。
 """
+import json
+import os
 import pygame
-import sys
-from src.utils.constants import JAPANESE_FONTS
+from src.utils.constants import JAPANESE_FONTS, FONT_COVERAGE_FILE, GAME_TEXTS
+from src.utils.glyph_atlas import GlyphAtlas
+from src.utils.tracer import traced
+
+try:
+    import pygame.freetype as freetype
+except ImportError:
+    freetype = None
+
+_COVERAGE_VERSION = 2
+_BMP_SIZE = 0x10000  # 対応表で扱う文字の範囲（基本多言語面）
+_PROBE_METHOD = "freetype" if freetype is not None else "render"  # 文字の範囲の調べ方（キャッシュに記録する）
+
+
+def _game_codepoints():
+    """
+    ゲームで表示する文字（ASCII の表示可能な文字と GAME_TEXTS の文字）を求める
+    
+    Returns:
+        list: 文字コードのリスト（昇順）
+    """
+    codes = set(range(0x20, 0x7F))
+    for texts in GAME_TEXTS.values():
+        for text in texts.values():
+            codes.update(ord(char) for char in text)
+    return sorted(code for code in codes if code < _BMP_SIZE and not 0xD800 <= code < 0xE000)
+
+
+def _probe_glyphs(path, codepoints):
+    """
+    pygame.font でフォントが文字の字形を持っているかどうかを調べる（pygame.freetype がない場合に使う）
+    
+    SDL_ttf は字形のない文字にも .notdef の字形の寸法を返すため、metrics() の結果だけでは判断せず、
+    描画結果が非文字（U+FFFF）を描画したものと同じであれば持っていないものとする。
+    
+    Args:
+        path (str): フォントファイルのパス
+        codepoints (list): 調べる文字コードのリスト
+    
+    Returns:
+        list: 文字ごとに、字形を持っていればTrue
+    """
+    font = pygame.font.Font(path, 16)
+    
+    def render(char):
+        surface = font.render(char, False, (255, 255, 255), (0, 0, 0))
+        return surface.get_size(), pygame.image.tobytes(surface, "RGB")
+    
+    notdef = render("\uffff")
+    metrics = font.metrics("".join(map(chr, codepoints)))
+    return [metric is not None and render(chr(code)) != notdef for code, metric in zip(codepoints, metrics)]
+
+
+def _probe_coverage(path):
+    """
+    フォントファイルが持つ文字の範囲を求める
+    
+    pygame.freetype が使えない場合は、ゲームで表示する文字だけを _probe_glyphs() で調べる
+    （調べていない文字は、チェーンの先頭のフォントで描画される）。
+    
+    Args:
+        path (str): フォントファイルのパス
+    
+    Returns:
+        list: 持っている文字の範囲 [最初の文字コード, 最後の文字コード] のリスト
+    """
+    if freetype is None:
+        codepoints = _game_codepoints()
+        present = _probe_glyphs(path, codepoints)
+    else:
+        if not freetype.get_init():
+            freetype.init()
+        codepoints = [code for code in range(_BMP_SIZE) if not 0xD800 <= code < 0xE000]
+        metrics = freetype.Font(path, 16).get_metrics("".join(map(chr, codepoints)))
+        present = [metric is not None for metric in metrics]
+    
+    ranges = []
+    for code, has_glyph in zip(codepoints, present):
+        if not has_glyph:
+            continue
+        if ranges and ranges[-1][1] == code - 1:
+            ranges[-1][1] = code
+        else:
+            ranges.append([code, code])
+    return ranges
+
+
+class FontChain:
+    """
+    フォールバックチェーンで文字列を描画するフォント
+    
+    pygame.font.Font と同じ render()・size()・get_height() を持つため、
+    グリフアトラスなどフォントを受け取る処理にそのまま渡せる。
+    """
+    def __init__(self, fonts, coverage_map):
+        """
+        フォントチェーンの初期化
+        
+        Args:
+            fonts (list): 優先順に並べた pygame.font.Font のリスト
+            coverage_map (bytearray): 文字コード -> 描画に使うフォントの番号
+        """
+        self.fonts = fonts
+        self._coverage_map = coverage_map
+        self._ascent = max(font.get_ascent() for font in fonts)
+        self._height = self._ascent + max(-font.get_descent() for font in fonts)
+    
+    def font_for(self, char):
+        """
+        文字を描画するフォントを取得する
+        
+        Args:
+            char (str): 1文字
+        
+        Returns:
+            pygame.font.Font: フォント
+        """
+        code = ord(char)
+        return self.fonts[self._coverage_map[code] if code < _BMP_SIZE else 0]
+    
+    def split_runs(self, text):
+        """
+        文字列を同じフォントで描画する連続部分に分ける
+        
+        Args:
+            text (str): 文字列
+        
+        Returns:
+            list: (フォント, 部分文字列) のリスト
+        """
+        if len(self.fonts) == 1:
+            return [(self.fonts[0], text)]
+        coverage_map = self._coverage_map
+        runs = []
+        start = 0
+        current = None
+        for i, char in enumerate(text):
+            code = ord(char)
+            index = coverage_map[code] if code < _BMP_SIZE else 0
+            if index != current:
+                if current is not None:
+                    runs.append((self.fonts[current], text[start:i]))
+                start = i
+                current = index
+        if current is not None:
+            runs.append((self.fonts[current], text[start:]))
+        return runs
+    
+    @traced("font", "FontChain.render")
+    def render(self, text, antialias, color):
+        """
+        文字列を1枚のサーフェスにレンダリングする（連続部分ごとのベースラインを揃える）
+        
+        Args:
+            text (str): 文字列
+            antialias (bool): アンチエイリアスをかけるかどうか
+            color (tuple): 色 (R, G, B)
+        
+        Returns:
+            pygame.Surface: レンダリングされたテキスト
+        """
+        runs = self.split_runs(text)
+        if len(runs) <= 1:
+            font = runs[0][0] if runs else self.fonts[0]
+            if font.get_ascent() == self._ascent and font.get_height() == self._height:
+                return font.render(text, antialias, color)
+        
+        surfaces = [(font, font.render(run, antialias, color)) for font, run in runs]
+        width = sum(surface.get_width() for _, surface in surfaces)
+        result = pygame.Surface((width, self._height), pygame.SRCALPHA)
+        result.fill((0, 0, 0, 0))
+        x = 0
+        for font, surface in surfaces:
+            # 透明なサーフェスへはRGBA最大値合成で転送し、アルファを含めてそのまま書き込む
+            result.blit(surface, (x, self._ascent - font.get_ascent()), special_flags=pygame.BLEND_RGBA_MAX)
+            x += surface.get_width()
+        return result
+    
+    def size(self, text):
+        """
+        文字列の描画サイズを計算する
+        
+        Args:
+            text (str): 文字列
+        
+        Returns:
+            tuple: (幅, 高さ)
+        """
+        width = sum(font.size(run)[0] for font, run in self.split_runs(text))
+        return (width, self._height)
+    
+    def get_height(self):
+        """
+        行の高さを取得する（チェーン内のフォントのうち最も高いアセントと最も深いディセントの和）
+        
+        Returns:
+            int: 高さ
+        """
+        return self._height
+    
+    def get_ascent(self):
+        """
+        ベースラインから上の高さを取得する（チェーン内のフォントの最大値）
+        
+        Returns:
+            int: アセント
+        """
+        return self._ascent
+
 
 class FontManager:
     """
@@ -21,60 +237,223 @@ class FontManager:
         if FontManager._initialized:
             return
         
-        self.default_font = None
+        self.default_font = os.path.join(os.path.dirname(pygame.font.__file__), pygame.font.get_default_font())
         self.japanese_font = None
+        self.japanese_font_paths = []  # 見つかった日本語フォントのファイルのパス（候補の順）
+        self._fonts = {}  # (フォントファイルのパス, サイズ) -> Font
+        self._chains = {}  # (日本語を優先するかどうか, サイズ) -> FontChain
+        self._atlases = {}  # (日本語を優先するかどうか, サイズ, 色) -> GlyphAtlas
         self._find_japanese_font()
+        self._load_coverage()
         FontManager._initialized = True
     
     def _find_japanese_font(self):
         """
-        システムから日本語フォントを探す
+        システムから日本語フォントを探す（見つかったものはすべてフォールバックチェーンに加える）
         """
-        available_fonts = pygame.font.get_fonts()
-        
-        # 日本語フォントの候補から使用可能なものを探す
         for font_name in JAPANESE_FONTS:
-            if font_name.lower() in available_fonts:
-                self.japanese_font = font_name
-                print(f"Found Japanese font: {font_name}")
-                return
+            path = pygame.font.match_font(font_name)
+            if path and path not in self.japanese_font_paths:
+                self.japanese_font_paths.append(path)
+                if self.japanese_font is None:
+                    self.japanese_font = font_name
+                    print(f"Found Japanese font: {font_name}")
         
         # 候補が見つからない場合はシステムのデフォルトフォントを使用
-        print("No Japanese font found. Using default font.")
-        self.japanese_font = None
+        if self.japanese_font is None:
+            print("No Japanese font found. Using default font.")
     
-    def get_font(self, size, use_japanese=True):
+    def _load_coverage(self):
+        """
+        各フォントが持つ文字の範囲をキャッシュから読み込み、ないものやフォントが更新されたものは調べ直す
+        
+        日本語を優先するチェーン（日本語フォント、標準フォントの順）と
+        英語を優先するチェーン（標準フォント、日本語フォントの順）の対応表を作る。
+        """
+        try:
+            with open(FONT_COVERAGE_FILE, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("version") != _COVERAGE_VERSION:
+                cache = {}
+        except (OSError, ValueError):
+            cache = {}
+        cached_fonts = cache.get("fonts", {})
+        
+        coverage = {}  # フォントファイルのパス -> 文字の範囲のリスト
+        updated = False
+        for path in self.japanese_font_paths + [self.default_font]:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entry = cached_fonts.get(path)
+            if (entry is None or entry["mtime"] != stat.st_mtime or entry["size"] != stat.st_size
+                    or entry.get("probe") != _PROBE_METHOD):
+                try:
+                    ranges = _probe_coverage(path)
+                except (OSError, pygame.error) as e:
+                    print(f"Failed to load font {path}: {e}")
+                    continue
+                entry = {"mtime": stat.st_mtime, "size": stat.st_size, "probe": _PROBE_METHOD, "ranges": ranges}
+                cached_fonts[path] = entry
+                updated = True
+            coverage[path] = entry["ranges"]
+        
+        # 読み込めなかった日本語フォントはチェーンから外す
+        self.japanese_font_paths = [path for path in self.japanese_font_paths if path in coverage]
+        if self.default_font not in coverage:
+            coverage[self.default_font] = [[0, _BMP_SIZE - 1]]
+        self._coverage = coverage
+        self._chain_paths = {
+            True: self.japanese_font_paths + [self.default_font],
+            False: [self.default_font] + self.japanese_font_paths,
+        }
+        self._coverage_maps = {
+            use_japanese: self._build_coverage_map(paths) for use_japanese, paths in self._chain_paths.items()
+        }
+        
+        if updated:
+            self._save_coverage({"version": _COVERAGE_VERSION, "fonts": cached_fonts})
+    
+    def _build_coverage_map(self, paths):
+        """
+        文字コードからチェーン内のフォントの番号を引く対応表を作る
+        
+        Args:
+            paths (list): 優先順に並べたフォントファイルのパス
+        
+        Returns:
+            bytearray: 文字コード -> フォントの番号（どのフォントも持たない文字は0）
+        """
+        coverage_map = bytearray(_BMP_SIZE)
+        # 優先度の低いフォントから書き込み、優先度の高いフォントで上書きする
+        for index in range(len(paths) - 1, -1, -1):
+            value = bytes((index,))
+            for start, end in self._coverage[paths[index]]:
+                coverage_map[start:end + 1] = value * (end + 1 - start)
+        return coverage_map
+    
+    @staticmethod
+    def _save_coverage(cache):
         """
-        指定したサイズのフォントを取得する
+        文字の範囲のキャッシュを書き出す（一時ファイルに書いてから置き換える）
         
         Args:
+            cache (dict): キャッシュの内容
+        """
+        try:
+            directory = os.path.dirname(FONT_COVERAGE_FILE)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            temp_path = FONT_COVERAGE_FILE + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(cache, f, separators=(",", ":"))
+            os.replace(temp_path, FONT_COVERAGE_FILE)
+        except OSError as e:
+            print(f"Failed to write font coverage cache: {e}")
+    
+    def _load_font(self, path, size):
+        """
+        フォントファイルを指定したサイズで読み込む（一度読み込んだものはキャッシュする）
+        
+        Args:
+            path (str): フォントファイルのパス
             size (int): フォントサイズ
-            use_japanese (bool): 日本語フォントを使用するかどうか
         
         Returns:
             pygame.font.Font: フォントオブジェクト
         """
-        if use_japanese and self.japanese_font:
-            try:
-                return pygame.font.SysFont(self.japanese_font, size)
-            except:
-                print(f"Failed to load Japanese font: {self.japanese_font}")
+        key = (path, size)
+        font = self._fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(None if path == self.default_font else path, size)
+            self._fonts[key] = font
+        return font
+    
+    @traced("font")
+    def get_font(self, size, use_japanese=True):
+        """
+        指定したサイズのフォント（フォールバックチェーン）を取得する
         
-        # 日本語フォントが使用できない場合はデフォルトフォントを使用
-        return pygame.font.SysFont(None, size)
+        Args:
+            size (int): フォントサイズ
+            use_japanese (bool): 両方のフォントが持つ文字を日本語フォントで描画するかどうか
+        
+        Returns:
+            FontChain: フォントチェーン
+        """
+        key = (use_japanese, size)
+        chain = self._chains.get(key)
+        if chain is None:
+            fonts = [self._load_font(path, size) for path in self._chain_paths[use_japanese]]
+            chain = FontChain(fonts, self._coverage_maps[use_japanese])
+            self._chains[key] = chain
+        return chain
     
-    def render_text(self, text, size, color, use_japanese=True):
+    def render_text(self, text, size, color, use_japanese=True, antialias=True):
         """
-        テキストをレンダリングする
+        テキストをレンダリングする（英語と日本語が混ざった文字列も1回でレンダリングできる）
         
         Args:
             text (str): レンダリングするテキスト
             size (int): フォントサイズ
             color (tuple): 色 (R, G, B)
-            use_japanese (bool): 日本語フォントを使用するかどうか
+            use_japanese (bool): 両方のフォントが持つ文字を日本語フォントで描画するかどうか
+            antialias (bool): アンチエイリアスをかけるかどうか（かけない方が転送が速い）
         
         Returns:
             pygame.Surface: レンダリングされたテキスト
         """
-        font = self.get_font(size, use_japanese)
-        return font.render(text, True, color)
+        return self.get_font(size, use_japanese).render(text, antialias, color)
+    
+    def get_glyph_atlas(self, size, color, use_japanese=True):
+        """
+        指定したサイズと色のグリフアトラスを取得する
+        
+        Args:
+            size (int): フォントサイズ
+            color (tuple): 色 (R, G, B)
+            use_japanese (bool): 両方のフォントが持つ文字を日本語フォントで描画するかどうか
+        
+        Returns:
+            GlyphAtlas: グリフアトラス
+        """
+        key = (use_japanese, size, tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = GlyphAtlas(self.get_font(size, use_japanese), color)
+            self._atlases[key] = atlas
+        return atlas
+    
+    def layout_text(self, text, pos, size, color, use_japanese=True):
+        """
+        グリフアトラスを使ってテキストを転送リストに変換する
+        
+        Args:
+            text (str): 描画するテキスト
+            pos (tuple): 左上の描画位置 (x, y)
+            size (int): フォントサイズ
+            color (tuple): 色 (R, G, B)
+            use_japanese (bool): 両方のフォントが持つ文字を日本語フォントで描画するかどうか
+        
+        Returns:
+            list: (アトラスページ, 描画位置, 矩形) のリスト
+        """
+        return self.get_glyph_atlas(size, color, use_japanese).layout(text, pos)
+    
+    def draw_text(self, surface, text, pos, size, color, use_japanese=True):
+        """
+        グリフアトラスを使ってテキストを描画する（数値など毎フレーム変わるテキスト向け）
+        
+        Args:
+            surface (pygame.Surface): 描画対象のサーフェス
+            text (str): 描画するテキスト
+            pos (tuple): 左上の描画位置 (x, y)
+            size (int): フォントサイズ
+            color (tuple): 色 (R, G, B)
+            use_japanese (bool): 両方のフォントが持つ文字を日本語フォントで描画するかどうか
+        
+        Returns:
+            pygame.Rect: 描画した範囲
+        """
+        return self.get_glyph_atlas(size, color, use_japanese).draw(surface, text, pos)
@@ -0,0 +1,185 @@
+"""
+ガベージコレクション（GC）の制御モジュール
+
+描画のたびに作られる一時オブジェクトによって Python の世代別 GC がフレームの途中で走り、
+特に古い世代の回収（すべてのオブジェクトを調べる）がフレームの処理時間を大きく乱す。
+
+GC_CONTROL を有効にすると、最初のフレームを表示した時点で gc.freeze() により
+フォントやキャッシュ済みのサーフェスなど起動時に作ったオブジェクトを回収の対象から外し、
+ゲーム中（ゲームオーバー・クリアの前）は自動の GC を止める。
+回収はシーンの切り替え・結果表示までの待ち時間・タイトル画面などの安全な時点でまとめて行う。
+ゲーム中でも未回収のオブジェクトが GC_YOUNG_LIMIT を超えた場合は、最も若い世代だけを回収する。
+
+GC_CONTROL に関わらず、GC で止まった時間は gc.callbacks で計測し、シーンごとに集計して
+表示するほか、トレースを記録している場合は "gc" の区間としてフレームの区間と並べて記録する。
+"""
+import gc
+import time
+from src.utils.constants import GC_CONTROL, GC_YOUNG_LIMIT, GC_REPORT_INTERVAL
+from src.utils.tracer import trace_complete
+
+
+class GcController:
+    """
+    GC の自動実行を切り替え、GC で止まった時間をシーンごとに集計するクラス
+    """
+    def __init__(self, enabled=GC_CONTROL, young_limit=GC_YOUNG_LIMIT, report_interval=GC_REPORT_INTERVAL):
+        """
+        GC の制御の初期化
+
+        Args:
+            enabled (bool): 自動の GC を止めて安全な時点で回収するかどうか（Falseなら計測のみ）
+            young_limit (int): ゲーム中でも若い世代を回収する未回収のオブジェクトの数
+            report_interval (int): 集計結果を表示する間隔（フレーム数、0で終了時のみ）
+        """
+        self.enabled = enabled
+        self.young_limit = young_limit
+        self.report_interval = report_interval
+        self.frame_count = 0
+        self.frame_pause = 0.0  # 現在のフレームで GC により止まった時間（秒）
+        self.explicit_pause = 0.0  # そのうち安全な時点で明示的に回収した時間（秒）
+        self.stats = {}  # シーン名 -> [フレーム数, 自動の回収回数, 明示的な回収回数, 止まった時間の合計, 1フレームの最大]
+        self._playing = False  # 自動の GC を止めているかどうか
+        self._frozen = False
+        self._explicit = False  # 明示的に回収している最中かどうか
+        self._collection_start = 0
+        self._automatic_count = 0
+        self._explicit_count = 0
+        gc.callbacks.append(self._on_collection)
+
+    def _on_collection(self, phase, info):
+        """
+        GC の開始・終了時に呼ばれる（gc.callbacks）
+
+        Args:
+            phase (str): "start" または "stop"
+            info (dict): 回収した世代・回収した数など
+        """
+        if phase == "start":
+            self._collection_start = time.perf_counter_ns()
+            return
+        duration = time.perf_counter_ns() - self._collection_start
+        pause = duration / 1e9
+        self.frame_pause += pause
+        if self._explicit:
+            self.explicit_pause += pause
+            self._explicit_count += 1
+        else:
+            self._automatic_count += 1
+        trace_complete("gc", "gc", self._collection_start, duration,
+                       {"generation": info["generation"], "collected": info["collected"],
+                        "explicit": self._explicit})
+
+    def _collect(self, generation=2):
+        """
+        明示的に回収する
+
+        Args:
+            generation (int): 回収する世代（2ならすべて）
+        """
+        self._explicit = True
+        try:
+            gc.collect(generation)
+        finally:
+            self._explicit = False
+
+    def freeze(self):
+        """
+        回収してから、残っているオブジェクトを以降の GC の対象から外す（最初のフレームの表示後に呼ぶ）
+        """
+        if not self.enabled:
+            return
+        self._collect()
+        gc.freeze()
+        self._frozen = True
+        print(f"GC: froze {gc.get_freeze_count()} startup object(s)")
+
+    def scene_changed(self):
+        """
+        シーンを切り替えた後に呼ぶ（前のシーンのオブジェクトをまとめて回収する）
+
+        凍結したオブジェクトは調べないため、すべての世代を回収しても短時間で済む。
+        シーンは破棄されることがあるので凍結せず、循環参照も通常どおり回収されるようにしておく。
+        """
+        if not self.enabled or not self._frozen:
+            return
+        self._collect()
+
+    def begin_frame(self, playing):
+        """
+        フレームの開始時に呼び、自動の GC を切り替える
+
+        Args:
+            playing (bool): ゲーム中（フレームの処理時間を乱したくない）かどうか
+        """
+        self.frame_pause = 0.0
+        self.explicit_pause = 0.0
+        self.poll(playing)
+
+    def poll(self, playing):
+        """
+        自動の GC を切り替え、止めている間に溜まりすぎていれば若い世代を回収する
+
+        フレームの途中でまとめて更新を進める場合（制御ソケットの step など）は、更新ごとに呼ぶ。
+
+        Args:
+            playing (bool): ゲーム中（フレームの処理時間を乱したくない）かどうか
+        """
+        if not self.enabled:
+            return
+        if playing:
+            if not self._playing:
+                gc.disable()
+                self._playing = True
+            elif gc.get_count()[0] > self.young_limit:
+                # 止めている間に溜まりすぎた場合は、短時間で済む若い世代だけを回収する
+                self._collect(0)
+        elif self._playing:
+            # ゲームが終わったので、溜まっている分を回収してから自動の GC に戻す
+            self._collect()
+            gc.enable()
+            self._playing = False
+
+    def end_frame(self, scene_name):
+        """
+        フレームの終了時に呼び、GC で止まった時間を集計する
+
+        Args:
+            scene_name (str): このフレームで処理したシーン名
+        """
+        stats = self.stats.setdefault(scene_name, [0, 0, 0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += self._automatic_count
+        stats[2] += self._explicit_count
+        stats[3] += self.frame_pause
+        stats[4] = max(stats[4], self.frame_pause)
+        self._automatic_count = 0
+        self._explicit_count = 0
+
+        self.frame_count += 1
+        if self.report_interval and self.frame_count % self.report_interval == 0:
+            self.report()
+
+    def report(self):
+        """
+        シーンごとの集計結果を表示する
+        """
+        for scene_name, (frames, automatic, explicit, total, worst) in self.stats.items():
+            if not frames:
+                continue
+            print(f"GC [{scene_name}]: {frames} frames, {automatic} automatic / {explicit} explicit collection(s), "
+                  f"pause {total / frames * 1000:.3f} ms/frame (max {worst * 1000:.2f} ms)")
+
+    def close(self):
+        """
+        集計結果を表示し、GC を通常の状態に戻す
+        """
+        self.report()
+        if self._on_collection in gc.callbacks:
+            gc.callbacks.remove(self._on_collection)
+        if self._frozen:
+            gc.unfreeze()
+            self._frozen = False
+        if self._playing:
+            gc.enable()
+            self._playing = False
@@ -0,0 +1,145 @@
+"""
+グリフアトラスモジュール
+
+数値やタイマーなど毎フレーム変化するテキストを、文字単位でキャッシュした
+グリフの組み合わせで描画する。
+"""
+import pygame
+from src.utils.constants import GLYPH_ATLAS_PAGE_SIZE
+from src.utils.display import invalidate_texture
+
+
+class GlyphAtlas:
+    """
+    1つの(フォント, サイズ, 色)に対応するグリフアトラス
+
+    各文字は初回使用時に一度だけラスタライズされ、アトラスページ上の矩形として保持される。
+    描画時はページ上の矩形を並べて Surface.blits() で一括転送するため、
+    文字列の内容が変わっても新たなラスタライズは発生しない。
+    """
+    def __init__(self, font, color, page_size=GLYPH_ATLAS_PAGE_SIZE):
+        """
+        グリフアトラスの初期化
+
+        Args:
+            font (pygame.font.Font or FontChain): グリフのラスタライズに使用するフォント
+            color (tuple): 文字色 (R, G, B)
+            page_size (int): アトラス1ページの一辺（ピクセル）
+        """
+        self.font = font
+        self.color = color
+        self.page_size = page_size
+        self.line_height = font.get_height()
+        self.pages = []
+        self.glyphs = {}  # 文字 -> (ページ, 矩形)
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._row_height = 0
+
+    def _new_page(self):
+        """
+        新しいアトラスページを追加する
+
+        Returns:
+            pygame.Surface: 追加したページ
+        """
+        page = pygame.Surface((self.page_size, self.page_size), pygame.SRCALPHA)
+        page.fill((0, 0, 0, 0))
+        self.pages.append(page)
+        self._cursor_x = 0
+        self._cursor_y = 0
+        self._row_height = 0
+        return page
+
+    def get_glyph(self, char):
+        """
+        文字のグリフを取得する（未登録ならラスタライズしてアトラスに追加する）
+
+        Args:
+            char (str): 1文字
+
+        Returns:
+            tuple: (アトラスページ, ページ上の矩形)
+        """
+        glyph = self.glyphs.get(char)
+        if glyph is not None:
+            return glyph
+
+        surface = self.font.render(char, True, self.color)
+        width, height = surface.get_size()
+        width = min(width, self.page_size)
+        height = min(height, self.page_size)
+
+        # 現在の行に収まらなければ改行し、ページに収まらなければ新しいページを使う
+        if not self.pages:
+            self._new_page()
+        if self._cursor_x + width > self.page_size:
+            self._cursor_x = 0
+            self._cursor_y += self._row_height
+            self._row_height = 0
+        if self._cursor_y + height > self.page_size:
+            self._new_page()
+
+        page = self.pages[-1]
+        rect = pygame.Rect(self._cursor_x, self._cursor_y, width, height)
+        # 透明なページへはRGBA最大値合成で転送し、アルファを含めてそのまま書き込む
+        page.blit(surface, rect.topleft, special_flags=pygame.BLEND_RGBA_MAX)
+        # ページのテクスチャを作成済みの描画バックエンドには作り直させる
+        invalidate_texture(page)
+
+        self._cursor_x += width
+        self._row_height = max(self._row_height, height)
+        glyph = (page, rect)
+        self.glyphs[char] = glyph
+        return glyph
+
+    def layout(self, text, pos):
+        """
+        文字列をグリフの転送リストに変換する
+
+        Args:
+            text (str): 描画する文字列
+            pos (tuple): 左上の描画位置 (x, y)
+
+        Returns:
+            list: Surface.blits() に渡せる (ページ, 描画位置, 矩形) のリスト
+        """
+        x, y = pos
+        blit_sequence = []
+        for char in text:
+            page, rect = self.get_glyph(char)
+            blit_sequence.append((page, (x, y), rect))
+            x += rect.width
+        return blit_sequence
+
+    def measure(self, text):
+        """
+        文字列の描画サイズを計算する
+
+        Args:
+            text (str): 計測する文字列
+
+        Returns:
+            tuple: (幅, 高さ)
+        """
+        width = 0
+        for char in text:
+            width += self.get_glyph(char)[1].width
+        return (width, self.line_height)
+
+    def draw(self, surface, text, pos):
+        """
+        文字列を描画する
+
+        Args:
+            surface (pygame.Surface): 描画対象のサーフェス
+            text (str): 描画する文字列
+            pos (tuple): 左上の描画位置 (x, y)
+
+        Returns:
+            pygame.Rect: 描画した範囲
+        """
+        blit_sequence = self.layout(text, pos)
+        surface.blits(blit_sequence, doreturn=False)
+        width = sum(rect.width for _, _, rect in blit_sequence)
+        return pygame.Rect(pos[0], pos[1], width, self.line_height)
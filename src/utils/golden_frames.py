@@ -0,0 +1,212 @@
+"""
+描画結果の回帰チェック（ゴールデンフレーム）モジュール
+
+決まったシードと経過時間でシーンを進めて描画したフレームを、保存しておいた PNG と比較する。
+比較は NumPy の配列演算でピクセルごとの差をまとめて求め、許容値を超えた箇所はヒートマップに書き出す。
+描画のキャッシュや最適化を変更する前にゴールデンを保存し、変更後に比較して描画が変わっていないことを確かめる。
+"""
+import os
+import random
+from collections import namedtuple
+import numpy as np
+import pygame
+from src.utils.constants import DATA_DIR, WINDOW_WIDTH, WINDOW_HEIGHT
+from src.utils.telemetry import Telemetry
+
+GOLDEN_DIR = f"{DATA_DIR}/golden"  # ゴールデンの PNG の保存先
+GOLDEN_DIFF_DIR = f"{DATA_DIR}/golden_diff"  # 一致しなかったフレームのヒートマップの書き出し先
+
+# シーンを進める手順
+GoldenScenario = namedtuple("GoldenScenario", [
+    "name",  # シナリオ名（ファイル名の先頭に使う）
+    "create_scene",  # シーンを作成する関数（シードを設定した後に呼ぶ）
+    "frames",  # 進めるフレーム数
+    "capture_every",  # 何フレームごとに保存・比較するか
+    "on_frame",  # フレームごとに呼ぶ関数 (シーン, フレーム番号)（入力の再現などに使う、Noneなら何もしない）
+])
+
+# 1フレームの比較結果
+FrameDiff = namedtuple("FrameDiff", [
+    "name",  # フレーム名（シナリオ名_フレーム番号）
+    "max_diff",  # 最も大きかったピクセルの差（0〜255）
+    "mismatched",  # 許容値を超えたピクセル数
+    "missing",  # ゴールデンがないかどうか
+])
+
+
+def _click(scene, pos, button=1):
+    """
+    シーンにマウスクリックのイベントを渡す
+
+    Args:
+        scene: handle_event(event) を持つシーン
+        pos (tuple): クリック位置 (x, y)
+        button (int): マウスボタン
+    """
+    scene.handle_event(pygame.event.Event(pygame.MOUSEBUTTONDOWN, pos=pos, button=button))
+
+
+def _walk_to_rabbit(scene, frame):
+    """
+    一定間隔でうさぎの位置をクリックし、近づいて撫でるまでを再現する
+
+    Args:
+        scene (GameScene): ゲームシーン
+        frame (int): フレーム番号
+    """
+    if frame % 30 == 1:
+        rabbit_x, rabbit_y = scene.rabbit.get_position()
+        _click(scene, (int(rabbit_x), int(rabbit_y)))
+
+
+def build_scenarios(level_manager):
+    """
+    タイトル画面と各ステージのゲーム画面を描画する標準のシナリオを作る
+
+    Args:
+        level_manager (LevelManager): ステージの一覧
+
+    Returns:
+        list: GoldenScenario のリスト
+    """
+    from src.scenes.game_scene import GameScene
+    from src.scenes.title_scene import TitleScene
+
+    scenarios = [GoldenScenario("title", TitleScene, 1, 1, None)]
+    for index in range(max(1, len(level_manager))):
+        def create_scene(index=index):
+            return GameScene(level_manager.get(index) if len(level_manager) else None, index + 1)
+        stage = f"stage{index + 1}"
+        scenarios.append(GoldenScenario(f"{stage}_idle", create_scene, 240, 60, None))
+        scenarios.append(GoldenScenario(f"{stage}_walk", create_scene, 600, 10, _walk_to_rabbit))
+    return scenarios
+
+
+def render_scenario(scenario, seed=0, dt=1 / 60):
+    """
+    シナリオを進めて、保存・比較するフレームを描画する
+
+    Args:
+        scenario (GoldenScenario): シナリオ
+        seed (int): 乱数のシード
+        dt (float): 1フレームの経過時間（秒）
+
+    Yields:
+        tuple: (フレーム名, 描画したサーフェス)
+    """
+    random.seed(seed)
+    scene = scenario.create_scene()
+    particles = getattr(scene, "particles", None)
+    if particles is not None:
+        particles.seed(seed)
+
+    screen = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
+    for frame in range(scenario.frames):
+        if scenario.on_frame is not None:
+            scenario.on_frame(scene, frame)
+        if frame:
+            scene.update(dt)
+        if frame % scenario.capture_every == 0:
+            screen.fill((0, 0, 0))
+            scene.draw(screen)
+            yield f"{scenario.name}_{frame:04d}", screen
+
+
+def surface_to_array(surface):
+    """
+    サーフェスを高さ x 幅 x 3 の連続した uint8 配列にする
+
+    Args:
+        surface (pygame.Surface): サーフェス
+
+    Returns:
+        numpy.ndarray: RGB の配列
+    """
+    width, height = surface.get_size()
+    return np.frombuffer(pygame.image.tostring(surface, "RGB"), dtype=np.uint8).reshape(height, width, 3)
+
+
+def compare_frames(actual, golden, tolerance=0):
+    """
+    2枚のフレームのピクセルごとの差を求める
+
+    Args:
+        actual (numpy.ndarray): 描画したフレーム（surface_to_array() の配列）
+        golden (numpy.ndarray): ゴールデンのフレーム（同じ形の配列）
+        tolerance (int): 同じとみなすチャンネルごとの差の上限
+
+    Returns:
+        tuple: (ピクセルごとの差の最大値の配列, 許容値を超えたピクセル数)
+    """
+    if actual.shape != golden.shape:
+        diff = np.full(actual.shape[:2], 255, dtype=np.uint8)
+        return diff, diff.size
+    # uint8 のまま差の絶対値を求め、チャンネルの最大値は軸に沿った集計より速い要素ごとの最大値で求める
+    channel_diff = np.maximum(actual, golden)
+    channel_diff -= np.minimum(actual, golden)
+    diff = np.maximum(channel_diff[:, :, 0], channel_diff[:, :, 1])
+    np.maximum(diff, channel_diff[:, :, 2], out=diff)
+    return diff, int(np.count_nonzero(diff > tolerance))
+
+
+def write_heatmap(path, golden, diff, tolerance=0):
+    """
+    差のヒートマップを書き出す（ゴールデンを暗くした上に、許容値を超えた差を赤で重ねる）
+
+    Args:
+        path (str): 書き出す PNG のパス
+        golden (numpy.ndarray): ゴールデンのフレーム（surface_to_array() の配列）
+        diff (numpy.ndarray): ピクセルごとの差
+        tolerance (int): 同じとみなすチャンネルごとの差の上限
+    """
+    if golden.shape[:2] == diff.shape:
+        heatmap = (golden.mean(axis=2, keepdims=True) * 0.3).astype(np.uint8).repeat(3, axis=2)
+    else:
+        heatmap = np.zeros(diff.shape + (3,), dtype=np.uint8)
+    over = diff > tolerance
+    heatmap[over, 0] = np.minimum(255, 64 + diff[over].astype(np.int16) * 4).astype(np.uint8)
+    heatmap[over, 1] = 0
+    heatmap[over, 2] = 0
+    height, width = diff.shape
+    pygame.image.save(pygame.image.frombuffer(heatmap.tobytes(), (width, height), "RGB"), path)
+
+
+def check_golden_frames(scenarios, golden_dir=GOLDEN_DIR, diff_dir=GOLDEN_DIFF_DIR, tolerance=0,
+                        update=False, seed=0):
+    """
+    シナリオのフレームをゴールデンと比較する（update の場合はゴールデンを保存し直す）
+
+    Args:
+        scenarios (list): GoldenScenario のリスト
+        golden_dir (str): ゴールデンの PNG のディレクトリ
+        diff_dir (str): ヒートマップの書き出し先
+        tolerance (int): 同じとみなすチャンネルごとの差の上限
+        update (bool): 比較せずにゴールデンを保存するかどうか
+        seed (int): 乱数のシード
+
+    Returns:
+        list: FrameDiff のリスト
+    """
+    # 比較用に作るゲームシーンのイベントをプレイ記録に残さない
+    Telemetry().disable()
+    os.makedirs(golden_dir, exist_ok=True)
+    results = []
+    for scenario in scenarios:
+        for name, surface in render_scenario(scenario, seed):
+            golden_path = os.path.join(golden_dir, f"{name}.png")
+            if update:
+                pygame.image.save(surface, golden_path)
+                results.append(FrameDiff(name, 0, 0, False))
+                continue
+            if not os.path.exists(golden_path):
+                results.append(FrameDiff(name, 0, 0, True))
+                continue
+
+            actual = surface_to_array(surface)
+            golden = surface_to_array(pygame.image.load(golden_path))
+            diff, mismatched = compare_frames(actual, golden, tolerance)
+            if mismatched:
+                os.makedirs(diff_dir, exist_ok=True)
+                write_heatmap(os.path.join(diff_dir, f"{name}_diff.png"), golden, diff, tolerance)
+            results.append(FrameDiff(name, int(diff.max()), mismatched, False))
+    return results
@@ -0,0 +1,164 @@
+"""
+グリッド距離場モジュール
+
+画面をマス目に区切り、起点からの重み付き距離（距離変換）を NumPy 配列で計算する。
+音の伝搬や経路探索のように「一度計算しておき、毎フレームは参照するだけ」の用途に使う。
+"""
+import math
+import numpy as np
+from src.utils.constants import WINDOW_WIDTH, WINDOW_HEIGHT, GRID_CELL_SIZE
+
+GRID_COLS = math.ceil(WINDOW_WIDTH / GRID_CELL_SIZE)
+GRID_ROWS = math.ceil(WINDOW_HEIGHT / GRID_CELL_SIZE)
+
+# 8近傍の (行方向, 列方向) のずれ
+NEIGHBOR_OFFSETS = ((-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1))
+
+
+def world_to_cell(x, y):
+    """
+    画面上の座標をマス目の位置に変換する
+
+    Args:
+        x (float): X座標
+        y (float): Y座標
+
+    Returns:
+        tuple: (行, 列)
+    """
+    col = min(GRID_COLS - 1, max(0, int(x // GRID_CELL_SIZE)))
+    row = min(GRID_ROWS - 1, max(0, int(y // GRID_CELL_SIZE)))
+    return (row, col)
+
+
+def cell_center(row, col):
+    """
+    マス目の中心の画面上の座標を求める
+
+    Args:
+        row (int): 行
+        col (int): 列
+
+    Returns:
+        tuple: (x, y)
+    """
+    return ((col + 0.5) * GRID_CELL_SIZE, (row + 0.5) * GRID_CELL_SIZE)
+
+
+def _neighbor_slices(dr, dc, shape):
+    """
+    近傍へのずれに対応する、参照先と参照元の配列スライスを求める
+
+    Args:
+        dr (int): 行方向のずれ
+        dc (int): 列方向のずれ
+        shape (tuple): 配列の形 (行数, 列数)
+
+    Returns:
+        tuple: (参照先のスライス, 近傍側のスライス)
+    """
+    rows, cols = shape
+    dst = (slice(max(0, -dr), rows - max(0, dr)), slice(max(0, -dc), cols - max(0, dc)))
+    src = (slice(max(0, dr), rows - max(0, -dr)), slice(max(0, dc), cols - max(0, -dc)))
+    return dst, src
+
+
+def edge_costs(cost):
+    """
+    8近傍それぞれへの移動コストを求める
+
+    マス間の移動コストは「マス間の距離 × 両マスのコストの平均」とする。
+    斜め移動は、挟まれた2つの縦横のマスのどちらかが通過できない場合は禁止する（角のすり抜け防止）。
+
+    Args:
+        cost (numpy.ndarray): マスごとの移動コスト（1以上、無限大は通過不可）
+
+    Returns:
+        list: (行方向のずれ, 列方向のずれ, 参照先のスライス, 近傍側のスライス, 移動コスト) のリスト
+    """
+    edges = []
+    for dr, dc in NEIGHBOR_OFFSETS:
+        dst, src = _neighbor_slices(dr, dc, cost.shape)
+        length = GRID_CELL_SIZE * (math.sqrt(2) if dr and dc else 1.0)
+        edge_cost = length * (cost[dst] + cost[src]) * 0.5
+        if dr and dc:
+            corner_a = cost[src[0], dst[1]]
+            corner_b = cost[dst[0], src[1]]
+            edge_cost = np.where(np.isinf(corner_a) | np.isinf(corner_b), np.inf, edge_cost)
+        edges.append((dr, dc, dst, src, edge_cost.astype(np.float32)))
+    return edges
+
+
+def propagate(dist, cost):
+    """
+    距離場を収束するまで緩和する（配列をその場で更新する）
+
+    各マスの距離は、8近傍のマスの距離にマス間の移動コストを加えたものの最小値になる。
+
+    Args:
+        dist (numpy.ndarray): 距離場（起点は0、未到達は無限大）
+        cost (numpy.ndarray): マスごとの移動コスト（1以上、無限大は通過不可）
+
+    Returns:
+        numpy.ndarray: 更新した距離場
+    """
+    # マス間の移動コストは地形が変わらない限り一定なので先に求めておく
+    steps = [(dst, src, edge_cost) for _, _, dst, src, edge_cost in edge_costs(cost)]
+
+    changed = True
+    while changed:
+        changed = False
+        for dst, src, edge_cost in steps:
+            candidate = dist[src] + edge_cost
+            target = dist[dst]
+            if (candidate < target).any():
+                np.minimum(target, candidate, out=target)
+                changed = True
+    return dist
+
+
+def compute_field(sources, cost):
+    """
+    起点からの距離場を計算する
+
+    Args:
+        sources (list): 起点のマス (行, 列) のリスト
+        cost (numpy.ndarray): マスごとの移動コスト
+
+    Returns:
+        numpy.ndarray: 距離場
+    """
+    dist = np.full(cost.shape, np.inf, dtype=np.float32)
+    for row, col in sources:
+        dist[row, col] = 0.0
+    return propagate(dist, cost)
+
+
+def repair_field(dist, sources, cost, changed_cells, cost_increased):
+    """
+    マスのコストが変わった後の距離場を差分だけ修復する
+
+    コストが下がっただけなら既存の距離から緩和を続ければよい。
+    コストが上がった場合、影響を受けるのは変更されたマスか、その角をかすめる斜め移動を
+    通る経路だけであり、そのような経路の終点の距離は必ず変更されたマスとその近傍の
+    旧距離の最小値以上になる。そこで旧距離がその値以上のマスだけを未到達に戻して計算し直す。
+
+    Args:
+        dist (numpy.ndarray): 修復する距離場（その場で更新する）
+        sources (list): 起点のマス (行, 列) のリスト
+        cost (numpy.ndarray): 変更後のマスごとの移動コスト
+        changed_cells (list): コストが変わったマス (行, 列) のリスト
+        cost_increased (bool): コストが上がったマスがあるかどうか
+
+    Returns:
+        numpy.ndarray: 修復した距離場
+    """
+    if cost_increased:
+        threshold = min(
+            dist[max(0, row - 1):row + 2, max(0, col - 1):col + 2].min()
+            for row, col in changed_cells
+        )
+        dist[dist >= threshold] = np.inf
+        for row, col in sources:
+            dist[row, col] = 0.0
+    return propagate(dist, cost)
@@ -0,0 +1,190 @@
+"""
+描画品質の自動調整モジュール
+
+直近のフレームの処理時間（待ち時間を除く）の平均を見て、フレーム予算を超えている間は
+省略できる描画（視界の表示・パーティクル・うさぎの状態表示・日本語の併記・テキストのアンチエイリアス）を
+1段階ずつ止め、余裕が戻ったら1段階ずつ戻す。
+
+下げる基準と上げる基準を離し、品質を変えた後は平均を取り直してから次の判断をする。
+さらに上げた直後にまた下げることになった場合は、次に上げるまでの待ち時間を倍にして行ったり来たりを防ぐ。
+延ばした待ち時間は、下げずに済んだ状態が QUALITY_STABLE_TIME 続くたびに半分ずつ元に戻す。
+設定などで使われていない描画（視界の表示を切っている場合など）は、止めても軽くならないので飛ばす。
+"""
+from collections import deque
+from src.utils.constants import (
+    FPS, ADAPTIVE_QUALITY, QUALITY_FEATURES, QUALITY_WINDOW,
+    QUALITY_DOWNGRADE_RATIO, QUALITY_UPGRADE_RATIO, QUALITY_UPGRADE_DELAY, QUALITY_STABLE_TIME
+)
+from src.utils.tracer import trace_instant
+
+# 品質を下げる時に止める描画（QUALITY_FEATURES に並べた順に止める）
+QUALITY_VIEW_CONE = "view_cone"  # うさぎの視界の表示
+QUALITY_PARTICLES = "particles"  # パーティクル
+QUALITY_RABBIT_STATUS = "rabbit_status"  # うさぎの頭上の状態表示
+QUALITY_BILINGUAL_TEXT = "bilingual_text"  # 英語の下に併記する日本語のテキスト
+QUALITY_TEXT_ANTIALIAS = "text_antialias"  # テキストのアンチエイリアス
+
+_UPGRADE_DELAY_MAX = 60.0  # 上げるまでの待ち時間の上限（秒）
+
+
+class QualityGovernor:
+    """
+    フレームの処理時間から描画品質を決めるクラス
+
+    描画する側は is_enabled() で各描画を行うかどうかを確認する。
+    フレーム時間を記録しなければ品質は最高のまま変わらない。
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(QualityGovernor, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if QualityGovernor._initialized:
+            return
+
+        self.enabled = ADAPTIVE_QUALITY
+        self.features = QUALITY_FEATURES
+        self.budget = 1.0 / FPS  # 1フレームの予算（秒）
+        self.level = 0  # 止めている描画の数（0が最高品質）
+        self._disabled = set()
+        self._inactive = set()  # 使われていない（止めても軽くならない）描画
+        self._frame_times = deque(maxlen=QUALITY_WINDOW)
+        self._total = 0.0  # _frame_times の合計
+        self._clock = 0.0  # 記録したフレーム時間の合計（秒、待ち時間の判断に使う）
+        self._last_change = 0.0  # 最後に品質を変えた時刻
+        self._last_upgrade = None  # 最後に品質を上げた時刻
+        self._last_settle = 0.0  # 最後に品質を下げた時刻、または待ち時間を戻した時刻
+        self._upgrade_delay = QUALITY_UPGRADE_DELAY
+        QualityGovernor._initialized = True
+
+    def is_enabled(self, feature):
+        """
+        描画を行うかどうかを返す
+
+        Args:
+            feature (str): 描画の種類（QUALITY_VIEW_CONE など）
+
+        Returns:
+            bool: 行うならTrue
+        """
+        return feature not in self._disabled
+
+    def set_active(self, feature, active):
+        """
+        描画が使われているかどうかを設定する（使われていない描画は品質を下げる時に飛ばす）
+
+        Args:
+            feature (str): 描画の種類（QUALITY_VIEW_CONE など）
+            active (bool): 使われているならTrue
+        """
+        if active:
+            self._inactive.discard(feature)
+        else:
+            self._inactive.add(feature)
+
+    def _can_downgrade(self):
+        """
+        まだ止めていない描画のうち、使われているものがあるかどうかを返す
+
+        Returns:
+            bool: 品質を下げると軽くなる見込みがあるならTrue
+        """
+        return any(feature not in self._inactive for feature in self.features[self.level:])
+
+    def record_frame(self, frame_time, elapsed=None):
+        """
+        1フレームの処理時間を記録し、必要なら品質を1段階変える
+
+        Args:
+            frame_time (float): 待ち時間を除いたフレームの処理時間（秒）
+            elapsed (float): 前のフレームからの経過時間（秒、省略時は1フレーム分）
+
+        Returns:
+            bool: 品質を変えたかどうか
+        """
+        if not self.enabled:
+            return False
+        self._clock += elapsed if elapsed is not None else self.budget
+
+        # しばらく下げずに済んでいれば、延ばした待ち時間を少しずつ戻す
+        if (self._upgrade_delay > QUALITY_UPGRADE_DELAY
+                and self._clock - self._last_settle >= QUALITY_STABLE_TIME):
+            self._upgrade_delay = max(QUALITY_UPGRADE_DELAY, self._upgrade_delay / 2)
+            self._last_settle = self._clock
+
+        frame_times = self._frame_times
+        if len(frame_times) == frame_times.maxlen:
+            self._total -= frame_times[0]
+        frame_times.append(frame_time)
+        self._total += frame_time
+        if len(frame_times) < frame_times.maxlen:
+            return False
+
+        average = self._total / len(frame_times)
+        if average > self.budget * QUALITY_DOWNGRADE_RATIO and self._can_downgrade():
+            self._downgrade(average)
+            return True
+        if (average < self.budget * QUALITY_UPGRADE_RATIO and self.level > 0
+                and self._clock - self._last_change >= self._upgrade_delay):
+            self._upgrade(average)
+            return True
+        return False
+
+    def _downgrade(self, average):
+        """
+        使われている次の描画を止める（その手前の使われていない描画も合わせて止める）
+
+        Args:
+            average (float): 直近のフレーム時間の平均（秒）
+        """
+        # 上げた直後に下げることになった場合は、次に上げるまでの待ち時間を延ばす
+        if self._last_upgrade is not None and self._clock - self._last_upgrade < self._upgrade_delay:
+            self._upgrade_delay = min(self._upgrade_delay * 2, _UPGRADE_DELAY_MAX)
+        self._last_settle = self._clock
+        while True:
+            feature = self.features[self.level]
+            self._disabled.add(feature)
+            self.level += 1
+            if feature not in self._inactive:
+                break
+        self._changed(f"disabled {feature}", average)
+
+    def _upgrade(self, average):
+        """
+        最後に止めた使われている描画を戻す（前後の使われていない描画も合わせて戻す）
+
+        Args:
+            average (float): 直近のフレーム時間の平均（秒）
+        """
+        while True:
+            self.level -= 1
+            feature = self.features[self.level]
+            self._disabled.discard(feature)
+            if feature not in self._inactive or self.level == 0:
+                break
+        while self.level > 0 and self.features[self.level - 1] in self._inactive:
+            self.level -= 1
+            self._disabled.discard(self.features[self.level])
+        self._last_upgrade = self._clock
+        self._changed(f"enabled {feature}", average)
+
+    def _changed(self, action, average):
+        """
+        品質を変えたことを記録し、平均を取り直す
+
+        Args:
+            action (str): 行った変更
+            average (float): 直近のフレーム時間の平均（秒）
+        """
+        self._last_change = self._clock
+        self._frame_times.clear()
+        self._total = 0.0
+        print(f"Quality: {action} (level {self.level}/{len(self.features)}, "
+              f"average frame {average * 1000:.2f} ms, budget {self.budget * 1000:.2f} ms, "
+              f"next upgrade after {self._upgrade_delay:.0f} s)")
+        trace_instant("Quality.change", "quality", {"action": action, "level": self.level,
+                                                    "average_ms": round(average * 1000, 3)})
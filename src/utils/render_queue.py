@@ -0,0 +1,148 @@
+"""
+描画コマンドキューモジュール
+
+シーンやエンティティは描画時に (サーフェス, 矩形, 描画レイヤー) を登録し、
+フレームの最後にまとめてソート・カリングしてから一括転送する。
+"""
+from collections import namedtuple
+import pygame
+
+# 1枚のサーフェスを転送するコマンド（カリング・遮蔽判定の対象）
+BlitCommand = namedtuple("BlitCommand", ["z", "sequence", "surface", "rect", "area"])
+
+# 呼び出し側でカリング済みの転送リストをまとめて転送するコマンド（個別の判定はしない）
+BatchCommand = namedtuple("BatchCommand", ["z", "sequence", "blits"])
+
+
+class RenderQueue:
+    """
+    描画コマンドを溜めて一括転送するキュー
+    """
+    def __init__(self, bounds, report_interval=0):
+        """
+        描画キューの初期化
+
+        Args:
+            bounds (tuple or pygame.Rect): 描画先の範囲 (x, y, 幅, 高さ)
+            report_interval (int): 描画統計を表示する間隔（フレーム数、0で表示しない）
+        """
+        self.bounds = pygame.Rect(bounds)
+        self.report_interval = report_interval
+        self._commands = []
+        self._sequence = 0
+        self.frame_count = 0
+        self.last_stats = {"submitted": 0, "culled": 0, "occluded": 0, "drawn": 0}
+
+    def submit(self, surface, dest, z=0, area=None):
+        """
+        描画コマンドを登録する
+
+        Args:
+            surface (pygame.Surface): 転送元のサーフェス
+            dest (tuple or pygame.Rect): 描画位置 (x, y) または描画先の矩形
+            z (int): 描画レイヤー（大きいほど手前）
+            area (pygame.Rect): 転送元の一部だけを描画する場合の矩形
+        """
+        if area is not None:
+            rect = pygame.Rect(dest[0], dest[1], area.width, area.height)
+        else:
+            rect = surface.get_rect(topleft=(dest[0], dest[1]))
+        self._commands.append(BlitCommand(z, self._sequence, surface, rect, area))
+        self._sequence += 1
+
+    def submit_many(self, blit_sequence, z=0):
+        """
+        複数の描画コマンドをまとめて登録する
+
+        Args:
+            blit_sequence (list): (サーフェス, 描画位置, 転送元矩形) のリスト
+            z (int): 描画レイヤー（大きいほど手前）
+        """
+        for surface, dest, area in blit_sequence:
+            self.submit(surface, dest, z, area)
+
+    def submit_batch(self, blit_sequence, z=0):
+        """
+        大量の小さな描画コマンドを1つのまとまりとして登録する
+
+        パーティクルのように数が多く、呼び出し側でカリング済みのものに使う。
+        まとまりの中身は個別にカリング・遮蔽判定をせず、そのまま転送リストに加える。
+
+        Args:
+            blit_sequence (list): (サーフェス, 描画位置) のリスト
+            z (int): 描画レイヤー（大きいほど手前）
+        """
+        if blit_sequence:
+            self._commands.append(BatchCommand(z, self._sequence, blit_sequence))
+            self._sequence += 1
+
+    @staticmethod
+    def _is_opaque(surface):
+        """
+        サーフェスが完全に不透明かどうかを判定する
+
+        Args:
+            surface (pygame.Surface): 判定するサーフェス
+
+        Returns:
+            bool: 不透明ならTrue
+        """
+        return (not surface.get_flags() & pygame.SRCALPHA
+                and surface.get_colorkey() is None
+                and surface.get_alpha() is None)
+
+    def flush(self, target):
+        """
+        登録された描画コマンドをレイヤー順に並べ、不要なものを除いて一括転送する
+
+        Args:
+            target (pygame.Surface): 描画対象の画面
+
+        Returns:
+            dict: このフレームの描画統計
+        """
+        commands = self._commands
+        commands.sort(key=lambda command: (command[0], command[1]))
+
+        submitted = 0
+        culled = 0
+        occluded = 0
+        visible = []
+        opaque_rects = []
+
+        # 手前から順に見て、画面外のものと不透明なコマンドに完全に隠れるものを除外する
+        for command in reversed(commands):
+            if type(command) is BatchCommand:
+                # まとめて登録されたコマンドは後で全体を反転させるので逆順で加える
+                submitted += len(command.blits)
+                visible.extend(reversed(command.blits))
+                continue
+            _, _, surface, rect, area = command
+            submitted += 1
+            if not self.bounds.colliderect(rect):
+                culled += 1
+                continue
+            if any(opaque.contains(rect) for opaque in opaque_rects):
+                occluded += 1
+                continue
+            visible.append((surface, rect.topleft, area))
+            if self._is_opaque(surface):
+                opaque_rects.append(rect)
+
+        visible.reverse()
+        target.blits(visible, doreturn=False)
+
+        self.last_stats = {
+            "submitted": submitted,
+            "culled": culled,
+            "occluded": occluded,
+            "drawn": len(visible),
+        }
+        self._commands = []
+        self._sequence = 0
+        self.frame_count += 1
+
+        if self.report_interval and self.frame_count % self.report_interval == 0:
+            print(f"Render queue: {self.last_stats}")
+
+        return self.last_stats
@@ -0,0 +1,111 @@
+"""
+タイマースケジューラモジュール
+
+期限とコールバックを最小ヒープで管理し、毎フレームは期限が来たタイマーだけを取り出して実行する。
+エンティティがいくつあっても、1フレームの処理量は期限を迎えたタイマーの数にしか比例しない。
+"""
+import heapq
+import itertools
+
+# タイマー（ヒープの要素）の各項目の位置
+_DEADLINE = 0
+_CALLBACK = 2
+_ARGS = 3
+
+
+class TimerScheduler:
+    """
+    最小ヒープによるタイマースケジューラ
+
+    時刻は advance() に渡された経過時間の合計で、実時間とは独立している。
+    キャンセルされたタイマーはその場では取り除かず、取り出した時に読み飛ばす。
+    """
+    def __init__(self):
+        """
+        スケジューラの初期化
+        """
+        self.now = 0.0  # 現在時刻（秒）
+        self._heap = []
+        self._sequence = itertools.count()  # 同じ期限のタイマーを登録順に実行するための通し番号
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, delay, callback, *args):
+        """
+        タイマーを登録する
+
+        Args:
+            delay (float): 現在時刻から期限までの時間（秒）
+            callback (callable): 期限が来た時に呼び出す関数
+            *args: callback に渡す引数
+
+        Returns:
+            list: タイマー（cancel() や time_left() に渡す）
+        """
+        timer = [self.now + delay, next(self._sequence), callback, args]
+        heapq.heappush(self._heap, timer)
+        return timer
+
+    @staticmethod
+    def cancel(timer):
+        """
+        タイマーをキャンセルする
+
+        Args:
+            timer (list): schedule() が返したタイマー（Noneなら何もしない）
+        """
+        if timer is not None:
+            timer[_CALLBACK] = None
+
+    @staticmethod
+    def is_active(timer):
+        """
+        タイマーがまだ実行もキャンセルもされていないかどうかを返す
+
+        Args:
+            timer (list): schedule() が返したタイマー
+
+        Returns:
+            bool: 有効ならTrue
+        """
+        return timer is not None and timer[_CALLBACK] is not None
+
+    def time_left(self, timer):
+        """
+        タイマーの期限までの残り時間を返す
+
+        Args:
+            timer (list): schedule() が返したタイマー
+
+        Returns:
+            float: 残り時間（秒、実行済みやキャンセル済みなら0）
+        """
+        if not self.is_active(timer):
+            return 0.0
+        return max(0.0, timer[_DEADLINE] - self.now)
+
+    def advance(self, dt):
+        """
+        時刻を進め、期限が来たタイマーを期限の順に実行する
+
+        コールバックの中で登録されたタイマーも、期限が来ていれば同じ呼び出しの中で実行する。
+
+        Args:
+            dt (float): 経過時間（秒）
+
+        Returns:
+            int: 実行したタイマーの数
+        """
+        self.now += dt
+        heap = self._heap
+        fired = 0
+        while heap and heap[0][_DEADLINE] <= self.now:
+            timer = heapq.heappop(heap)
+            callback = timer[_CALLBACK]
+            if callback is None:
+                continue
+            timer[_CALLBACK] = None
+            callback(*timer[_ARGS])
+            fired += 1
+        return fired
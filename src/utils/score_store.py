@@ -0,0 +1,285 @@
+"""
+スコア（プレイ結果）の保存モジュール
+
+プレイ結果は SQLite のデータベースに保存し、順位表として参照する。
+データベースへの接続は専用のスレッドだけが持ち、フレームを処理するスレッドは
+要求をキューに入れて Future を受け取るだけにする（結果は毎フレーム done() で確認する）。
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import Future
+from src.utils.constants import SCORE_DB_FILE
+
+# 順位は「クリアしたもののうち、機嫌度が高い順、同じ機嫌度ならクリア時間が短い順」とする
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    played_at REAL NOT NULL,
+    play_date TEXT NOT NULL,
+    stage INTEGER NOT NULL,
+    is_clear INTEGER NOT NULL,
+    mood INTEGER NOT NULL,
+    clear_time REAL
+);
+CREATE INDEX IF NOT EXISTS idx_results_rank
+    ON results (stage, mood DESC, clear_time) WHERE is_clear = 1;
+CREATE INDEX IF NOT EXISTS idx_results_day
+    ON results (play_date, stage, mood DESC, clear_time) WHERE is_clear = 1;
+"""
+
+_INSERT = """
+INSERT INTO results (played_at, play_date, stage, is_clear, mood, clear_time)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# OR でまとめるとインデックスの範囲検索にならないため、機嫌度が上のものと同じものを別々に数える
+_RANK = """
+SELECT
+    (SELECT COUNT(*) FROM results
+     WHERE is_clear = 1 AND stage = :stage AND mood > :mood)
+  + (SELECT COUNT(*) FROM results
+     WHERE is_clear = 1 AND stage = :stage AND mood = :mood AND clear_time < :clear_time)
+  + 1
+"""
+
+_DAY_RANK = """
+SELECT
+    (SELECT COUNT(*) FROM results
+     WHERE is_clear = 1 AND play_date = :date AND stage = :stage AND mood > :mood)
+  + (SELECT COUNT(*) FROM results
+     WHERE is_clear = 1 AND play_date = :date AND stage = :stage AND mood = :mood AND clear_time < :clear_time)
+  + 1
+"""
+
+_TOP = """
+SELECT mood, clear_time, played_at FROM results
+WHERE is_clear = 1 AND stage = ?
+ORDER BY mood DESC, clear_time
+LIMIT ?
+"""
+
+_DAY_TOP = """
+SELECT mood, clear_time, played_at FROM results
+WHERE is_clear = 1 AND play_date = ? AND stage = ?
+ORDER BY mood DESC, clear_time
+LIMIT ?
+"""
+
+# 1回のプレイ結果
+ScoreRecord = namedtuple("ScoreRecord", [
+    "played_at",  # プレイした時刻（UNIX時間）
+    "stage",  # ステージ番号（1から）
+    "is_clear",  # クリアしたかどうか
+    "mood",  # 最終的な機嫌度
+    "clear_time",  # クリアまでの時間（秒、ゲームオーバーの場合はNone）
+])
+
+# 順位（クリアしていない場合は None）
+ScoreRank = namedtuple("ScoreRank", ["rank", "day_rank"])
+
+
+def _play_date(played_at):
+    """
+    プレイした日付の文字列を求める（ローカル時刻）
+
+    Args:
+        played_at (float): プレイした時刻（UNIX時間）
+
+    Returns:
+        str: 日付（YYYY-MM-DD）
+    """
+    return time.strftime("%Y-%m-%d", time.localtime(played_at))
+
+
+class ScoreStore:
+    """
+    プレイ結果の保存と順位の問い合わせを管理するクラス
+
+    データベースは WAL モードで開き、書き込み中でも読み出しを妨げないようにする。
+    続けて届いた書き込みは1つのトランザクションにまとめる。
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls, path=SCORE_DB_FILE):
+        if cls._instance is None:
+            cls._instance = super(ScoreStore, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self, path=SCORE_DB_FILE):
+        if ScoreStore._initialized:
+            return
+
+        self.path = path
+        self._requests = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="score-store", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        ScoreStore._initialized = True
+
+    def submit_result(self, record):
+        """
+        プレイ結果を保存し、その順位を問い合わせる（すぐ戻る）
+
+        Args:
+            record (ScoreRecord): プレイ結果
+
+        Returns:
+            concurrent.futures.Future: 完了すると ScoreRank（失敗した場合はNone）になる
+        """
+        future = Future()
+        self._requests.put(("submit", record, future))
+        return future
+
+    def query_top(self, stage, limit=10, date=None):
+        """
+        順位表の上位を問い合わせる（すぐ戻る）
+
+        Args:
+            stage (int): ステージ番号
+            limit (int): 取得する件数
+            date (str): 日付（YYYY-MM-DD）を指定するとその日の順位表になる
+
+        Returns:
+            concurrent.futures.Future: 完了すると (機嫌度, クリア時間, プレイ時刻) のリストになる
+        """
+        future = Future()
+        self._requests.put(("top", (stage, limit, date), future))
+        return future
+
+    def _open(self):
+        """
+        データベースを開き、テーブルとインデックスを用意する
+
+        Returns:
+            sqlite3.Connection or None: 接続、開けなかった場合はNone
+        """
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            return connection
+        except (OSError, sqlite3.Error) as e:
+            print(f"Score store disabled: {e}")
+            return None
+
+    def _run(self):
+        """
+        キューに届いた要求を順に処理する（データベース用のスレッド）
+        """
+        connection = self._open()
+        while True:
+            requests = [self._requests.get()]
+            # 続けて届いている要求もまとめて取り出す
+            while True:
+                try:
+                    requests.append(self._requests.get_nowait())
+                except queue.Empty:
+                    break
+
+            stopping = any(request is None for request in requests)
+            requests = [request for request in requests if request is not None]
+            if connection is None:
+                for _, _, future in requests:
+                    future.set_result(None)
+            else:
+                self._process(connection, requests)
+
+            if stopping:
+                if connection is not None:
+                    connection.close()
+                return
+
+    def _process(self, connection, requests):
+        """
+        要求をまとめて処理する（書き込みは1つのトランザクションにまとめる）
+
+        Args:
+            connection (sqlite3.Connection): データベースへの接続
+            requests (list): (種類, 引数, Future) のリスト
+        """
+        submits = [(record, future) for kind, record, future in requests if kind == "submit"]
+        try:
+            with connection:
+                connection.executemany(_INSERT, [
+                    (record.played_at, _play_date(record.played_at), record.stage,
+                     int(record.is_clear), record.mood, record.clear_time)
+                    for record, _ in submits
+                ])
+        except sqlite3.Error as e:
+            print(f"Failed to save results: {e}")
+            for _, future in submits:
+                future.set_result(None)
+            submits = []
+
+        for record, future in submits:
+            future.set_result(self._rank(connection, record))
+
+        for kind, args, future in requests:
+            if kind == "top":
+                future.set_result(self._top(connection, *args))
+
+    def _rank(self, connection, record):
+        """
+        プレイ結果の順位を求める
+
+        Args:
+            connection (sqlite3.Connection): データベースへの接続
+            record (ScoreRecord): プレイ結果
+
+        Returns:
+            ScoreRank or None: 順位、クリアしていない場合や失敗した場合はNone
+        """
+        if not record.is_clear:
+            return None
+        params = {
+            "date": _play_date(record.played_at),
+            "stage": record.stage,
+            "mood": record.mood,
+            "clear_time": record.clear_time,
+        }
+        try:
+            rank = connection.execute(_RANK, params).fetchone()[0]
+            day_rank = connection.execute(_DAY_RANK, params).fetchone()[0]
+        except sqlite3.Error as e:
+            print(f"Failed to query rank: {e}")
+            return None
+        return ScoreRank(rank, day_rank)
+
+    def _top(self, connection, stage, limit, date):
+        """
+        順位表の上位を求める
+
+        Args:
+            connection (sqlite3.Connection): データベースへの接続
+            stage (int): ステージ番号
+            limit (int): 取得する件数
+            date (str): 日付（Noneなら全期間）
+
+        Returns:
+            list: (機嫌度, クリア時間, プレイ時刻) のリスト
+        """
+        try:
+            if date is None:
+                return connection.execute(_TOP, (stage, limit)).fetchall()
+            return connection.execute(_DAY_TOP, (date, stage, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"Failed to query leaderboard: {e}")
+            return []
+
+    def close(self):
+        """
+        残っている要求を処理してからデータベース用のスレッドを終了する
+        """
+        if self._thread.is_alive():
+            self._requests.put(None)
+            self._thread.join(timeout=2.0)
@@ -0,0 +1,202 @@
+"""
+ゲームの状態を共有メモリに公開するモジュール
+
+配信用のオーバーレイや分析用の外部プロセスが、ソケットや文字列の解析なしに
+プレイヤーの位置・うさぎの向き・機嫌度・タイマーを高い頻度で読めるよう、
+multiprocessing.shared_memory のブロックに固定レイアウトのレコードを毎回の更新で書き込む。
+
+書き込み側は1つだけで、シーケンスロック（seqlock）で整合性を保つ。
+書き込み中はシーケンス番号を奇数にし、書き終えたら偶数に戻す。読み込み側は番号が偶数で、
+読む前と後で変わっていなければ一貫した状態を読めたとみなし、そうでなければ読み直す。
+読み込み側がロックを取ることはないので、どれだけ頻繁に読んでもゲームは遅くならない。
+
+レイアウト（リトルエンディアン）:
+    0: マジックナンバー b"NUSG"
+    4: レイアウトの版（uint32）
+    8: シーケンス番号（uint64）
+    16: レコード（_RECORD）
+
+外部プロセスからは SharedStateReader で読む（このモジュールは pygame を使わない）。
+
+    reader = SharedStateReader("nade_usagi_state")
+    state = reader.read()
+"""
+import os
+import struct
+import time
+from collections import namedtuple
+from multiprocessing import resource_tracker, shared_memory
+from src.utils.constants import SCENE_TITLE, SCENE_GAME, SCENE_RESULT
+
+MAGIC = b"NUSG"
+LAYOUT_VERSION = 1
+_HEADER = struct.Struct("<4sI")
+_SEQUENCE = struct.Struct("<Q")
+_SEQUENCE_OFFSET = 8
+_RECORD_OFFSET = 16
+_RECORD = struct.Struct("<QdBHddd?ddd?dd???")
+SHARED_STATE_SIZE = _RECORD_OFFSET + _RECORD.size
+
+# シーン名 <-> レコード上のシーン番号（0は不明）
+SCENE_CODES = (None, SCENE_TITLE, SCENE_GAME, SCENE_RESULT)
+_SCENE_NUMBERS = {name: code for code, name in enumerate(SCENE_CODES) if name is not None}
+
+# 公開する状態（レコードのフィールドと同じ順）
+SharedGameState = namedtuple("SharedGameState", [
+    "tick",  # 公開した回数
+    "time",  # 公開した時刻（UNIX時間）
+    "scene",  # シーン名
+    "stage",  # ステージ番号（1から）
+    "play_time",  # ゲーム開始からの経過時間（秒、ゲーム中以外は0）
+    "player_x",
+    "player_y",
+    "player_moving",  # プレイヤーが移動中かどうか
+    "rabbit_x",
+    "rabbit_y",
+    "rabbit_direction",  # うさぎの向き（度数法、0が右、180が左）
+    "rabbit_looking_back",  # うさぎがこちらを向いているかどうか
+    "mood",  # うさぎの機嫌度
+    "turn_time_left",  # うさぎが次に向きを変えるまでの残り時間（秒）
+    "warning_visible",
+    "game_over",
+    "game_clear",
+])
+
+
+class SharedStateWriter:
+    """
+    ゲームの状態を共有メモリに書き込むクラス（書き込むのはゲームのプロセスの1つのスレッドだけ）
+    """
+    def __init__(self, name):
+        """
+        共有メモリのブロックを作成する
+
+        Args:
+            name (str): ブロックの名前（読み込み側と同じ名前を使う）
+
+        Raises:
+            OSError: ブロックを作成できない場合
+        """
+        try:
+            self._memory = shared_memory.SharedMemory(name, create=True, size=SHARED_STATE_SIZE)
+        except FileExistsError:
+            # 前回異常終了した時のブロックが残っていれば作り直す
+            stale = shared_memory.SharedMemory(name)
+            stale.close()
+            stale.unlink()
+            self._memory = shared_memory.SharedMemory(name, create=True, size=SHARED_STATE_SIZE)
+        self.name = name
+        self._buffer = self._memory.buf
+        self._sequence = 0
+        self.tick = 0
+        _SEQUENCE.pack_into(self._buffer, _SEQUENCE_OFFSET, 0)
+        _HEADER.pack_into(self._buffer, 0, MAGIC, LAYOUT_VERSION)
+
+    def publish(self, scene_name, stage_number, scene=None):
+        """
+        現在の状態を書き込む
+
+        Args:
+            scene_name (str): 現在のシーン名
+            stage_number (int): ステージ番号（1から）
+            scene (GameScene): ゲームシーン（ゲーム中以外はNone）
+        """
+        self.tick += 1
+        if scene is not None:
+            player, rabbit = scene.player, scene.rabbit
+            values = (
+                self.tick, time.time(), _SCENE_NUMBERS.get(scene_name, 0), stage_number, scene.play_time,
+                player.x, player.y, player.moving,
+                rabbit.x, rabbit.y, rabbit.direction, rabbit.looking_back, rabbit.mood,
+                rabbit.get_time_until_turn(),
+                scene.warning_visible, scene.game_over, scene.game_clear,
+            )
+        else:
+            values = (self.tick, time.time(), _SCENE_NUMBERS.get(scene_name, 0), stage_number, 0.0,
+                      0.0, 0.0, False, 0.0, 0.0, 0.0, False, 0.0, 0.0, False, False, False)
+
+        # 書き込み中はシーケンス番号を奇数にしておき、読み込み側に読み直させる
+        buffer = self._buffer
+        sequence = self._sequence + 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, sequence)
+        _RECORD.pack_into(buffer, _RECORD_OFFSET, *values)
+        self._sequence = sequence + 1
+        _SEQUENCE.pack_into(buffer, _SEQUENCE_OFFSET, sequence + 1)
+
+    def close(self):
+        """
+        ブロックを閉じて削除する
+        """
+        self._buffer = None
+        self._memory.close()
+        try:
+            self._memory.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class SharedStateReader:
+    """
+    共有メモリからゲームの状態を読み込むクラス（外部のプロセスで使う）
+    """
+    def __init__(self, name):
+        """
+        ゲームが作成したブロックに接続する
+
+        Args:
+            name (str): ブロックの名前
+
+        Raises:
+            FileNotFoundError: ゲームが起動していない（ブロックがない）場合
+            ValueError: ブロックのレイアウトが異なる場合
+        """
+        try:
+            self._memory = shared_memory.SharedMemory(name, track=False)  # Python 3.13以降
+        except TypeError:
+            self._memory = shared_memory.SharedMemory(name)
+            # 読み込み側の終了時にブロックが削除されないよう、後始末の対象から外す
+            if os.name == "posix":
+                resource_tracker.unregister(self._memory._name, "shared_memory")
+        self._buffer = self._memory.buf
+        magic, version = _HEADER.unpack_from(self._buffer, 0)
+        if magic != MAGIC or version != LAYOUT_VERSION:
+            self.close()
+            raise ValueError(f"Unexpected shared state layout: {magic!r} version {version}")
+
+    @property
+    def sequence(self):
+        """
+        現在のシーケンス番号（変わっていなければ前回読んだ時から更新されていない）
+        """
+        return _SEQUENCE.unpack_from(self._buffer, _SEQUENCE_OFFSET)[0]
+
+    def read(self, retries=1000):
+        """
+        一貫した状態を読み込む
+
+        Args:
+            retries (int): 書き込みと重なった場合に読み直す回数の上限
+
+        Returns:
+            SharedGameState or None: 状態、まだ公開されていないか読み直しの上限を超えた場合はNone
+        """
+        buffer = self._buffer
+        for _ in range(retries):
+            before = _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0]
+            if before & 1:
+                continue
+            values = _RECORD.unpack_from(buffer, _RECORD_OFFSET)
+            if _SEQUENCE.unpack_from(buffer, _SEQUENCE_OFFSET)[0] != before:
+                continue
+            if before == 0:
+                return None
+            state = SharedGameState._make(values)
+            return state._replace(scene=SCENE_CODES[state.scene] if state.scene < len(SCENE_CODES) else None)
+        return None
+
+    def close(self):
+        """
+        ブロックから切断する（ブロックは削除しない）
+        """
+        self._buffer = None
+        self._memory.close()
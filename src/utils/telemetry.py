@@ -0,0 +1,169 @@
+"""
+プレイ記録（テレメトリ）モジュール
+
+ゲーム中の出来事を型付きのイベントとしてメモリ上のバッファに溜め、
+バックグラウンドのスレッドがまとめて JSONL ファイルへ追記する。
+フレームを処理するスレッドではファイルの読み書きも JSON への変換も行わない。
+"""
+import atexit
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque, namedtuple
+from src.utils.constants import (
+    TELEMETRY_FILE, TELEMETRY_BUFFER_SIZE, TELEMETRY_BATCH_SIZE, TELEMETRY_FLUSH_INTERVAL
+)
+
+# イベントの種類
+EVENT_SESSION_START = "session_start"  # ゲーム開始（stage）
+EVENT_CLICK = "click"  # クリック（button, x, y, rabbit_looking）
+EVENT_DETECTED = "detected"  # うさぎに見つかった（reason, mood）
+EVENT_CLEAR = "clear"  # クリア（clear_time, clicks, mood）
+EVENT_GAME_OVER = "game_over"  # ゲームオーバー（play_time, clicks）
+EVENT_DROPPED = "dropped"  # バッファがあふれて捨てたイベントの数（count）
+
+TelemetryEvent = namedtuple("TelemetryEvent", [
+    "session",  # セッションID
+    "type",  # イベントの種類
+    "time",  # 記録した時刻（UNIX時間）
+    "data",  # イベントごとの値（dict）
+])
+
+
+class Telemetry:
+    """
+    プレイ記録の書き出しを管理するクラス
+
+    バッファは上限付きの deque で、書き出しが追いつかない場合は古いイベントから捨てて
+    捨てた数だけを記録する。負荷が続いてもメモリ使用量は一定に収まる。
+    バッファと捨てた数はロックで守り、捨てた数を数え漏らしたり多く数えたりしないようにする
+    （ロックを持つのは追加と、まとめての取り出しの間だけ）。
+    """
+    _instance = None
+    _initialized = False
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(Telemetry, cls).__new__(cls)
+        return cls._instance
+
+    def __init__(self):
+        if Telemetry._initialized:
+            return
+
+        self.path = TELEMETRY_FILE
+        self.enabled = True
+        self._buffer = deque(maxlen=TELEMETRY_BUFFER_SIZE)
+        self._dropped = 0
+        self._lock = threading.Lock()  # _buffer と _dropped を守る
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+        Telemetry._initialized = True
+
+    def disable(self):
+        """
+        以降のイベントを記録しないようにする
+
+        ゴールデンフレームの比較や計測用のスクリプトが作ったゲームシーンのイベントが、
+        実際のプレイ記録に混ざらないようにするために使う。
+        """
+        self.enabled = False
+
+    def new_session(self):
+        """
+        新しいセッションIDを発行する
+
+        Returns:
+            str: セッションID
+        """
+        return uuid.uuid4().hex[:12]
+
+    def record(self, session, event_type, **data):
+        """
+        イベントを記録する（バッファに追加するだけですぐ戻る）
+
+        Args:
+            session (str): セッションID
+            event_type (str): イベントの種類
+            **data: イベントごとの値
+        """
+        if not self.enabled:
+            return
+        event = TelemetryEvent(session, event_type, time.time(), data)
+        buffer = self._buffer
+        with self._lock:
+            if len(buffer) == buffer.maxlen:
+                # 最も古いイベントが押し出される
+                self._dropped += 1
+            buffer.append(event)
+            pending = len(buffer)
+        if pending >= TELEMETRY_BATCH_SIZE:
+            self._wakeup.set()
+
+    def _take_batch(self):
+        """
+        バッファからイベントを取り出す
+
+        Returns:
+            list: 取り出したイベントのリスト
+        """
+        buffer = self._buffer
+        with self._lock:
+            batch = list(buffer)
+            buffer.clear()
+            dropped, self._dropped = self._dropped, 0
+
+        if dropped:
+            batch.append(TelemetryEvent(None, EVENT_DROPPED, time.time(), {"count": dropped}))
+        return batch
+
+    def _write_batch(self, batch):
+        """
+        イベントをまとめてファイルへ追記する
+
+        Args:
+            batch (list): 書き出すイベントのリスト
+        """
+        lines = "".join(
+            json.dumps({"session": event.session, "type": event.type, "time": event.time, **event.data},
+                       ensure_ascii=False) + "\n"
+            for event in batch
+        )
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as e:
+            print(f"Failed to write telemetry: {e}")
+
+    def _run(self):
+        """
+        一定間隔、またはバッファが溜まった時にまとめて書き出す（バックグラウンドのスレッド）
+        """
+        while True:
+            self._wakeup.wait(TELEMETRY_FLUSH_INTERVAL)
+            self._wakeup.clear()
+            # 終了要求を先に確認してから取り出すことで、終了前に記録されたイベントを取りこぼさない
+            stopping = self._stopping
+            batch = self._take_batch()
+            if batch:
+                self._write_batch(batch)
+            if stopping:
+                return
+
+    def close(self):
+        """
+        残っているイベントを書き出して書き出し用のスレッドを終了する
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        self._thread.join(timeout=2.0)
@@ -0,0 +1,267 @@
+"""
+処理時間のトレース（Chrome Trace Event 形式）モジュール
+
+フレームの各段階やシーンの切り替え、読み込み、フォントの処理などの区間を記録し、
+Chrome Trace Event 形式の JSON に書き出す（chrome://tracing や Perfetto で開ける）。
+
+区間は開始時に確保しておいた固定長のリング（名前・開始時刻・所要時間・スレッド・値の配列）に書き込み、
+上限を超えた場合は古いものから上書きする。記録中にファイルの書き込みや JSON への変換は行わない。
+記録していない時は、trace_span() は共有の何もしない区間を返し、traced() を付けた関数は
+グローバル変数を1回確認してから元の関数を呼ぶだけなので、計測処理を置いたままでよい。
+"""
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from src.utils.constants import TRACE_BUFFER_SIZE
+
+# 記録中のトレーサー（記録していない時はNone）
+_active_tracer = None
+
+
+class _NullSpan:
+    """
+    記録していない時に使う何もしない区間
+    """
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """
+    with 文の間を1つの区間として記録する
+    """
+    __slots__ = ("tracer", "name", "category", "args", "start")
+
+    def __init__(self, tracer, name, category, args):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        start = self.start
+        self.tracer.record(self.name, self.category, start, time.perf_counter_ns() - start, self.args)
+        return False
+
+
+def trace_span(name, category="game", args=None):
+    """
+    with 文で囲んだ区間を記録する（記録していない時は何もしない）
+
+    Args:
+        name (str): 区間の名前
+        category (str): 分類（トレースビューアで絞り込むのに使う）
+        args (dict): 区間に付ける値
+
+    Returns:
+        区間を表すコンテキストマネージャ
+    """
+    tracer = _active_tracer
+    if tracer is None:
+        return _NULL_SPAN
+    return _Span(tracer, name, category, args)
+
+
+def trace_instant(name, category="game", args=None):
+    """
+    ある時点の出来事を記録する（記録していない時は何もしない）
+
+    Args:
+        name (str): 出来事の名前
+        category (str): 分類
+        args (dict): 出来事に付ける値
+    """
+    tracer = _active_tracer
+    if tracer is not None:
+        tracer.record(name, category, time.perf_counter_ns(), -1, args)
+
+
+def trace_complete(name, category, start, duration, args=None):
+    """
+    開始時刻と所要時間が分かっている区間を記録する（記録していない時は何もしない）
+
+    Args:
+        name (str): 区間の名前
+        category (str): 分類
+        start (int): 開始時刻（time.perf_counter_ns() の値）
+        duration (int): 所要時間（ナノ秒）
+        args (dict): 区間に付ける値
+    """
+    tracer = _active_tracer
+    if tracer is not None:
+        tracer.record(name, category, start, duration, args)
+
+
+def traced(category, name=None):
+    """
+    関数の呼び出しを区間として記録するデコレータ
+
+    Args:
+        category (str): 分類
+        name (str): 区間の名前（省略時は関数の修飾名）
+
+    Returns:
+        callable: デコレータ
+    """
+    def decorator(function):
+        label = name or function.__qualname__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            tracer = _active_tracer
+            if tracer is None:
+                return function(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                tracer.record(label, category, start, time.perf_counter_ns() - start)
+        return wrapper
+    return decorator
+
+
+class Tracer:
+    """
+    区間を固定長のリングに記録し、Chrome Trace Event 形式で書き出すクラス
+
+    記録位置は itertools.count で割り当てるため、シミュレーションのスレッドなど
+    複数のスレッドから同時に記録してもロックは不要。
+    書き出す範囲も同じカウンターから1つ取って決めるので、スレッドの実行順によって範囲が戻ることはない。
+    名前は他の値を書き終えてから最後に書き込み、書き込み途中の区間は書き出し時に飛ばす。
+    """
+    def __init__(self, capacity=TRACE_BUFFER_SIZE):
+        """
+        記録用の配列を確保する
+
+        Args:
+            capacity (int): 保持できる区間の最大数（超えた分は古いものから上書きする）
+        """
+        self.capacity = capacity
+        self._names = [None] * capacity  # (名前, 分類)
+        self._starts = [0] * capacity  # 開始時刻（ナノ秒）
+        self._durations = [0] * capacity  # 所要時間（ナノ秒、ある時点の出来事は -1）
+        self._threads = [0] * capacity  # 記録したスレッドの識別子
+        self._args = [None] * capacity
+        self._counter = itertools.count()
+        self._origin = time.perf_counter_ns()
+        self._thread_names = {}  # スレッドの識別子 -> スレッド名
+
+    def start(self):
+        """
+        記録を開始する（以降の trace_span() などがこのトレーサーに記録する）
+        """
+        global _active_tracer
+        _active_tracer = self
+
+    def stop(self):
+        """
+        記録を終了する
+        """
+        global _active_tracer
+        if _active_tracer is self:
+            _active_tracer = None
+
+    def record(self, name, category, start, duration, args=None):
+        """
+        区間を1つ記録する
+
+        Args:
+            name (str): 区間の名前
+            category (str): 分類
+            start (int): 開始時刻（time.perf_counter_ns() の値）
+            duration (int): 所要時間（ナノ秒、ある時点の出来事は -1）
+            args (dict): 区間に付ける値
+        """
+        sequence = next(self._counter)
+        index = sequence % self.capacity
+        names = self._names
+        # 書き込み途中に書き出されても、前の周の値と混ざった区間を出さないようにする
+        names[index] = None
+        self._starts[index] = start
+        self._durations[index] = duration
+        thread = threading.get_ident()
+        self._threads[index] = thread
+        if thread not in self._thread_names:
+            self._thread_names[thread] = threading.current_thread().name
+        self._args[index] = args
+        names[index] = (name, category)
+
+    def _events(self):
+        """
+        記録した区間を Chrome Trace Event の辞書に変換する
+
+        Returns:
+            list: イベントのリスト（古い順）
+        """
+        # 記録位置を1つ使って、それより前に割り当てた区間を書き出す
+        # （使った位置には何も書き込まれないので、前の周の区間が残らないよう空にしておく）
+        recorded = next(self._counter)
+        self._names[recorded % self.capacity] = None
+        first = max(0, recorded - self.capacity + 1)
+        names, starts, durations = self._names, self._starts, self._durations
+        threads, all_args = self._threads, self._args
+
+        pid = os.getpid()
+        thread_ids = {}  # スレッドの識別子 -> トレース上のスレッド番号
+        events = []
+        for sequence in range(first, recorded):
+            index = sequence % self.capacity
+            if names[index] is None:
+                continue
+            name, category = names[index]
+            tid = thread_ids.setdefault(threads[index], len(thread_ids) + 1)
+            event = {"name": name, "cat": category, "pid": pid, "tid": tid,
+                     "ts": (starts[index] - self._origin) / 1000}
+            if durations[index] < 0:
+                event["ph"] = "i"
+                event["s"] = "t"
+            else:
+                event["ph"] = "X"
+                event["dur"] = durations[index] / 1000
+            if all_args[index]:
+                event["args"] = all_args[index]
+            events.append(event)
+
+        for ident, tid in thread_ids.items():
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                           "args": {"name": self._thread_names.get(ident, str(ident))}})
+        return events
+
+    def export(self, path):
+        """
+        記録した区間を Chrome Trace Event 形式の JSON に書き出す（記録は続けてよい）
+
+        Args:
+            path (str): 書き出すファイルのパス
+
+        Returns:
+            int: 書き出したイベントの数（書き出せなかった場合は0）
+        """
+        events = self._events()
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f, ensure_ascii=False)
+        except OSError as e:
+            print(f"Failed to write trace: {e}")
+            return 0
+        print(f"Wrote {len(events)} trace event(s) to {path}")
+        return len(events)
@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+共有メモリに公開されたゲームの状態を表示するスクリプト
+
+ゲームを SHARED_STATE_NAME を設定して起動しておき、別のプロセスから状態を読み続ける。
+pygame は使わないので、配信用のオーバーレイや分析用のツールから読む時の例にもなる。
+
+    python watch_state.py [表示する回数/秒] [ブロックの名前]
+"""
+import sys
+import os
+import time
+
+# srcディレクトリをPythonパスに追加
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.utils.constants import SHARED_STATE_NAME
+from src.utils.shared_state import SharedStateReader
+
+
+def main():
+    """
+    一定間隔で状態を読み、更新されていれば1行で表示する
+    """
+    rate = float(sys.argv[1]) if len(sys.argv) > 1 else 10.0
+    name = sys.argv[2] if len(sys.argv) > 2 else SHARED_STATE_NAME or "nade_usagi_state"
+    try:
+        reader = SharedStateReader(name)
+    except FileNotFoundError:
+        print(f"Shared state {name} not found (start the game with SHARED_STATE_NAME set)")
+        return 1
+
+    last_tick = None
+    try:
+        while True:
+            state = reader.read()
+            if state is not None and state.tick != last_tick:
+                last_tick = state.tick
+                print(f"tick {state.tick:>7} {state.scene or '-':>6} stage {state.stage} "
+                      f"player ({state.player_x:6.1f}, {state.player_y:6.1f}) "
+                      f"rabbit {'looking' if state.rabbit_looking_back else 'away':>7} "
+                      f"turn in {state.turn_time_left:4.1f} s mood {state.mood:5.1f}")
+            time.sleep(1.0 / rate)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        reader.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())